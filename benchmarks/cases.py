@@ -0,0 +1,554 @@
+"""Benchmark cases, registered on import."""
+
+import asyncio
+import atexit
+import random
+import shutil
+import tempfile
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+from fixtures import make_building, make_portfolio, make_zone
+from harness import benchmark
+
+from application.batch import BatchRunner, CalculationType, RunConfig
+from application.batch.batch_runner import MANIFEST_NAME, shard_path, write_shard
+from application.calibration import BatchCalibrator, MeteredDemand
+from application.comparison import ResultDiffer
+from application.portfolio import PortfolioDesignLoadCalculator
+from application.services import HeatLossQueryService, LocalHeatLossClient
+from application.surrogate import (
+    AnnualDemandModel,
+    DesignPoint,
+    SurrogateDesign,
+    SurrogateTrainer,
+)
+from application.sweep import ParametricSweep, SweepParameter
+from domain.building.block_heat_balance import BlockHeatBalance
+from domain.building.columns import BuildingColumns
+from domain.building.enums import ThermalBoundaryType
+from domain.building.internal_gains import InternalGainsModel
+from domain.building.reduced_order_model import ModelReducer
+from domain.building.services import (
+    BatchThermalCalculationService,
+    GroundHeatTransferService,
+    ThermalCalculationService,
+)
+from domain.building.thermal_network import build_element_network
+from domain.building.value_objects import (
+    AirChangeRate,
+    Area,
+    Pitch,
+    ThermalConductance,
+    ZoneCoupling,
+)
+from domain.climate.value_objects import (
+    AnnualTemperatureCycle,
+    ClimateRegion,
+    SolarIrradiance,
+)
+from domain.energy.entities import EnergyLedger
+from domain.energy.enums import EndUse
+from domain.energy.value_objects import Energy, LedgerChannel
+from domain.shared.precision import SINGLE_PRECISION
+from domain.shared.value_objects import Temperature, ThermalResistance
+from domain.simulation.entities.simulation_clock import SimulationClock
+from domain.simulation.value_objects import SimulationTime, TimeStepDuration
+from infrastructure.catalogue import BuildingCatalogue, write_catalogue
+from infrastructure.execution import ExecutionBackend
+from infrastructure.instrumentation import Profiler, stage
+from infrastructure.loaders import (
+    BuildingStockLoader,
+    GapFillPolicy,
+    MeterReadingLoader,
+    write_stock_file,
+)
+from infrastructure.repositories import (
+    IndexedElementRepository,
+    OrientationRange,
+    ValueRange,
+)
+from infrastructure.results import Aggregate, ResultStore, ResultStoreWriter
+
+_TEMPORARY_DIR = Path(tempfile.mkdtemp(prefix="hem-benchmarks-"))
+atexit.register(shutil.rmtree, _TEMPORARY_DIR, ignore_errors=True)
+
+
+def _year_clock(timestep: timedelta = timedelta(minutes=30)) -> SimulationClock:
+    start = SimulationTime(datetime=datetime(2025, 1, 1))
+    return SimulationClock(
+        id=UUID(int=0),
+        start_time=start,
+        end_time=SimulationTime(datetime=datetime(2026, 1, 1)),
+        timestep_duration=TimeStepDuration(duration=timestep),
+        current_time=start,
+        current_timestep=0,
+    )
+
+
+@benchmark("value_objects.construct_area")
+def construct_area() -> Callable[[], object]:
+    return lambda: Area(square_metres=12.5)
+
+
+@benchmark("value_objects.construct_thermal_resistance")
+def construct_thermal_resistance() -> Callable[[], object]:
+    return lambda: ThermalResistance(m2_k_per_w=2.5)
+
+
+@benchmark("value_objects.construct_temperature")
+def construct_temperature() -> Callable[[], object]:
+    return lambda: Temperature(celsius=21.0)
+
+
+@benchmark("thermal_calculation_service.calculate_u_value")
+def calculate_u_value() -> Callable[[], object]:
+    service = ThermalCalculationService()
+    resistance = ThermalResistance(m2_k_per_w=2.5)
+    pitch = Pitch(degrees=90.0)
+    return lambda: service.calculate_u_value(
+        construction_resistance=resistance,
+        pitch=pitch,
+        thermal_boundary_type=ThermalBoundaryType.EXTERNAL_SOLID,
+    )
+
+
+def _register_zone_htc(element_count: int) -> None:
+    @benchmark(f"zone.total_fabric_htc[{element_count}_elements]")
+    def zone_htc() -> Callable[[], object]:
+        zone = make_zone(random.Random(element_count), element_count)
+        return zone.calculate_total_fabric_heat_transfer_coefficient
+
+
+def _register_building_htc(zone_count: int) -> None:
+    @benchmark(f"building.total_htc[{zone_count}_zones]")
+    def building_htc() -> Callable[[], object]:
+        building = make_building(random.Random(zone_count), zone_count=zone_count)
+        return building.calculate_total_heat_transfer_coefficient
+
+
+for _element_count in (10, 100, 1000):
+    _register_zone_htc(_element_count)
+for _zone_count in (1, 10, 100):
+    _register_building_htc(_zone_count)
+
+
+@benchmark("simulation_clock.advance_year_half_hourly")
+def advance_clock_year() -> Callable[[], object]:
+    def advance_year() -> None:
+        clock = _year_clock()
+        for _ in range(clock.total_time_steps):
+            clock.advance()
+
+    return advance_year
+
+
+@benchmark("simulation_clock.calendar_index_year_half_hourly")
+def calendar_index_year() -> Callable[[], object]:
+    return lambda: _year_clock().calendar_index
+
+
+@benchmark("batch.heat_transfer_coefficients[1000_buildings]")
+def batch_htc() -> Callable[[], object]:
+    columns = BuildingColumns.from_buildings(make_portfolio(1000))
+    service = BatchThermalCalculationService()
+    return lambda: service.calculate_heat_transfer_coefficients(columns)
+
+
+@benchmark("batch.object_model_htc[1000_buildings]")
+def object_model_htc() -> Callable[[], object]:
+    buildings = make_portfolio(1000)
+    return lambda: [
+        building.calculate_total_heat_transfer_coefficient() for building in buildings
+    ]
+
+
+@benchmark("loaders.jsonl_to_columns[1000_buildings]")
+def load_jsonl_columns() -> Callable[[], object]:
+    path = _TEMPORARY_DIR / "stock.jsonl"
+    write_stock_file(make_portfolio(1000), path)
+    return lambda: BuildingStockLoader(path).load_columns()
+
+
+@benchmark("loaders.csv_to_columns[1000_buildings]")
+def load_csv_columns() -> Callable[[], object]:
+    path = _TEMPORARY_DIR / "stock.csv"
+    write_stock_file(make_portfolio(1000), path)
+    return lambda: BuildingStockLoader(path).load_columns()
+
+
+@benchmark("catalogue.open_and_batch_htc[1000_buildings]")
+def catalogue_batch_htc() -> Callable[[], object]:
+    path = _TEMPORARY_DIR / "stock.hemcat"
+    write_catalogue(make_portfolio(1000), path)
+    service = BatchThermalCalculationService()
+
+    def open_and_calculate() -> object:
+        with BuildingCatalogue(path) as catalogue:
+            columns = catalogue.columns()
+            result = service.calculate_heat_transfer_coefficients(columns)
+            del columns
+        return result
+
+    return open_and_calculate
+
+
+@benchmark("catalogue.random_access[1000_buildings]")
+def catalogue_random_access() -> Callable[[], object]:
+    buildings = make_portfolio(1000)
+    path = _TEMPORARY_DIR / "random_access.hemcat"
+    write_catalogue(buildings, path)
+    catalogue = BuildingCatalogue(path)
+    building_id = buildings[731].id
+    return lambda: catalogue.get(building_id)
+
+
+@benchmark("energy_ledger.record_year_half_hourly[4_channels]")
+def ledger_record_year() -> Callable[[], object]:
+    clock = _year_clock()
+    building_id = UUID(int=1)
+    end_uses = (
+        EndUse.SPACE_HEATING,
+        EndUse.WATER_HEATING,
+        EndUse.LIGHTING,
+        EndUse.APPLIANCES,
+    )
+    channels = [
+        LedgerChannel(building_id=building_id, end_use=end_use) for end_use in end_uses
+    ]
+    watts = [1500.0, 300.0, 60.0, 250.0]
+    clock.calendar_index  # built once, outside the timed region
+
+    def record_year() -> None:
+        ledger = EnergyLedger.for_clock(clock, channels)
+        for timestep in range(clock.total_time_steps):
+            ledger.record(timestep, watts)
+
+    return record_year
+
+
+@benchmark("portfolio.design_load_calculator[1000_buildings]")
+def design_load_calculator() -> Callable[[], object]:
+    buildings = make_portfolio(1000)
+    design_temperatures = {"default": Temperature(celsius=-3.0)}
+
+    def calculate() -> object:
+        calculator = PortfolioDesignLoadCalculator(design_temperatures)
+        for building in buildings:
+            calculator.add(building, "default")
+        return calculator.summary()
+
+    return calculate
+
+
+@benchmark("instrumentation.stage_disabled")
+def stage_disabled() -> Callable[[], object]:
+    def enter_stage() -> None:
+        with stage("disabled"):
+            pass
+
+    return enter_stage
+
+
+@benchmark("instrumentation.profiled_building_htc[10_zones]")
+def profiled_building_htc() -> Callable[[], object]:
+    building = make_building(random.Random(10), zone_count=10)
+
+    def calculate() -> object:
+        with Profiler():
+            return building.calculate_total_heat_transfer_coefficient()
+
+    return calculate
+
+
+@benchmark("services.heat_loss_queries[1000_concurrent]")
+def heat_loss_queries() -> Callable[[], object]:
+    buildings = make_portfolio(1000)
+
+    async def query_all() -> object:
+        async with HeatLossQueryService() as service:
+            return await LocalHeatLossClient(service).heat_loss_many(buildings)
+
+    return lambda: asyncio.run(query_all())
+
+
+@benchmark("repositories.element_query[1000_buildings]")
+def element_query() -> Callable[[], object]:
+    columns = BuildingColumns.from_buildings(make_portfolio(1000))
+    years = random.Random(1930)
+    repository = IndexedElementRepository(
+        columns,
+        {"year_built": [years.randint(1850, 2020) for _ in columns.building_ids]},
+    )
+    return lambda: repository.query(
+        boundary_types=[ThermalBoundaryType.EXTERNAL_SOLID],
+        orientation=OrientationRange(315.0, 45.0),
+        thermal_resistance=ValueRange(maximum=1.0),
+        building_attributes={"year_built": ValueRange(maximum=1930.0)},
+    )
+
+
+@benchmark("ground.monthly_heat_losses[1000_buildings]")
+def ground_monthly_heat_losses() -> Callable[[], object]:
+    columns = BuildingColumns.from_buildings(make_portfolio(1000))
+    service = GroundHeatTransferService()
+    cycle = AnnualTemperatureCycle(
+        annual_mean=Temperature(celsius=10.0), amplitude_k=6.0, coldest_month=1
+    )
+    return lambda: service.calculate_monthly_ground_heat_losses(columns, cycle)
+
+
+@benchmark("block.implicit_step[300_zones_terrace]")
+def block_implicit_step() -> Callable[[], object]:
+    rng = random.Random(39)
+    buildings = [make_building(rng, zone_count=3) for _ in range(100)]
+    couplings = []
+    for previous, building in zip([None, *buildings], buildings):
+        first, second, third = building.zones
+        couplings.append(
+            ZoneCoupling(first.id, second.id, ThermalConductance(w_per_k=30.0))
+        )
+        couplings.append(
+            ZoneCoupling(second.id, third.id, ThermalConductance(w_per_k=20.0))
+        )
+        if previous is not None:
+            couplings.append(
+                ZoneCoupling(
+                    previous.zones[2].id, first.id, ThermalConductance(w_per_k=15.0)
+                )
+            )
+    block = BlockHeatBalance(
+        buildings, couplings, TimeStepDuration(duration=timedelta(hours=1))
+    )
+    temperatures = [18.0] * block.zone_count
+    gains = [500.0] * block.zone_count
+    return lambda: block.step(temperatures, 0.0, gains)
+
+
+def _week_simulation(reduce: bool) -> Callable[[], object]:
+    network = build_element_network(
+        make_building(random.Random(40), zone_count=4, elements_per_zone=12),
+        TimeStepDuration(duration=timedelta(hours=1)),
+    )
+    if reduce:
+        network, _ = ModelReducer().reduce(network)
+    external = [5.0] * 168
+    return lambda: network.simulate(20.0, external)
+
+
+@benchmark("rc_network.week_simulation[detailed]")
+def detailed_week_simulation() -> Callable[[], object]:
+    return _week_simulation(reduce=False)
+
+
+@benchmark("rc_network.week_simulation[reduced]")
+def reduced_week_simulation() -> Callable[[], object]:
+    return _week_simulation(reduce=True)
+
+
+@benchmark("calibration.gauss_newton[1000_buildings]")
+def calibration_gauss_newton() -> Callable[[], object]:
+    rng = random.Random(41)
+    buildings = make_portfolio(1000)
+    htc = BatchThermalCalculationService().calculate_heat_transfer_coefficients(
+        BuildingColumns.from_buildings(buildings)
+    )
+    demands = {}
+    for building, value in zip(buildings, htc):
+        degree_hours = tuple(rng.uniform(2000.0, 12000.0) for _ in range(12))
+        energy = tuple(
+            Energy(joules=value * rng.uniform(0.7, 1.3) * hours * 3600.0)
+            for hours in degree_hours
+        )
+        demands[building.id] = MeteredDemand(building.id, degree_hours, energy)
+    calibrator = BatchCalibrator(workers=1)
+    return lambda: calibrator.calibrate(buildings, demands)
+
+
+@benchmark("loaders.meter_series[20_meters_year_half_hourly]")
+def load_meter_series() -> Callable[[], object]:
+    clock = _year_clock()
+    path = _TEMPORARY_DIR / "meters.csv"
+    with path.open("w", encoding="utf-8") as stream:
+        stream.write("meter_id,timestamp,value,unit\n")
+        timestamps = [
+            timestamp.isoformat() for timestamp in clock.calendar_index.timestamps()
+        ]
+        for meter in range(20):
+            for step, timestamp in enumerate(timestamps):
+                if step % 97 != 0:
+                    stream.write(f"M{meter},{timestamp},{0.2 + step % 7 / 10},kWh\n")
+    loader = MeterReadingLoader(path, clock, gap_fill=GapFillPolicy.LINEAR)
+    return lambda: sum(1 for _ in loader.iter_series())
+
+
+_SURROGATE_REGION = ClimateRegion(
+    name="south",
+    temperature_cycle=AnnualTemperatureCycle(
+        annual_mean=Temperature(celsius=10.5), amplitude_k=6.5
+    ),
+    mean_solar_irradiance=SolarIrradiance(w_per_m2=90.0),
+)
+
+
+@benchmark("surrogate.dynamic_model[one_year_hourly]")
+def surrogate_dynamic_model() -> Callable[[], object]:
+    model = AnnualDemandModel()
+    point = DesignPoint(
+        heat_loss_parameter=1.5, thermal_mass_parameter=150.0, glazing_ratio=0.2
+    )
+    return lambda: model.annual_heating_demand(point, _SURROGATE_REGION)
+
+
+@benchmark("surrogate.table_query[single_dwelling]")
+def surrogate_table_query() -> Callable[[], object]:
+    design = SurrogateDesign(
+        heat_loss_parameters=(1.0, 2.0),
+        thermal_mass_parameters=(100.0, 250.0),
+        glazing_ratios=(0.1, 0.3),
+    )
+    table = SurrogateTrainer(workers=1).train([_SURROGATE_REGION], design)
+    return lambda: table.estimate(180.0, 1.5e7, 15.0, 100.0, "south")
+
+
+@benchmark("results.january_mean[250_of_1000_buildings]")
+def result_store_january_mean() -> Callable[[], object]:
+    clock = _year_clock(timedelta(hours=1))
+    rng = random.Random(45)
+    year = [15.0 + 5.0 * rng.random() for _ in range(clock.total_time_steps)]
+    path = _TEMPORARY_DIR / "results.hemres"
+    building_ids = [UUID(int=rng.getrandbits(128)) for _ in range(1000)]
+    with ResultStoreWriter(
+        path, clock, ["air_temperature"], precision=SINGLE_PRECISION
+    ) as writer:
+        for index, building_id in enumerate(building_ids):
+            offset = index % 24
+            zone = year[offset:] + year[:offset]
+            writer.add(building_id, {"air_temperature": [zone, zone]})
+    store = ResultStore(path)
+    selected = building_ids[::4]
+    january = (datetime(2025, 1, 1), datetime(2025, 2, 1))
+    return lambda: store.aggregate(
+        selected, "air_temperature", Aggregate.MEAN, *january
+    )
+
+
+@benchmark("sweep.parametric[100_variants_10_zones]")
+def parametric_sweep() -> Callable[[], object]:
+    building = make_building(random.Random(46), zone_count=10, elements_per_zone=20)
+    sweep = ParametricSweep(
+        building,
+        [
+            SweepParameter.setpoint(
+                [Temperature(celsius=celsius) for celsius in (18, 19, 20, 21, 22)]
+            ),
+            SweepParameter.ventilation_rate(
+                [AirChangeRate(changes_per_hour=rate) for rate in (0.3, 0.5, 0.7, 1.0)]
+            ),
+            SweepParameter.thermal_resistance(
+                [ThermalResistance(m2_k_per_w=r) for r in (0.5, 1.5, 3.0, 5.0, 7.0)]
+            ),
+        ],
+        workers=1,
+    )
+    return sweep.run
+
+
+@benchmark("comparison.diff_batch_outputs[200k_buildings]")
+def diff_batch_outputs() -> Callable[[], object]:
+    rng = random.Random(47)
+    building_ids = [UUID(int=rng.getrandbits(128)) for _ in range(200_000)]
+    values = [rng.uniform(50.0, 500.0) for _ in building_ids]
+    for name, drift in (("reference", 0.0), ("candidate", 1e-9)):
+        output_dir = _TEMPORARY_DIR / f"diff-{name}"
+        output_dir.mkdir()
+        (output_dir / MANIFEST_NAME).write_text("{}", encoding="utf-8")
+        for index, start in enumerate(range(0, len(building_ids), 10_000)):
+            write_shard(
+                shard_path(output_dir, index),
+                CalculationType.HEAT_TRANSFER_COEFFICIENT,
+                zip(
+                    building_ids[start : start + 10_000],
+                    (value * (1 + drift) for value in values[start : start + 10_000]),
+                ),
+            )
+    differ = ResultDiffer()
+    return lambda: differ.diff(
+        _TEMPORARY_DIR / "diff-reference", _TEMPORARY_DIR / "diff-candidate"
+    )
+
+
+@benchmark("internal_gains.ensemble[20_members_year_half_hourly]")
+def internal_gains_ensemble() -> Callable[[], object]:
+    building = make_building(random.Random(48), zone_count=4, elements_per_zone=6)
+    clock = _year_clock()
+    model = InternalGainsModel()
+    return lambda: model.ensemble(building, clock, members=20, seed=48)
+
+
+def _batch_run(backend: ExecutionBackend) -> Callable[[], object]:
+    stock_path = _TEMPORARY_DIR / "execution.hemcat"
+    if not stock_path.exists():
+        write_catalogue(make_portfolio(4000, seed=49), stock_path)
+    output_dir = _TEMPORARY_DIR / f"execution-{backend}"
+    runner = BatchRunner(
+        stock_path,
+        output_dir,
+        RunConfig(
+            calculation=CalculationType.HEAT_TRANSFER_COEFFICIENT, shard_size=250
+        ),
+        workers=2,
+        backend=backend,
+    )
+
+    def run() -> object:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        return runner.run()
+
+    return run
+
+
+@benchmark("execution.batch_htc[4000_buildings_serial]")
+def serial_batch_run() -> Callable[[], object]:
+    return _batch_run(ExecutionBackend.SERIAL)
+
+
+@benchmark("execution.batch_htc[4000_buildings_2_threads]")
+def thread_batch_run() -> Callable[[], object]:
+    return _batch_run(ExecutionBackend.THREAD)
+
+
+@benchmark("execution.batch_htc[4000_buildings_2_processes]")
+def process_batch_run() -> Callable[[], object]:
+    return _batch_run(ExecutionBackend.PROCESS)
+
+
+def _chunked_sweep(backend: ExecutionBackend) -> Callable[[], object]:
+    building = make_building(random.Random(49), zone_count=10, elements_per_zone=20)
+    sweep = ParametricSweep(
+        building,
+        [
+            SweepParameter.setpoint(
+                [Temperature(celsius=celsius) for celsius in range(12, 22)]
+            ),
+            SweepParameter.thermal_resistance(
+                [ThermalResistance(m2_k_per_w=r) for r in range(1, 11)]
+            ),
+        ],
+        workers=2,
+        chunk_size=10,
+        backend=backend,
+    )
+    return sweep.run
+
+
+@benchmark("execution.sweep[100_variants_2_threads]")
+def thread_sweep() -> Callable[[], object]:
+    return _chunked_sweep(ExecutionBackend.THREAD)
+
+
+@benchmark("execution.sweep[100_variants_2_processes]")
+def process_sweep() -> Callable[[], object]:
+    return _chunked_sweep(ExecutionBackend.PROCESS)
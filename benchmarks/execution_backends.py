@@ -0,0 +1,147 @@
+"""Compare wall time and peak memory of a batch run on each execution backend.
+
+A catalogue of synthetic buildings is written once, then the same HTC batch
+run is made on every backend. Each step runs in a fresh interpreter started
+from this small one, since a process inherits the peak resident memory of
+the process it was forked from. Every backend must write
+identical shard files; the script exits with status 1 when they differ.
+
+The memory of a process-pool run is estimated as the peak of the parent
+plus the peak of the largest worker for every worker, since each worker is
+a full interpreter holding its own copy of the modules it imports.
+
+Usage, from the repository root:
+
+    python benchmarks/execution_backends.py
+    python benchmarks/execution_backends.py --buildings 50000 --workers 8
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / "src"
+BACKENDS = ("serial", "thread", "process")
+
+
+def peak_rss_mib(who: int) -> float:
+    """Peak resident memory of this process or its largest child, in MiB."""
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_backend(
+    stock_path: Path, output_dir: Path, backend: str, workers: int
+) -> dict[str, float]:
+    """Make the batch run on one backend in this process."""
+    sys.path.insert(0, str(SRC_DIR))
+    from application.batch import BatchRunner, CalculationType, RunConfig
+    from infrastructure.execution import ExecutionBackend
+
+    runner = BatchRunner(
+        stock_path,
+        output_dir,
+        RunConfig(calculation=CalculationType.HEAT_TRANSFER_COEFFICIENT),
+        workers=workers,
+        backend=ExecutionBackend(backend),
+    )
+    started = time.perf_counter()
+    runner.run()
+    return {
+        "seconds": time.perf_counter() - started,
+        "parent_mib": peak_rss_mib(resource.RUSAGE_SELF),
+        "worker_mib": peak_rss_mib(resource.RUSAGE_CHILDREN),
+    }
+
+
+def write_stock(stock_path: Path, buildings: int) -> None:
+    """Write a catalogue of synthetic buildings."""
+    from fixtures import make_portfolio
+
+    from infrastructure.catalogue import write_catalogue
+
+    write_catalogue(make_portfolio(buildings), stock_path)
+
+
+def run_script(*arguments: str) -> str:
+    """Standard output of this script run with arguments in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, __file__, *arguments],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--buildings", type=int, default=20_000, help="buildings (default: 20000)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="workers of the thread and process backends (default: CPUs)",
+    )
+    # Steps run in fresh interpreters
+    parser.add_argument("--write-stock", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--run-backend", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("paths", nargs="*", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.write_stock:
+        write_stock(args.paths[0], args.buildings)
+        return 0
+    if args.run_backend is not None:
+        stock_path, output_dir = args.paths
+        result = run_backend(stock_path, output_dir, args.run_backend, args.workers)
+        print(json.dumps(result))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="hem-execution-") as directory:
+        root = Path(directory)
+        stock_path = root / "stock.hemcat"
+        run_script("--write-stock", "--buildings", str(args.buildings), str(stock_path))
+
+        print(f"{args.buildings} buildings, {args.workers} workers")
+        print(f"{'backend':<10} {'time':>10} {'peak memory':>14}")
+        for backend in BACKENDS:
+            output = run_script(
+                "--run-backend",
+                backend,
+                "--workers",
+                str(args.workers),
+                str(stock_path),
+                str(root / backend),
+            )
+            result = json.loads(output)
+            memory = result["parent_mib"]
+            if backend == "process":
+                memory += args.workers * result["worker_mib"]
+            print(f"{backend:<10} {result['seconds']:>8.2f} s {memory:>10.1f} MiB")
+
+        shard_names = sorted(path.name for path in (root / "serial").iterdir())
+        differing = 0
+        for backend in BACKENDS[1:]:
+            _, mismatched, missing = filecmp.cmpfiles(
+                root / "serial", root / backend, shard_names, shallow=False
+            )
+            if mismatched or missing:
+                differing += 1
+                print(f"{backend} results differ from serial: {mismatched + missing}")
+    return 1 if differing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
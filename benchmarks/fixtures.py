@@ -0,0 +1,90 @@
+"""Deterministic synthetic buildings for benchmarks."""
+
+import random
+from uuid import UUID
+
+import harness  # noqa: F401  (puts src on the import path)
+
+from domain.building.aggregates.building import Building
+from domain.building.entities import BuildingElement, Zone
+from domain.building.enums import JunctionType, ThermalBoundaryType
+from domain.building.value_objects import (
+    AirChangeRate,
+    Area,
+    ArealHeatCapacity,
+    Orientation,
+    Pitch,
+    ThermalBridgeJunction,
+    ThermalConductance,
+    Volume,
+)
+from domain.shared.value_objects import Length, Temperature, ThermalResistance
+
+# Boundary types whose U-value the object model can represent
+BOUNDARY_TYPES = (
+    ThermalBoundaryType.EXTERNAL_SOLID,
+    ThermalBoundaryType.EXTERNAL_GLAZING,
+    ThermalBoundaryType.GROUND_CONTACT,
+    ThermalBoundaryType.UNHEATED_SPACE,
+)
+
+JUNCTION_TYPES = tuple(JunctionType)
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def make_element(rng: random.Random) -> BuildingElement:
+    boundary_type = rng.choice(BOUNDARY_TYPES)
+    area = rng.uniform(2.0, 30.0)
+    return BuildingElement(
+        id=_uuid(rng),
+        name="element",
+        thermal_boundary_type=boundary_type,
+        area=Area(square_metres=area),
+        thermal_resistance=ThermalResistance(m2_k_per_w=rng.uniform(0.2, 5.0)),
+        areal_heat_capacity=ArealHeatCapacity(j_per_m2_k=rng.uniform(1e4, 1.5e5)),
+        orientation=Orientation(degrees=rng.uniform(0.0, 360.0)),
+        pitch=Pitch(degrees=rng.choice((0.0, 45.0, 90.0, 180.0))),
+        exposed_perimeter=(
+            Length(meters=2.0 * area**0.5)
+            if boundary_type == ThermalBoundaryType.GROUND_CONTACT
+            else None
+        ),
+    )
+
+
+def make_zone(rng: random.Random, element_count: int) -> Zone:
+    return Zone(
+        id=_uuid(rng),
+        name="zone",
+        area=Area(square_metres=rng.uniform(20.0, 80.0)),
+        volume=Volume(cubic_metres=rng.uniform(50.0, 200.0)),
+        building_elements=[make_element(rng) for _ in range(element_count)],
+        ventilation_rate=AirChangeRate(changes_per_hour=rng.uniform(0.3, 1.5)),
+        temperature_setpoint=Temperature(celsius=rng.uniform(18.0, 21.0)),
+        thermal_bridges=[ThermalConductance(w_per_k=rng.uniform(1.0, 10.0))],
+        junctions=[
+            ThermalBridgeJunction(
+                junction_type=rng.choice(JUNCTION_TYPES),
+                length=Length(meters=rng.uniform(1.0, 12.0)),
+            )
+            for _ in range(3)
+        ],
+    )
+
+
+def make_building(
+    rng: random.Random, zone_count: int = 2, elements_per_zone: int = 8
+) -> Building:
+    return Building(
+        id=_uuid(rng),
+        name="building",
+        zones=[make_zone(rng, elements_per_zone) for _ in range(zone_count)],
+    )
+
+
+def make_portfolio(size: int, seed: int = 0) -> list[Building]:
+    rng = random.Random(seed)
+    return [make_building(rng) for _ in range(size)]
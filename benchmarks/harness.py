@@ -0,0 +1,145 @@
+"""Benchmark registry, timing and baseline comparison.
+
+Each benchmark is a setup function that builds its inputs and returns a
+zero-argument callable to time. Setup runs once, outside the timed region.
+"""
+
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+Setup = Callable[[], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A registered benchmark case.
+
+    Attributes:
+        name: Unique, dotted name of the case
+        setup: Builds the case inputs and returns the callable to time
+    """
+
+    name: str
+    setup: Setup
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Timing of one benchmark case.
+
+    Attributes:
+        name: Name of the case
+        seconds_per_call: Best observed wall time of one call, in seconds
+        calls: Number of calls per timing repeat
+    """
+
+    name: str
+    seconds_per_call: float
+    calls: int
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Comparison of a result against its baseline.
+
+    Attributes:
+        result: The current result
+        baseline_seconds: Baseline time per call, or None if the case is new
+        tolerance: Allowed relative slowdown before the case counts as regressed
+    """
+
+    result: BenchmarkResult
+    baseline_seconds: float | None
+    tolerance: float
+
+    @property
+    def ratio(self) -> float | None:
+        """Current time divided by baseline time."""
+        if self.baseline_seconds is None:
+            return None
+        return self.result.seconds_per_call / self.baseline_seconds
+
+    @property
+    def regressed(self) -> bool:
+        """Whether the case is slower than the baseline allows."""
+        return self.ratio is not None and self.ratio > 1 + self.tolerance
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a setup function as a benchmark case."""
+
+    def register(setup: Setup) -> Setup:
+        if name in REGISTRY:
+            raise ValueError(f"Benchmark '{name}' is already registered")
+        REGISTRY[name] = Benchmark(name=name, setup=setup)
+        return setup
+
+    return register
+
+
+def run_benchmark(case: Benchmark, repeat: int = 5) -> BenchmarkResult:
+    """Time a benchmark case, keeping the best of several repeats."""
+    timer = timeit.Timer(case.setup())
+    calls, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=calls))
+    return BenchmarkResult(name=case.name, seconds_per_call=best / calls, calls=calls)
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    """Load baseline times per call from a JSON baseline file."""
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        name: float(result["seconds_per_call"])
+        for name, result in data["results"].items()
+    }
+
+
+def save_baseline(path: Path, results: list[BenchmarkResult]) -> None:
+    """Write results to a JSON baseline file, keeping cases not re-run."""
+    data: dict[str, Any] = {"results": {}}
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+    data.update(
+        {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+        }
+    )
+    for result in results:
+        data["results"][result.name] = {
+            "seconds_per_call": result.seconds_per_call,
+            "calls": result.calls,
+        }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(
+    results: list[BenchmarkResult], baseline: dict[str, float], tolerance: float
+) -> list[Comparison]:
+    """Compare results against baseline times."""
+    return [
+        Comparison(
+            result=result,
+            baseline_seconds=baseline.get(result.name),
+            tolerance=tolerance,
+        )
+        for result in results
+    ]
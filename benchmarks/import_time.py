@@ -0,0 +1,75 @@
+"""Measure import time of the main entry points against a startup budget.
+
+Each entry point is imported in a fresh interpreter with ``-X importtime``
+and the cumulative time of its top-level import is taken, best of several
+runs. Exits with status 1 when any entry point exceeds its budget.
+
+Usage, from the repository root:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / "src"
+DEFAULT_BUDGETS = BENCHMARKS_DIR / "import_budgets.json"
+
+
+def measure_import_microseconds(module: str) -> int:
+    """Cumulative import time of a module in a fresh interpreter, in µs."""
+    environment = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, self_us, cumulative_us, name = (
+            part.strip() for part in line.replace(":", "|", 1).split("|")
+        )
+        if name == module:
+            return int(cumulative_us)
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budgets", type=Path, default=DEFAULT_BUDGETS, help="budget JSON file"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="imports per entry point (default: 5)"
+    )
+    args = parser.parse_args(argv)
+
+    budgets = json.loads(args.budgets.read_text(encoding="utf-8"))
+    over_budget = 0
+    for module, budget_ms in budgets["entry_points"].items():
+        best_ms = (
+            min(measure_import_microseconds(module) for _ in range(args.runs)) / 1000
+        )
+        status = "ok" if best_ms <= budget_ms else "OVER BUDGET"
+        if best_ms > budget_ms:
+            over_budget += 1
+        print(f"{module:<45} {best_ms:>8.1f} ms / {budget_ms:>6.1f} ms  {status}")
+
+    if over_budget:
+        print(f"\n{over_budget} entry point(s) over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Run the benchmark suite and compare it against a stored baseline.
+
+Usage, from the repository root:
+
+    python benchmarks/run_benchmarks.py                  # compare to baseline
+    python benchmarks/run_benchmarks.py --save           # record a new baseline
+    python benchmarks/run_benchmarks.py -k building.     # only matching cases
+
+Exits with status 1 when any case is slower than its baseline by more than
+the tolerance, and with status 2 when there is no baseline to compare
+against. Baselines are machine specific; record one per machine.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import cases  # noqa: F401  (registers the benchmark cases)
+from harness import REGISTRY, compare, load_baseline, run_benchmark, save_baseline
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "baseline.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k", dest="pattern", default="", help="only run cases containing this text"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON file"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown before failing (default: 0.25)",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timing repeats per case (default: 5)"
+    )
+    args = parser.parse_args(argv)
+    if args.tolerance < 0:
+        parser.error("tolerance must be non-negative")
+
+    selected = [case for name, case in REGISTRY.items() if args.pattern in name]
+    if not selected:
+        print(f"No benchmark cases match '{args.pattern}'", file=sys.stderr)
+        return 2
+
+    results = []
+    for case in selected:
+        result = run_benchmark(case, repeat=args.repeat)
+        results.append(result)
+        print(f"{case.name:<50} {_format_seconds(result.seconds_per_call):>12}")
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(
+            f"\nNo baseline at {args.baseline}; run with --save to record one",
+            file=sys.stderr,
+        )
+        return 2
+
+    print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+    regressions = 0
+    for comparison in compare(results, baseline, args.tolerance):
+        if comparison.ratio is None:
+            status = "new"
+        elif comparison.regressed:
+            status = "REGRESSED"
+            regressions += 1
+        else:
+            status = "ok"
+        ratio = f"{comparison.ratio:.2f}x" if comparison.ratio is not None else "-"
+        print(f"{comparison.result.name:<50} {ratio:>8}  {status}")
+
+    if regressions:
+        print(f"\n{regressions} case(s) regressed beyond tolerance", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
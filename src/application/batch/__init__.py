@@ -0,0 +1,14 @@
+from .batch_runner import BatchRunner, BatchRunSummary, ProgressReporter
+from .queued_run import QueuedBatchRun
+from .run_config import CalculationType, ClockConfig, RunConfig, WeatherConfig
+
+__all__ = [
+    "BatchRunner",
+    "BatchRunSummary",
+    "CalculationType",
+    "ClockConfig",
+    "ProgressReporter",
+    "QueuedBatchRun",
+    "RunConfig",
+    "WeatherConfig",
+]
@@ -0,0 +1,386 @@
+"""Sharded batch runs over a building stock file.
+
+Buildings are split into fixed-size shards in file order. Shards are handed to
+the workers of an execution backend a few at a time, so faster workers pick up
+more shards, and each worker writes its shard's results to its own file with
+an atomic rename. Every backend writes identical shard files.
+A shard file therefore either exists complete or not at all, which is what
+lets an interrupted run resume by skipping the shards already on disk.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, ContextManager, TextIO
+from uuid import UUID, uuid4
+
+from application.batch.run_config import CalculationType, RunConfig
+from domain.building.columns import BuildingColumns
+from domain.building.services import BatchThermalCalculationService
+from domain.shared.precision import (
+    DOUBLE_PRECISION,
+    PrecisionErrorTracker,
+    PrecisionPolicy,
+    PrecisionReport,
+)
+from infrastructure.catalogue import CATALOGUE_SUFFIX, BuildingCatalogue
+from infrastructure.execution import ExecutionBackend, create_executor, default_backend
+from infrastructure.instrumentation import Profiler, active_profiler, stage
+from infrastructure.loaders import BuildingStockLoader
+from infrastructure.loaders.building_stock_loader import append_record
+
+MANIFEST_NAME = "run.json"
+
+# Building count, profiler stats and precision error stats of a shard
+ShardOutcome = tuple[int, dict[str, Any] | None, dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A contiguous range of buildings processed as one unit of work.
+
+    Attributes:
+        index: Position of the shard within the run
+        start: Index of the first building in the stock file
+        records: Stock file records of the shard, or None to read the range
+            from a catalogue file
+    """
+
+    index: int
+    start: int
+    records: list[dict[str, Any]] | None = None
+
+
+@dataclass(frozen=True)
+class BatchRunSummary:
+    """Outcome of a batch run.
+
+    Attributes:
+        shards_written: Number of shards calculated by this run
+        shards_skipped: Number of shards already on disk from an earlier run
+        buildings_calculated: Number of buildings calculated by this run
+        elapsed_seconds: Wall-clock duration of the run
+        precision_report: Error of the stored results against float64, over
+            the shards written by this run
+    """
+
+    shards_written: int
+    shards_skipped: int
+    buildings_calculated: int
+    elapsed_seconds: float
+    precision_report: PrecisionReport | None = None
+
+
+class ProgressReporter:
+    """Reports throughput and estimated time remaining for a batch run.
+
+    Attributes:
+        total_buildings: Number of buildings in the run, if known
+    """
+
+    def __init__(
+        self,
+        total_buildings: int | None = None,
+        stream: TextIO = sys.stderr,
+        interval_seconds: float = 1.0,
+    ) -> None:
+        self.total_buildings = total_buildings
+        self._stream = stream
+        self._interval_seconds = interval_seconds
+        self._started = time.monotonic()
+        self._last_report = 0.0
+        self._buildings = 0
+        self._skipped = 0
+        self._shards = 0
+
+    def shard_skipped(self, building_count: int) -> None:
+        """Record a shard already completed by an earlier run."""
+        self._skipped += building_count
+
+    def shard_completed(self, building_count: int) -> None:
+        """Record a shard completed by this run."""
+        self._buildings += building_count
+        self._shards += 1
+        now = time.monotonic()
+        if now - self._last_report >= self._interval_seconds:
+            self._last_report = now
+            self._stream.write(self._format(now) + "\n")
+            self._stream.flush()
+
+    def finish(self) -> None:
+        """Write a final progress line."""
+        self._stream.write(self._format(time.monotonic()) + "\n")
+        self._stream.flush()
+
+    def _format(self, now: float) -> str:
+        elapsed = max(now - self._started, 1e-9)
+        rate = self._buildings / elapsed
+        line = f"shards {self._shards} | buildings {self._buildings}"
+        if self._skipped:
+            line += f" (+{self._skipped} resumed)"
+        line += f" | {rate:,.0f} buildings/s"
+        if self.total_buildings is not None and rate > 0:
+            remaining = self.total_buildings - self._skipped - self._buildings
+            line += f" | ETA {_format_duration(max(remaining, 0) / rate)}"
+        return line
+
+
+class BatchRunner:
+    """Runs a calculation over every building of a stock file.
+
+    Attributes:
+        stock_path: Path of the stock file or catalogue
+        output_dir: Directory the manifest and shard results are written to
+        config: The run configuration
+        workers: Number of workers
+        progress: Progress reporter, or None to run silently
+        profiler: Profiler that worker stage timings are merged into, or None
+            to run without instrumentation
+        backend: Backend the shards are calculated on
+    """
+
+    def __init__(
+        self,
+        stock_path: Path | str,
+        output_dir: Path | str,
+        config: RunConfig,
+        workers: int | None = None,
+        progress: ProgressReporter | None = None,
+        profiler: Profiler | None = None,
+        backend: ExecutionBackend | None = None,
+    ) -> None:
+        self.stock_path = Path(stock_path)
+        self.output_dir = Path(output_dir)
+        self.config = config
+        self.workers = workers or os.cpu_count() or 1
+        self.progress = progress
+        self.profiler = profiler
+        self.backend = backend or default_backend()
+        self._is_catalogue = self.stock_path.suffix == CATALOGUE_SUFFIX
+
+    def run(self) -> BatchRunSummary:
+        """Calculate every shard not already written to the output directory."""
+        started = time.monotonic()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write_or_check_manifest(self.stock_path, self.output_dir, self.config)
+
+        written = skipped = buildings = 0
+        self._precision = PrecisionErrorTracker(self.config.precision)
+        in_flight: set[Future[ShardOutcome]] = set()
+        # Shards calculated in this process record their stages straight into
+        # the runner's profiler; worker processes profile and return stats
+        profile_in_workers = self.profiler is not None and not self.backend.in_process
+        with (
+            self._active_profiler(),
+            create_executor(self.backend, self.workers) as executor,
+        ):
+            for shard, building_count in self._iter_shards():
+                if shard_path(self.output_dir, shard.index).exists():
+                    skipped += 1
+                    if self.progress:
+                        self.progress.shard_skipped(building_count)
+                    continue
+                in_flight.add(
+                    executor.submit(
+                        calculate_shard,
+                        self.stock_path,
+                        self.output_dir,
+                        self.config,
+                        shard,
+                        building_count,
+                        profile_in_workers,
+                    )
+                )
+                if len(in_flight) >= 2 * self.workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        buildings += self._completed(future)
+                        written += 1
+            for future in wait(in_flight).done:
+                buildings += self._completed(future)
+                written += 1
+
+        if self.progress:
+            self.progress.finish()
+        return BatchRunSummary(
+            shards_written=written,
+            shards_skipped=skipped,
+            buildings_calculated=buildings,
+            elapsed_seconds=time.monotonic() - started,
+            precision_report=self._precision.report(),
+        )
+
+    def count_buildings(self) -> int | None:
+        """Number of buildings in the stock file, if it can be known cheaply."""
+        if self._is_catalogue:
+            with BuildingCatalogue(self.stock_path) as catalogue:
+                return len(catalogue)
+        return None
+
+    def _active_profiler(self) -> ContextManager[object]:
+        if (
+            self.profiler is None
+            or not self.backend.in_process
+            or active_profiler() is self.profiler
+        ):
+            return nullcontext()
+        return self.profiler
+
+    def _completed(self, future: "Future[ShardOutcome]") -> int:
+        building_count, stats, precision_stats = future.result()
+        if self.profiler is not None and stats is not None:
+            self.profiler.merge(stats)
+        self._precision.merge(precision_stats)
+        if self.progress:
+            self.progress.shard_completed(building_count)
+        return building_count
+
+    def _iter_shards(self) -> Iterator[tuple[Shard, int]]:
+        shard_size = self.config.shard_size
+        if self._is_catalogue:
+            total = self.count_buildings() or 0
+            for index, start in enumerate(range(0, total, shard_size)):
+                yield Shard(index=index, start=start), min(shard_size, total - start)
+            return
+
+        records = (
+            record for _, record in BuildingStockLoader(self.stock_path).iter_records()
+        )
+        index = 0
+        while chunk := list(islice(records, shard_size)):
+            shard = Shard(index=index, start=index * shard_size, records=chunk)
+            yield shard, len(chunk)
+            index += 1
+
+
+def calculate_shard(
+    stock_path: Path,
+    output_dir: Path,
+    config: RunConfig,
+    shard: Shard,
+    building_count: int,
+    profile: bool = False,
+) -> ShardOutcome:
+    """Calculate one shard and write its results file.
+
+    Runs in a worker thread or process. Values are calculated in float64 and
+    rounded to the run's storage precision before they are written.
+
+    Returns:
+        The number of buildings calculated, the shard's profiler stats when
+        profiling, and the error of the stored values against float64
+    """
+    profiler = Profiler() if profile else None
+    precision = PrecisionErrorTracker(config.precision)
+    with profiler or nullcontext():
+        if shard.records is None:
+            with BuildingCatalogue(stock_path) as catalogue:
+                with stage("shard.load"):
+                    columns = catalogue.columns(
+                        shard.start, shard.start + building_count
+                    )
+                    building_ids = list(columns.building_ids)
+                with stage("shard.calculate"):
+                    values = precision.store(calculate_columns(columns, config))
+                del columns
+        else:
+            with stage("shard.load"):
+                columns = BuildingColumns()
+                for record in shard.records:
+                    append_record(columns, record)
+                building_ids = columns.building_ids
+            with stage("shard.calculate"):
+                values = precision.store(calculate_columns(columns, config))
+
+        with stage("shard.write"):
+            write_shard(
+                shard_path(output_dir, shard.index),
+                config.calculation,
+                zip(building_ids, values),
+                config.precision,
+            )
+    return (
+        len(building_ids),
+        profiler.to_dict() if profiler else None,
+        precision.to_dict(),
+    )
+
+
+def calculate_columns(columns: BuildingColumns, config: RunConfig) -> list[float]:
+    """Run the configured calculation over columns of buildings."""
+    service = BatchThermalCalculationService()
+    if config.calculation == CalculationType.HEAT_TRANSFER_COEFFICIENT:
+        return list(service.calculate_heat_transfer_coefficients(columns))
+    if config.calculation == CalculationType.HEAT_LOSS_PARAMETER:
+        return list(service.calculate_heat_loss_parameters(columns))
+    assert config.weather.design_temperature is not None
+    return list(
+        service.calculate_design_heat_losses(
+            columns, config.weather.design_temperature.celsius
+        )
+    )
+
+
+def write_or_check_manifest(
+    stock_path: Path, output_dir: Path, config: RunConfig
+) -> None:
+    """Record the stock file and configuration of a run in its output directory.
+
+    Raises:
+        ValueError: If the directory already holds a run with a different
+            stock file or configuration
+    """
+    manifest = {
+        "stock_file": str(stock_path.resolve()),
+        "stock_file_size": stock_path.stat().st_size,
+        "config": config.to_dict(),
+    }
+    manifest_path = output_dir / MANIFEST_NAME
+    if manifest_path.exists():
+        existing = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if existing != manifest:
+            raise ValueError(
+                f"{output_dir} holds a run with a different stock file "
+                "or configuration; use a new output directory"
+            )
+        return
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def shard_path(output_dir: Path, index: int) -> Path:
+    """Path of the results file of a shard."""
+    return output_dir / f"shard-{index:06d}.csv"
+
+
+def write_shard(
+    path: Path,
+    calculation: CalculationType,
+    rows: Iterable[tuple[UUID, float]],
+    precision: PrecisionPolicy = DOUBLE_PRECISION,
+) -> None:
+    """Write shard results atomically: to a temporary file, then renamed.
+
+    Each write has its own temporary file, so workers that calculate the same
+    shard, after a lease was taken over, never interleave their output.
+    """
+    temporary_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    with temporary_path.open("w", encoding="utf-8", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(("building_id", calculation.value))
+        for building_id, value in rows:
+            writer.writerow((str(building_id), precision.format_value(value)))
+    os.replace(temporary_path, path)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,235 @@
+"""Batch runs whose shards are leased from a work queue.
+
+A queued run spreads over any number of worker processes on any number of
+nodes. Enqueuing records the run's manifest in the output directory and
+puts one work item per shard on a broker. Workers lease shards, calculate
+them and complete them once their results file is written. A worker renews
+its lease while it calculates, so a shard is only taken over when its
+worker stops renewing: it crashed, hung or lost its node.
+
+A shard may therefore be calculated twice. Results files are written
+atomically and are the same whoever writes them, so a second write is
+harmless, and a worker that leases a shard whose file already exists
+completes it without calculating it again.
+
+Workers read the stock file and configuration from the run's manifest, so
+every node needs the stock file at the same path and the output directory
+on a shared filesystem. Workers read their shards from the stock file by
+range, so queued runs need a building catalogue.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from application.batch.batch_runner import (
+    MANIFEST_NAME,
+    BatchRunSummary,
+    Shard,
+    calculate_shard,
+    shard_path,
+    write_or_check_manifest,
+)
+from application.batch.run_config import RunConfig
+from domain.shared.precision import PrecisionErrorTracker
+from infrastructure.catalogue import CATALOGUE_SUFFIX, BuildingCatalogue
+from infrastructure.execution import ExecutionBackend, default_backend, map_tasks
+from infrastructure.work_queue import (
+    BrokerUnavailableError,
+    Lease,
+    WorkItem,
+    WorkQueueBroker,
+)
+
+QUEUE_NAME = "queue.sqlite"
+
+# Shards written, shards found already written, buildings calculated and
+# precision error stats of one worker
+WorkerOutcome = tuple[int, int, int, dict[str, Any]]
+
+
+class QueuedBatchRun:
+    """A batch run whose shards are leased from a work queue.
+
+    Attributes:
+        output_dir: Directory holding the run's manifest and shard results
+        broker: Work queue of the run's shards
+    """
+
+    def __init__(self, output_dir: Path | str, broker: WorkQueueBroker) -> None:
+        self.output_dir = Path(output_dir)
+        self.broker = broker
+
+    def enqueue(self, stock_path: Path | str, config: RunConfig) -> int:
+        """Queue every shard of a building catalogue.
+
+        Enqueuing the same run again adds nothing, so it is safe to repeat.
+
+        Returns:
+            The number of shards added to the queue
+
+        Raises:
+            ValueError: If the stock file is not a building catalogue, or the
+                output directory holds a different run
+        """
+        stock_path = Path(stock_path)
+        if stock_path.suffix != CATALOGUE_SUFFIX:
+            raise ValueError(
+                f"Queued runs need a building catalogue ({CATALOGUE_SUFFIX}); "
+                "convert the stock file first"
+            )
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write_or_check_manifest(stock_path, self.output_dir, config)
+        with BuildingCatalogue(stock_path) as catalogue:
+            total = len(catalogue)
+        shard_size = config.shard_size
+        return self.broker.enqueue(
+            WorkItem(
+                key=index,
+                payload={
+                    "start": start,
+                    "building_count": min(shard_size, total - start),
+                },
+            )
+            for index, start in enumerate(range(0, total, shard_size))
+        )
+
+    def work(
+        self,
+        workers: int = 1,
+        backend: ExecutionBackend | None = None,
+        lease_seconds: float = 300.0,
+        poll_seconds: float = 1.0,
+    ) -> BatchRunSummary:
+        """Lease and calculate shards until the queue is finished.
+
+        Args:
+            workers: Number of workers leasing shards from this process
+            backend: Backend the workers run on
+            lease_seconds: Duration of a lease; it is renewed every third of
+                this while a shard is calculated
+            poll_seconds: Wait between leases while other workers hold every
+                remaining shard
+
+        Returns:
+            The shards and buildings calculated by these workers, with the
+            shards they found already written as skipped
+        """
+        if workers < 1:
+            raise ValueError("Number of workers must be positive")
+        if lease_seconds <= 0 or poll_seconds <= 0:
+            raise ValueError("Lease duration and poll interval must be positive")
+        started = time.monotonic()
+        _, config = read_manifest(self.output_dir)
+        outcomes = map_tasks(
+            work_shards,
+            [(self.output_dir, self.broker, lease_seconds, poll_seconds)] * workers,
+            backend or default_backend(),
+            workers,
+        )
+        precision = PrecisionErrorTracker(config.precision)
+        for *_, precision_stats in outcomes:
+            precision.merge(precision_stats)
+        return BatchRunSummary(
+            shards_written=sum(outcome[0] for outcome in outcomes),
+            shards_skipped=sum(outcome[1] for outcome in outcomes),
+            buildings_calculated=sum(outcome[2] for outcome in outcomes),
+            elapsed_seconds=time.monotonic() - started,
+            precision_report=precision.report(),
+        )
+
+
+def read_manifest(output_dir: Path) -> tuple[Path, RunConfig]:
+    """Stock file and configuration of the run in an output directory.
+
+    Raises:
+        ValueError: If the directory holds no run
+    """
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise ValueError(f"{output_dir} holds no run; enqueue one first")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    return Path(manifest["stock_file"]), RunConfig.from_dict(manifest["config"])
+
+
+def work_shards(
+    output_dir: Path,
+    broker: WorkQueueBroker,
+    lease_seconds: float,
+    poll_seconds: float,
+) -> WorkerOutcome:
+    """Lease and calculate shards of a queued run until its queue is finished.
+
+    Runs in a worker thread or process. A shard that raises is given back to
+    the queue, to be retried by any worker until it runs out of attempts.
+    """
+    stock_path, config = read_manifest(output_dir)
+    worker = f"{socket.gethostname()}:{os.getpid()}:{threading.get_native_id()}"
+    precision = PrecisionErrorTracker(config.precision)
+    written = skipped = buildings = 0
+    while True:
+        lease = broker.lease(worker, lease_seconds)
+        if lease is None:
+            if broker.progress().finished:
+                break
+            time.sleep(poll_seconds)
+            continue
+
+        index = lease.item.key
+        if shard_path(output_dir, index).exists():
+            broker.complete(lease)
+            skipped += 1
+            continue
+        try:
+            with _LeaseRenewal(broker, lease, lease_seconds):
+                building_count, _, precision_stats = calculate_shard(
+                    stock_path,
+                    output_dir,
+                    config,
+                    Shard(index=index, start=lease.item.payload["start"]),
+                    lease.item.payload["building_count"],
+                )
+        except Exception as error:
+            broker.fail(lease, f"{type(error).__name__}: {error}")
+            continue
+        broker.complete(lease)
+        precision.merge(precision_stats)
+        written += 1
+        buildings += building_count
+    return written, skipped, buildings, precision.to_dict()
+
+
+class _LeaseRenewal:
+    """Renews a lease from a background thread while a shard is calculated."""
+
+    def __init__(
+        self, broker: WorkQueueBroker, lease: Lease, lease_seconds: float
+    ) -> None:
+        self._broker = broker
+        self._lease = lease
+        self._lease_seconds = lease_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+
+    def __enter__(self) -> None:
+        self._thread.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _renew(self) -> None:
+        # Losing the lease is not fatal: the shard's results file is the
+        # same whichever worker writes it
+        while not self._stopped.wait(self._lease_seconds / 3):
+            try:
+                if not self._broker.renew(self._lease, self._lease_seconds):
+                    return
+            except BrokerUnavailableError:
+                # The queue could not be reached for now; renewing every
+                # third of the lease leaves time to try again on the next tick
+                continue
@@ -0,0 +1,173 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from domain.shared.precision import DOUBLE_PRECISION, PrecisionPolicy
+from domain.shared.value_objects import Temperature
+from domain.simulation.value_objects import SimulationTime, TimeStepDuration
+
+
+class CalculationType(Enum):
+    """Calculation type enumeration for batch runs."""
+
+    HEAT_TRANSFER_COEFFICIENT = "htc"
+    HEAT_LOSS_PARAMETER = "hlp"
+    DESIGN_HEAT_LOSS = "design_heat_loss"
+
+    @property
+    def unit(self) -> str:
+        """Unit of the calculated values."""
+        return _UNITS[self]
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value
+
+
+_UNITS = {
+    CalculationType.HEAT_TRANSFER_COEFFICIENT: "W/K",
+    CalculationType.HEAT_LOSS_PARAMETER: "W/m²·K",
+    CalculationType.DESIGN_HEAT_LOSS: "W",
+}
+
+
+@dataclass(frozen=True)
+class WeatherConfig:
+    """Weather settings for a batch run.
+
+    Attributes:
+        design_temperature: External design temperature for design heat loss
+    """
+
+    design_temperature: Temperature | None = None
+
+
+@dataclass(frozen=True)
+class ClockConfig:
+    """Simulation clock settings for a batch run.
+
+    Attributes:
+        start_time: Start of the simulated period
+        end_time: End of the simulated period
+        timestep_duration: Duration of a simulation time step
+    """
+
+    start_time: SimulationTime
+    end_time: SimulationTime
+    timestep_duration: TimeStepDuration
+
+    def __post_init__(self) -> None:
+        if self.end_time.datetime <= self.start_time.datetime:
+            raise ValueError("Clock end time must be after its start time")
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """Configuration of a batch run.
+
+    Loaded from a JSON file of the form::
+
+        {"calculation": "design_heat_loss",
+         "weather": {"design_temperature_c": -3.0},
+         "clock": {"start": "2025-01-01T00:00", "end": "2026-01-01T00:00",
+                   "timestep_minutes": 30},
+         "shard_size": 1000, "precision": "float32"}
+
+    Attributes:
+        calculation: The calculation to run for every building
+        weather: Weather settings
+        clock: Simulation clock settings, for calculations that step through time
+        shard_size: Number of buildings per result shard
+        precision: Precision results are stored with; "precision" is
+            "float64" (the default) or "float32"
+    """
+
+    calculation: CalculationType
+    weather: WeatherConfig = WeatherConfig()
+    clock: ClockConfig | None = None
+    shard_size: int = 1000
+    precision: PrecisionPolicy = DOUBLE_PRECISION
+
+    def __post_init__(self) -> None:
+        if self.shard_size <= 0:
+            raise ValueError("Shard size must be positive")
+        if (
+            self.calculation == CalculationType.DESIGN_HEAT_LOSS
+            and self.weather.design_temperature is None
+        ):
+            raise ValueError("Design heat loss runs need a design temperature")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RunConfig":
+        """Build a run configuration from its JSON form."""
+        try:
+            calculation = CalculationType(data["calculation"])
+        except KeyError:
+            raise ValueError("Run config needs a calculation") from None
+
+        weather_data = data.get("weather", {})
+        design_temperature = weather_data.get("design_temperature_c")
+        weather = WeatherConfig(
+            design_temperature=(
+                Temperature(celsius=float(design_temperature))
+                if design_temperature is not None
+                else None
+            )
+        )
+
+        clock = None
+        if (clock_data := data.get("clock")) is not None:
+            try:
+                start, end, timestep_minutes = (
+                    clock_data[key] for key in ("start", "end", "timestep_minutes")
+                )
+            except KeyError as error:
+                raise ValueError(f"Run config clock needs {error}") from None
+            clock = ClockConfig(
+                start_time=SimulationTime(datetime=datetime.fromisoformat(start)),
+                end_time=SimulationTime(datetime=datetime.fromisoformat(end)),
+                timestep_duration=TimeStepDuration(
+                    duration=timedelta(minutes=float(timestep_minutes))
+                ),
+            )
+
+        return cls(
+            calculation=calculation,
+            weather=weather,
+            clock=clock,
+            shard_size=int(data.get("shard_size", cls.shard_size)),
+            precision=PrecisionPolicy.from_name(
+                data.get("precision", DOUBLE_PRECISION.storage.value)
+            ),
+        )
+
+    @classmethod
+    def from_file(cls, path: Path | str) -> "RunConfig":
+        """Load a run configuration from a JSON file."""
+        with Path(path).open(encoding="utf-8") as stream:
+            return cls.from_dict(json.load(stream))
+
+    def to_dict(self) -> dict[str, Any]:
+        """The JSON form of the run configuration."""
+        weather: dict[str, Any] = {}
+        if (design_temperature := self.weather.design_temperature) is not None:
+            weather["design_temperature_c"] = design_temperature.celsius
+        data: dict[str, Any] = {
+            "calculation": self.calculation.value,
+            "weather": weather,
+            "shard_size": self.shard_size,
+        }
+        if self.clock is not None:
+            timestep = self.clock.timestep_duration.duration
+            data["clock"] = {
+                "start": self.clock.start_time.datetime.isoformat(),
+                "end": self.clock.end_time.datetime.isoformat(),
+                "timestep_minutes": timestep.total_seconds() / 60,
+            }
+        if not self.precision.is_exact:
+            # Left out at the default so manifests of earlier runs still match
+            data["precision"] = self.precision.storage.value
+        return data
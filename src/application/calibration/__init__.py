@@ -0,0 +1,17 @@
+from .batch_calibrator import (
+    BatchCalibrator,
+    CalibratedParameters,
+    CalibrationPriors,
+    CalibrationResult,
+    MeteredDemand,
+    ParameterPrior,
+)
+
+__all__ = [
+    "BatchCalibrator",
+    "CalibratedParameters",
+    "CalibrationPriors",
+    "CalibrationResult",
+    "MeteredDemand",
+    "ParameterPrior",
+]
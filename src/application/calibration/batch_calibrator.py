@@ -0,0 +1,469 @@
+"""Calibration of uncertain building inputs against metered heating demand.
+
+Each dwelling's metered demand is compared with a degree-hour model::
+
+    E_p = H(θ) · DH_p / η
+
+where DH_p are the heating degree hours of billing period p, η is the
+heating efficiency and H(θ) is the heat transfer coefficient with three
+multipliers applied to the archetype inputs: one on every element's
+construction resistance, one on every zone's air change rate and one on the
+zone thermal bridges and junctions.
+
+One scalar H cannot identify three multipliers on its own, so every
+multiplier has a Gaussian prior around the archetype default and the fit is
+the maximum a posteriori estimate. The metered data enter the objective only
+through three weighted sums per dwelling, and the Gauss-Newton normal
+equations are a diagonal prior plus a rank-one data term, solved in closed
+form with the Sherman-Morrison formula. Each iteration therefore costs two
+batch U-value passes over the elements of a chunk, whatever the number of
+billing periods. Steps that increase a dwelling's objective are halved, and
+dwellings that have converged drop out of the update.
+
+Dwellings are split into chunks that are fitted on an execution backend.
+"""
+
+import math
+import os
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import islice
+from uuid import UUID
+
+from domain.building.aggregates.building import Building
+from domain.building.columns import BuildingColumns
+from domain.building.services import BatchThermalCalculationService
+from domain.building.value_objects import ThermalConductance
+from domain.energy.value_objects import Efficiency, Energy
+from infrastructure.execution import ExecutionBackend, default_backend, map_tasks
+
+# Relative step of the finite-difference derivative of fabric heat loss
+_DERIVATIVE_STEP = 1e-6
+
+
+@dataclass(frozen=True)
+class MeteredDemand:
+    """Metered space heating demand of a dwelling over billing periods.
+
+    Attributes:
+        building_id: Identifier of the metered building
+        heating_degree_hours: Heating degree hours of each period in K·h,
+            against the dwelling's setpoint
+        energy: Metered heating fuel use of each period
+        heating_efficiency: Efficiency of the heating system
+    """
+
+    building_id: UUID
+    heating_degree_hours: tuple[float, ...]
+    energy: tuple[Energy, ...]
+    heating_efficiency: Efficiency = field(default_factory=lambda: Efficiency(1.0))
+
+    def __post_init__(self) -> None:
+        if not self.energy:
+            raise ValueError("Metered demand needs at least one period")
+        if len(self.heating_degree_hours) != len(self.energy):
+            raise ValueError("Need heating degree hours for every metered period")
+        if any(degree_hours < 0 for degree_hours in self.heating_degree_hours):
+            raise ValueError("Heating degree hours must be non-negative")
+        if self.heating_efficiency.ratio <= 0:
+            raise ValueError("Heating efficiency must be positive")
+
+
+@dataclass(frozen=True)
+class ParameterPrior:
+    """Gaussian prior of a calibration multiplier.
+
+    Attributes:
+        mean: Expected multiplier, 1 for the archetype default
+        standard_deviation: Spread of the multiplier
+    """
+
+    mean: float = 1.0
+    standard_deviation: float = 0.3
+
+    def __post_init__(self) -> None:
+        if self.mean <= 0:
+            raise ValueError("Prior mean must be positive")
+        if self.standard_deviation <= 0:
+            raise ValueError("Prior standard deviation must be positive")
+
+
+@dataclass(frozen=True)
+class CalibrationPriors:
+    """Priors of the three calibration multipliers.
+
+    Attributes:
+        thermal_resistance: Prior of the construction resistance multiplier
+        air_change_rate: Prior of the air change rate multiplier
+        thermal_bridges: Prior of the thermal bridge conductance multiplier
+    """
+
+    thermal_resistance: ParameterPrior = ParameterPrior(1.0, 0.3)
+    air_change_rate: ParameterPrior = ParameterPrior(1.0, 0.5)
+    thermal_bridges: ParameterPrior = ParameterPrior(1.0, 0.5)
+
+
+@dataclass(frozen=True)
+class CalibratedParameters:
+    """Multipliers applied to a dwelling's archetype inputs.
+
+    Attributes:
+        thermal_resistance_multiplier: Multiplier of every construction resistance
+        air_change_rate_multiplier: Multiplier of every zone air change rate
+        thermal_bridge_multiplier: Multiplier of thermal bridges and junctions
+    """
+
+    thermal_resistance_multiplier: float = 1.0
+    air_change_rate_multiplier: float = 1.0
+    thermal_bridge_multiplier: float = 1.0
+
+
+@dataclass(frozen=True)
+class CalibrationResult:
+    """Calibrated inputs of one dwelling.
+
+    Attributes:
+        building_id: Identifier of the building
+        parameters: The fitted multipliers
+        heat_transfer_coefficient: HTC with the fitted multipliers applied
+        rms_residual_kwh: Root mean square of the period residuals in kWh
+        iterations: Number of Gauss-Newton iterations taken
+        converged: Whether the steps fell below the tolerance
+    """
+
+    building_id: UUID
+    parameters: CalibratedParameters
+    heat_transfer_coefficient: ThermalConductance
+    rms_residual_kwh: float
+    iterations: int
+    converged: bool
+
+
+class BatchCalibrator:
+    """Fits calibration multipliers for many dwellings at once.
+
+    Attributes:
+        priors: Priors of the multipliers; their means are the default start
+        meter_error_fraction: Standard deviation of each metered period as a
+            fraction of its reading
+        minimum_meter_error_kwh: Smallest standard deviation of a period in kWh
+        minimum_multiplier: Lower bound of every multiplier
+        tolerance: Largest multiplier step at which a dwelling has converged
+        max_iterations: Iteration limit per dwelling
+        workers: Number of workers
+        chunk_size: Number of dwellings fitted by one worker task
+        backend: Backend the chunks are fitted on
+    """
+
+    def __init__(
+        self,
+        priors: CalibrationPriors = CalibrationPriors(),
+        meter_error_fraction: float = 0.1,
+        minimum_meter_error_kwh: float = 1.0,
+        minimum_multiplier: float = 0.05,
+        tolerance: float = 1e-6,
+        max_iterations: int = 30,
+        workers: int | None = None,
+        chunk_size: int = 500,
+        backend: ExecutionBackend | None = None,
+    ) -> None:
+        if meter_error_fraction <= 0 or minimum_meter_error_kwh <= 0:
+            raise ValueError("Meter errors must be positive")
+        if minimum_multiplier <= 0:
+            raise ValueError("Minimum multiplier must be positive")
+        if max_iterations < 1 or chunk_size < 1:
+            raise ValueError("Iteration limit and chunk size must be positive")
+        self.priors = priors
+        self.meter_error_fraction = meter_error_fraction
+        self.minimum_meter_error_kwh = minimum_meter_error_kwh
+        self.minimum_multiplier = minimum_multiplier
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.backend = backend or default_backend()
+
+    def calibrate(
+        self,
+        buildings: Iterable[Building],
+        demands: Mapping[UUID, MeteredDemand],
+        initial: Mapping[UUID, CalibratedParameters] | None = None,
+    ) -> list[CalibrationResult]:
+        """Calibrate every building against its metered demand.
+
+        Args:
+            buildings: Buildings with their archetype inputs
+            demands: Metered demand of each building
+            initial: Starting multipliers, e.g. from an earlier calibration;
+                buildings not listed start from the prior means
+
+        Returns:
+            One result per building, in input order
+
+        Raises:
+            ValueError: If a building has no metered demand
+        """
+        initial = initial or {}
+        chunks = []
+        iterator = iter(buildings)
+        while chunk := list(islice(iterator, self.chunk_size)):
+            for building in chunk:
+                if building.id not in demands:
+                    raise ValueError(f"No metered demand for building {building.id}")
+            chunks.append(
+                (
+                    BuildingColumns.from_buildings(chunk),
+                    [demands[building.id] for building in chunk],
+                    [initial.get(building.id) for building in chunk],
+                )
+            )
+
+        results = map_tasks(
+            calibrate_chunk,
+            [(self, *chunk) for chunk in chunks],
+            self.backend,
+            self.workers,
+        )
+        return [result for chunk_results in results for result in chunk_results]
+
+    def calibrate_columns(
+        self,
+        columns: BuildingColumns,
+        demands: Sequence[MeteredDemand],
+        initial: Sequence[CalibratedParameters | None] | None = None,
+    ) -> list[CalibrationResult]:
+        """Calibrate columns of buildings in this process.
+
+        Args:
+            columns: The buildings, with their archetype inputs
+            demands: Metered demand of each building, in building order
+            initial: Starting multipliers of each building, None for the
+                prior means
+
+        Returns:
+            One result per building, in building order
+        """
+        building_count = columns.building_count
+        if len(demands) != building_count:
+            raise ValueError("Need metered demand for every building")
+        priors = (
+            self.priors.thermal_resistance,
+            self.priors.air_change_rate,
+            self.priors.thermal_bridges,
+        )
+        means = [prior.mean for prior in priors]
+        variances = [prior.standard_deviation**2 for prior in priors]
+
+        model = _HeatTransferModel(columns)
+        sums = [self._demand_sums(demand) for demand in demands]
+        theta = [array("d", [mean]) * building_count for mean in means]
+        for building, start in enumerate(initial or ()):
+            if start is not None:
+                theta[0][building] = start.thermal_resistance_multiplier
+                theta[1][building] = start.air_change_rate_multiplier
+                theta[2][building] = start.thermal_bridge_multiplier
+
+        best_theta = [array("d", values) for values in theta]
+        best_objective = array("d", [math.inf]) * building_count
+        best_htc = array("d", bytes(8 * building_count))
+        iterations = array("l", bytes(8 * building_count))
+        converged = bytearray(building_count)
+        active = list(range(building_count))
+        for _ in range(self.max_iterations):
+            if not active:
+                break
+            htc, derivative = model.evaluate(theta)
+            still_active = []
+            for building in active:
+                iterations[building] += 1
+                weighted, weighted_cross, weighted_square = sums[building][:3]
+                current = [values[building] for values in theta]
+                h = htc[building]
+                objective = weighted * h * h - 2 * weighted_cross * h + weighted_square
+                objective += sum(
+                    (value - mean) ** 2 / variance
+                    for value, mean, variance in zip(current, means, variances)
+                )
+                if objective > best_objective[building]:
+                    # Overshot: retreat halfway towards the best point so far
+                    retreat = 0.0
+                    for values, best in zip(theta, best_theta):
+                        values[building] = (values[building] + best[building]) / 2
+                        retreat = max(retreat, abs(values[building] - best[building]))
+                    if retreat < self.tolerance:
+                        converged[building] = 1
+                    else:
+                        still_active.append(building)
+                    continue
+
+                best_objective[building] = objective
+                best_htc[building] = h
+                for values, best in zip(theta, best_theta):
+                    best[building] = values[building]
+                gradient = [d[building] for d in derivative]
+                step = _gauss_newton_step(
+                    weighted, weighted_cross, h, gradient, current, means, variances
+                )
+                largest = 0.0
+                for values, change in zip(theta, step):
+                    updated = max(values[building] + change, self.minimum_multiplier)
+                    largest = max(largest, abs(updated - values[building]))
+                    values[building] = updated
+                if largest < self.tolerance:
+                    converged[building] = 1
+                else:
+                    still_active.append(building)
+            active = still_active
+
+        results = []
+        for building, building_id in enumerate(columns.building_ids):
+            count, cross, square = sums[building][3:]
+            h = best_htc[building]
+            residual_square = max(count * h * h - 2 * cross * h + square, 0.0)
+            results.append(
+                CalibrationResult(
+                    building_id=building_id,
+                    parameters=CalibratedParameters(
+                        thermal_resistance_multiplier=best_theta[0][building],
+                        air_change_rate_multiplier=best_theta[1][building],
+                        thermal_bridge_multiplier=best_theta[2][building],
+                    ),
+                    heat_transfer_coefficient=ThermalConductance(w_per_k=h),
+                    rms_residual_kwh=math.sqrt(
+                        residual_square / len(demands[building].energy)
+                    ),
+                    iterations=iterations[building],
+                    converged=bool(converged[building]),
+                )
+            )
+        return results
+
+    def _demand_sums(self, demand: MeteredDemand) -> tuple[float, ...]:
+        # Modelled demand of period p is H·c_p for c_p = DH_p / 1000 / η kWh
+        # per W/K, so the weighted and plain squared residual sums over the
+        # periods are quadratics in H with these coefficients
+        efficiency = demand.heating_efficiency.ratio
+        weighted = weighted_cross = weighted_square = 0.0
+        plain = plain_cross = plain_square = 0.0
+        for degree_hours, energy in zip(demand.heating_degree_hours, demand.energy):
+            coefficient = degree_hours / 1000 / efficiency
+            metered = energy.kilowatt_hours
+            meter_error = max(
+                self.meter_error_fraction * metered, self.minimum_meter_error_kwh
+            )
+            weight = meter_error**-2
+            weighted += weight * coefficient * coefficient
+            weighted_cross += weight * coefficient * metered
+            weighted_square += weight * metered * metered
+            plain += coefficient * coefficient
+            plain_cross += coefficient * metered
+            plain_square += metered * metered
+        return (
+            weighted,
+            weighted_cross,
+            weighted_square,
+            plain,
+            plain_cross,
+            plain_square,
+        )
+
+
+def calibrate_chunk(
+    calibrator: BatchCalibrator,
+    columns: BuildingColumns,
+    demands: list[MeteredDemand],
+    initial: list[CalibratedParameters | None],
+) -> list[CalibrationResult]:
+    """Calibrate one chunk of buildings.
+
+    Runs in a worker thread or process. Chunks travel as columns, which
+    pickle far smaller than building aggregates.
+    """
+    return calibrator.calibrate_columns(columns, demands, initial)
+
+
+class _HeatTransferModel:
+    """HTC of every building as a function of the calibration multipliers."""
+
+    def __init__(self, columns: BuildingColumns) -> None:
+        self.columns = columns
+        self.service = BatchThermalCalculationService()
+        self.element_building = array(
+            "l", (columns.zone_building[zone] for zone in columns.element_zone)
+        )
+        # Ventilation and bridge HTC at the archetype inputs
+        self.ventilation = array("d", bytes(8 * columns.building_count))
+        self.bridges = array("d", bytes(8 * columns.building_count))
+        junction_htc = self.service.calculate_junction_heat_transfer_coefficients(
+            columns
+        )
+        for zone, building in enumerate(columns.zone_building):
+            self.ventilation[
+                building
+            ] += self.service.calculate_ventilation_heat_transfer_coefficient(
+                columns.zone_air_change_rate[zone], columns.zone_volume[zone]
+            )
+            self.bridges[building] += (
+                columns.zone_thermal_bridges[zone] + junction_htc[zone]
+            )
+
+    def evaluate(self, theta: Sequence[array]) -> tuple[array, list[array]]:
+        """HTC of every building and its derivatives by each multiplier."""
+        resistance, air_change, bridges = theta
+        fabric = self._fabric(resistance, 1.0)
+        perturbed = self._fabric(resistance, 1.0 + _DERIVATIVE_STEP)
+        htc = array("d", bytes(8 * len(fabric)))
+        fabric_derivative = array("d", htc)
+        for building, value in enumerate(fabric):
+            fabric_derivative[building] = (perturbed[building] - value) / (
+                resistance[building] * _DERIVATIVE_STEP
+            )
+            htc[building] = (
+                value
+                + air_change[building] * self.ventilation[building]
+                + bridges[building] * self.bridges[building]
+            )
+        return htc, [fabric_derivative, self.ventilation, self.bridges]
+
+    def _fabric(self, resistance: Sequence[float], scale: float) -> array:
+        columns = self.columns
+        element_building = self.element_building
+        u_values = self.service.calculate_u_values_from_arrays(
+            boundary_types=columns.element_boundary_type,
+            thermal_resistances=[
+                value * resistance[element_building[element]] * scale
+                for element, value in enumerate(columns.element_thermal_resistance)
+            ],
+            pitches=columns.element_pitch,
+            areas=columns.element_area,
+            exposed_perimeters=columns.element_exposed_perimeter,
+        )
+        fabric = array("d", bytes(8 * columns.building_count))
+        for element, building in enumerate(element_building):
+            fabric[building] += columns.element_area[element] * u_values[element]
+        return fabric
+
+
+def _gauss_newton_step(
+    weighted: float,
+    weighted_cross: float,
+    htc: float,
+    gradient: Sequence[float],
+    theta: Sequence[float],
+    means: Sequence[float],
+    variances: Sequence[float],
+) -> list[float]:
+    # Solve (S·g·gᵀ + P)·δ = -((S·H - T)·g + P·(θ - μ)), with P the diagonal
+    # prior precision, by Sherman-Morrison: δ = y - z·S·gᵀy / (1 + S·gᵀz)
+    # for y = P⁻¹·b and z = P⁻¹·g
+    residual = weighted * htc - weighted_cross
+    y = [
+        -variance * residual * slope - (value - mean)
+        for slope, value, mean, variance in zip(gradient, theta, means, variances)
+    ]
+    z = [variance * slope for slope, variance in zip(gradient, variances)]
+    g_y = sum(slope * value for slope, value in zip(gradient, y))
+    g_z = sum(slope * value for slope, value in zip(gradient, z))
+    factor = weighted * g_y / (1 + weighted * g_z)
+    return [value - factor * direction for value, direction in zip(y, z)]
@@ -0,0 +1,99 @@
+import argparse
+import sys
+
+
+def add_parser(
+    subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+) -> None:
+    """Register the run command."""
+    parser = subparsers.add_parser(
+        "run",
+        help="run a calculation over every building in a stock file",
+        description=(
+            "Shard a stock file across workers and write one results "
+            "file per shard. Re-running into the same output directory resumes "
+            "the run, skipping shards that are already written."
+        ),
+    )
+    parser.add_argument(
+        "stock_file", help="stock file (.jsonl, .csv) or building catalogue (.hemcat)"
+    )
+    parser.add_argument("config", help="run configuration JSON file")
+    parser.add_argument("output_dir", help="directory to write shard results to")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="workers (default: CPUs)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("serial", "thread", "process"),
+        default=None,
+        help=(
+            "run shards in this process, on threads sharing its memory or on "
+            "worker processes (default: process, or thread on a free-threaded "
+            "Python)"
+        ),
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="do not report progress on stderr"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        default=None,
+        help=(
+            "instrument workers and write stage timings to PREFIX.json and "
+            "PREFIX.folded (collapsed stacks for flamegraph tools)"
+        ),
+    )
+    parser.add_argument(
+        "--precision",
+        choices=("float64", "float32"),
+        default=None,
+        help=(
+            "storage precision of results, overriding the configuration; "
+            "calculations always run in float64"
+        ),
+    )
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Execute the run command."""
+    # Imported here so that parsing arguments does not load the batch machinery
+    import dataclasses
+
+    from application.batch import BatchRunner, ProgressReporter, RunConfig
+    from domain.shared.precision import PrecisionPolicy
+    from infrastructure.execution import ExecutionBackend
+    from infrastructure.instrumentation import Profiler
+
+    config = RunConfig.from_file(args.config)
+    if args.precision is not None:
+        config = dataclasses.replace(
+            config, precision=PrecisionPolicy.from_name(args.precision)
+        )
+    runner = BatchRunner(
+        stock_path=args.stock_file,
+        output_dir=args.output_dir,
+        config=config,
+        workers=args.workers,
+        profiler=Profiler() if args.profile else None,
+        backend=ExecutionBackend(args.backend) if args.backend else None,
+    )
+    if not args.quiet:
+        runner.progress = ProgressReporter(total_buildings=runner.count_buildings())
+
+    summary = runner.run()
+    if runner.profiler is not None:
+        runner.profiler.write_json(f"{args.profile}.json")
+        runner.profiler.write_collapsed(f"{args.profile}.folded")
+    print(
+        f"{summary.buildings_calculated} buildings in {summary.shards_written} shards "
+        f"({summary.shards_skipped} shards resumed) "
+        f"in {summary.elapsed_seconds:.1f} s",
+        file=sys.stderr,
+    )
+    report = summary.precision_report
+    if report is not None and not report.policy.is_exact:
+        print(report, file=sys.stderr)
+    return 0
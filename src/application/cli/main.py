@@ -0,0 +1,27 @@
+import argparse
+from collections.abc import Sequence
+
+from application.cli import batch_run, queue_run, result_diff
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser with every command registered."""
+    parser = argparse.ArgumentParser(
+        prog="python -m application.cli",
+        description="Home Energy Model batch tools.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    batch_run.add_parser(subparsers)
+    queue_run.add_parser(subparsers)
+    result_diff.add_parser(subparsers)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return int(args.handler(args))
+    except (OSError, ValueError) as error:
+        parser.exit(status=1, message=f"error: {error}\n")
@@ -0,0 +1,147 @@
+import argparse
+import os
+import sys
+
+
+def add_parser(
+    subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+) -> None:
+    """Register the enqueue and work commands."""
+    enqueue_parser = subparsers.add_parser(
+        "enqueue",
+        help="queue the shards of a run for workers on any node",
+        description=(
+            "Record a run in its output directory and queue one work item per "
+            "shard. Workers started with the work command, on this or other "
+            "nodes sharing the output directory, then lease and calculate the "
+            "shards. Enqueuing the same run again adds nothing."
+        ),
+    )
+    enqueue_parser.add_argument("stock_file", help="building catalogue (.hemcat)")
+    enqueue_parser.add_argument("config", help="run configuration JSON file")
+    enqueue_parser.add_argument(
+        "output_dir", help="directory to write shard results to"
+    )
+    _add_queue_argument(enqueue_parser)
+    enqueue_parser.add_argument(
+        "--precision",
+        choices=("float64", "float32"),
+        default=None,
+        help="storage precision of results, overriding the configuration",
+    )
+    enqueue_parser.set_defaults(handler=enqueue)
+
+    work_parser = subparsers.add_parser(
+        "work",
+        help="lease and calculate queued shards until the queue is finished",
+        description=(
+            "Lease shards of a queued run, calculate them and complete them once "
+            "their results are written. Leases are renewed while a shard is "
+            "calculated; a shard whose worker stops renewing is taken over by "
+            "another worker once its lease expires. Exits with status 1 when "
+            "shards failed on every attempt."
+        ),
+    )
+    work_parser.add_argument("output_dir", help="output directory of the queued run")
+    _add_queue_argument(work_parser)
+    work_parser.add_argument(
+        "--workers", type=int, default=1, help="workers on this node (default: 1)"
+    )
+    work_parser.add_argument(
+        "--backend",
+        choices=("serial", "thread", "process"),
+        default=None,
+        help="run workers on threads or processes (default: as for run)",
+    )
+    work_parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300.0,
+        help="time a shard is held without renewal (default: 300)",
+    )
+    work_parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=1.0,
+        help="wait while other workers hold every shard left (default: 1)",
+    )
+    work_parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="leases of a shard before it is marked failed (default: 3)",
+    )
+    work_parser.set_defaults(handler=work)
+
+
+def enqueue(args: argparse.Namespace) -> int:
+    """Execute the enqueue command."""
+    # Imported here so that parsing arguments does not load the batch machinery
+    import dataclasses
+    from pathlib import Path
+
+    from application.batch import QueuedBatchRun, RunConfig
+    from domain.shared.precision import PrecisionPolicy
+    from infrastructure.work_queue import SQLiteBroker
+
+    config = RunConfig.from_file(args.config)
+    if args.precision is not None:
+        config = dataclasses.replace(
+            config, precision=PrecisionPolicy.from_name(args.precision)
+        )
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    broker = SQLiteBroker(_queue_path(args))
+    added = QueuedBatchRun(output_dir, broker).enqueue(args.stock_file, config)
+    print(f"{added} shards queued ({broker.progress()})", file=sys.stderr)
+    return 0
+
+
+def work(args: argparse.Namespace) -> int:
+    """Execute the work command."""
+    from pathlib import Path
+
+    from application.batch import QueuedBatchRun
+    from application.batch.queued_run import read_manifest
+    from infrastructure.execution import ExecutionBackend
+    from infrastructure.work_queue import SQLiteBroker
+
+    # Fails before a queue file is created for a directory that holds no run
+    read_manifest(Path(args.output_dir))
+    broker = SQLiteBroker(_queue_path(args), max_attempts=args.max_attempts)
+    summary = QueuedBatchRun(args.output_dir, broker).work(
+        workers=args.workers,
+        backend=ExecutionBackend(args.backend) if args.backend else None,
+        lease_seconds=args.lease_seconds,
+        poll_seconds=args.poll_seconds,
+    )
+    print(
+        f"{summary.buildings_calculated} buildings in {summary.shards_written} shards "
+        f"({summary.shards_skipped} shards already written) "
+        f"in {summary.elapsed_seconds:.1f} s; queue: {broker.progress()}",
+        file=sys.stderr,
+    )
+    report = summary.precision_report
+    if report is not None and not report.policy.is_exact:
+        print(report, file=sys.stderr)
+    failures = broker.failures()
+    for shard, error in failures.items():
+        print(f"shard {shard} failed: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def _add_queue_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--queue",
+        default=None,
+        help=(
+            "SQLite work queue file, on a filesystem with working locks "
+            "(default: queue.sqlite in the output directory)"
+        ),
+    )
+
+
+def _queue_path(args: argparse.Namespace) -> str:
+    from application.batch.queued_run import QUEUE_NAME
+
+    return args.queue or os.path.join(args.output_dir, QUEUE_NAME)
@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+
+
+def add_parser(
+    subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+) -> None:
+    """Register the diff command."""
+    parser = subparsers.add_parser(
+        "diff",
+        help="compare two result sets and report drift",
+        description=(
+            "Compare a candidate result set against a reference one: two batch "
+            "run output directories or two result stores (.hemres). Exits with "
+            "status 1 when any value drifts beyond tolerance or a building is "
+            "only in one of the result sets."
+        ),
+    )
+    parser.add_argument("reference", help="reference output directory or store")
+    parser.add_argument("candidate", help="candidate output directory or store")
+    parser.add_argument(
+        "--abs-tol", type=float, default=1e-9, help="allowed absolute drift"
+    )
+    parser.add_argument(
+        "--rel-tol", type=float, default=1e-6, help="allowed relative drift"
+    )
+    parser.add_argument(
+        "--worst", type=int, default=10, help="number of worst buildings to list"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="write the report as JSON to stdout"
+    )
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Execute the diff command."""
+    # Imported here so that parsing arguments does not load the result readers
+    from application.comparison import ResultDiffer, Tolerance
+
+    differ = ResultDiffer(
+        tolerance=Tolerance(absolute=args.abs_tol, relative=args.rel_tol),
+        worst_count=args.worst,
+    )
+    report = differ.diff(args.reference, args.candidate)
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for quantity in report.quantities:
+            status = "ok" if quantity.passed else "DRIFT"
+            print(
+                f"{quantity.quantity}: {status}, {quantity.compared} values compared, "
+                f"{quantity.exceeding} outside tolerance, "
+                f"{quantity.missing} missing, {quantity.extra} extra"
+            )
+            for label, sketch in (
+                ("absolute", quantity.absolute_drift),
+                ("relative", quantity.relative_drift),
+            ):
+                if sketch.count:
+                    print(
+                        f"  {label} drift: mean {sketch.mean:.3g}, "
+                        f"p50 {sketch.quantile(0.5):.3g}, "
+                        f"p99 {sketch.quantile(0.99):.3g}, max {sketch.maximum:.3g}"
+                    )
+            for entry in quantity.worst:
+                print(
+                    f"  {entry.building_id}  {entry.reference!r} -> "
+                    f"{entry.candidate!r}  ({entry.tolerance_ratio:.3g}x tolerance)"
+                )
+    return 0 if report.passed else 1
@@ -0,0 +1,15 @@
+from .result_diff import (
+    DiffReport,
+    DriftEntry,
+    QuantityDrift,
+    ResultDiffer,
+    Tolerance,
+)
+
+__all__ = [
+    "DiffReport",
+    "DriftEntry",
+    "QuantityDrift",
+    "ResultDiffer",
+    "Tolerance",
+]
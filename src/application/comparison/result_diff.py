@@ -0,0 +1,494 @@
+"""Streaming comparison of two sets of results.
+
+Used to check that an engine upgrade leaves results unchanged: the portfolio
+is re-run and the new results are diffed against the old ones. Two kinds of
+result set can be compared:
+
+- batch run output directories, with one value per building in shard files
+- result stores, with zone series of every stored variable
+
+Results are read a shard or a few buildings at a time, compared in chunks
+and joined on building id. Chunks that list the same buildings in the same
+order, as re-runs of the same stock do, are compared directly; otherwise
+unmatched buildings wait until their partner turns up, so only out-of-order
+buildings are ever held in memory.
+
+A value is within tolerance when |candidate - reference| <= absolute +
+relative·|reference|. Drift is summarised by quantile sketches of absolute
+and relative drift, and the buildings furthest beyond tolerance are kept.
+"""
+
+import heapq
+import math
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any
+
+from application.batch.batch_runner import MANIFEST_NAME
+from application.portfolio.streaming_statistics import HistogramSketch, TopK
+from infrastructure.results import RESULT_STORE_SUFFIX, ResultStore
+
+DEFAULT_CHUNK_SIZE = 65536
+_SHARD_PATTERN = "shard-*.csv"
+
+# Building ids and values of consecutive rows of a shard file
+_ShardChunk = tuple[list[str], list[float]]
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    """Allowed difference between a candidate and a reference value.
+
+    Attributes:
+        absolute: Allowed absolute difference
+        relative: Allowed difference relative to the reference value
+    """
+
+    absolute: float = 1e-9
+    relative: float = 1e-6
+
+    def __post_init__(self) -> None:
+        if self.absolute < 0 or self.relative < 0:
+            raise ValueError("Tolerances must be non-negative")
+
+
+@dataclass(frozen=True)
+class DriftEntry:
+    """A building whose results drifted.
+
+    Attributes:
+        building_id: Id of the building
+        reference: Reference value with the largest drift
+        candidate: Candidate value with the largest drift
+        tolerance_ratio: Drift as a multiple of the allowed difference;
+            above 1 is outside tolerance
+    """
+
+    building_id: str
+    reference: float
+    candidate: float
+    tolerance_ratio: float
+
+    @property
+    def absolute_drift(self) -> float:
+        """Absolute difference between the values."""
+        return abs(self.candidate - self.reference)
+
+    @property
+    def relative_drift(self) -> float:
+        """Difference relative to the reference value."""
+        if self.reference == 0:
+            return 0.0 if self.candidate == 0 else math.inf
+        return self.absolute_drift / abs(self.reference)
+
+
+@dataclass(frozen=True)
+class QuantityDrift:
+    """Drift of one compared quantity.
+
+    Attributes:
+        quantity: Name of the quantity
+        compared: Number of values compared
+        exceeding: Number of values outside tolerance, including values that
+            are NaN in only one of the result sets
+        missing: Buildings in the reference only, or with a different
+            number of zones in the candidate
+        extra: Buildings in the candidate only
+        absolute_drift: Distribution of absolute drift
+        relative_drift: Distribution of relative drift, over nonzero
+            reference values
+        worst: Buildings furthest outside tolerance, worst first
+    """
+
+    quantity: str
+    compared: int
+    exceeding: int
+    missing: int
+    extra: int
+    absolute_drift: HistogramSketch
+    relative_drift: HistogramSketch
+    worst: tuple[DriftEntry, ...]
+
+    @property
+    def passed(self) -> bool:
+        """Whether every reference value has a candidate within tolerance."""
+        return not (self.exceeding or self.missing or self.extra)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain form of the drift, for JSON output."""
+        return {
+            "quantity": self.quantity,
+            "passed": self.passed,
+            "compared": self.compared,
+            "exceeding": self.exceeding,
+            "missing": self.missing,
+            "extra": self.extra,
+            "absolute_drift": _summary(self.absolute_drift),
+            "relative_drift": _summary(self.relative_drift),
+            "worst": [
+                {
+                    "building_id": entry.building_id,
+                    "reference": entry.reference,
+                    "candidate": entry.candidate,
+                    "tolerance_ratio": entry.tolerance_ratio,
+                }
+                for entry in self.worst
+            ],
+        }
+
+
+@dataclass(frozen=True)
+class DiffReport:
+    """Drift of every quantity two result sets have in common.
+
+    Attributes:
+        tolerance: Tolerance the values were checked against
+        quantities: Drift of each compared quantity
+    """
+
+    tolerance: Tolerance
+    quantities: tuple[QuantityDrift, ...]
+
+    @property
+    def passed(self) -> bool:
+        """Whether every quantity is within tolerance."""
+        return all(quantity.passed for quantity in self.quantities)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain form of the report, for JSON output."""
+        return {
+            "passed": self.passed,
+            "tolerance": {
+                "absolute": self.tolerance.absolute,
+                "relative": self.tolerance.relative,
+            },
+            "quantities": [quantity.to_dict() for quantity in self.quantities],
+        }
+
+
+class ResultDiffer:
+    """Compares a candidate result set against a reference one.
+
+    Attributes:
+        tolerance: Allowed drift of each value
+        worst_count: Number of worst buildings kept per quantity
+        chunk_size: Number of values read from each result set at a time
+        relative_accuracy: Relative accuracy of the drift quantiles
+    """
+
+    def __init__(
+        self,
+        tolerance: Tolerance = Tolerance(),
+        worst_count: int = 10,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        relative_accuracy: float = 0.01,
+    ) -> None:
+        if worst_count <= 0:
+            raise ValueError("Worst count must be positive")
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+        self.tolerance = tolerance
+        self.worst_count = worst_count
+        self.chunk_size = chunk_size
+        self.relative_accuracy = relative_accuracy
+
+    def diff(self, reference: Path | str, candidate: Path | str) -> DiffReport:
+        """Compare two batch output directories or two result stores.
+
+        Raises:
+            ValueError: If the result sets are of different or unknown kinds,
+                or hold different quantities
+        """
+        reference, candidate = Path(reference), Path(candidate)
+        kinds = {_kind(reference), _kind(candidate)}
+        if len(kinds) != 1:
+            raise ValueError("Cannot compare a batch output with a result store")
+        if kinds == {"store"}:
+            return self.diff_result_stores(reference, candidate)
+        return self.diff_batch_outputs(reference, candidate)
+
+    def diff_batch_outputs(
+        self, reference_dir: Path | str, candidate_dir: Path | str
+    ) -> DiffReport:
+        """Compare the shard files of two batch run output directories."""
+        reference_shards = _shard_files(Path(reference_dir))
+        candidate_shards = _shard_files(Path(candidate_dir))
+        quantity = _shard_quantity(reference_shards[0])
+        candidate_quantity = _shard_quantity(candidate_shards[0])
+        if quantity != candidate_quantity:
+            raise ValueError(
+                f"Cannot compare '{quantity}' results with "
+                f"'{candidate_quantity}' results"
+            )
+        reference_chunks = _iter_shard_chunks(
+            reference_shards, quantity, self.chunk_size
+        )
+        candidate_chunks = _iter_shard_chunks(
+            candidate_shards, quantity, self.chunk_size
+        )
+
+        drift = _DriftAccumulator(quantity, self)
+        pending_reference: dict[str, float] = {}
+        pending_candidate: dict[str, float] = {}
+        empty: _ShardChunk = ([], [])
+        for reference_chunk, candidate_chunk in zip_longest(
+            reference_chunks, candidate_chunks, fillvalue=empty
+        ):
+            reference_ids, reference_values = reference_chunk
+            candidate_ids, candidate_values = candidate_chunk
+            if (
+                reference_ids == candidate_ids
+                and not pending_reference
+                and not pending_candidate
+            ):
+                drift.compare_values(reference_ids, reference_values, candidate_values)
+                continue
+
+            matched_ids, matched_reference, matched_candidate = [], [], []
+            for building_id, value in zip(reference_ids, reference_values):
+                partner = pending_candidate.pop(building_id, None)
+                if partner is None:
+                    pending_reference[building_id] = value
+                else:
+                    matched_ids.append(building_id)
+                    matched_reference.append(value)
+                    matched_candidate.append(partner)
+            for building_id, value in zip(candidate_ids, candidate_values):
+                partner = pending_reference.pop(building_id, None)
+                if partner is None:
+                    pending_candidate[building_id] = value
+                else:
+                    matched_ids.append(building_id)
+                    matched_reference.append(partner)
+                    matched_candidate.append(value)
+            drift.compare_values(matched_ids, matched_reference, matched_candidate)
+
+        drift.missing += len(pending_reference)
+        drift.extra += len(pending_candidate)
+        return DiffReport(self.tolerance, (drift.result(),))
+
+    def diff_result_stores(
+        self, reference_path: Path | str, candidate_path: Path | str
+    ) -> DiffReport:
+        """Compare the series of every variable of two result stores.
+
+        Raises:
+            ValueError: If the stores hold different variables or timelines
+        """
+        with (
+            ResultStore(reference_path) as reference,
+            ResultStore(candidate_path) as candidate,
+        ):
+            if reference.variables != candidate.variables:
+                raise ValueError("Result stores hold different variables")
+            if (
+                reference.start_time != candidate.start_time
+                or reference.timestep != candidate.timestep
+                or reference.step_count != candidate.step_count
+            ):
+                raise ValueError("Result stores cover different timelines")
+
+            drifts = {
+                variable: _DriftAccumulator(variable, self)
+                for variable in reference.variables
+            }
+            present = []
+            missing = 0
+            for building_id in reference.building_ids:
+                if building_id in candidate:
+                    present.append(building_id)
+                else:
+                    missing += 1
+            extra = sum(
+                building_id not in reference for building_id in candidate.building_ids
+            )
+            per_chunk = max(1, self.chunk_size // max(reference.step_count, 1))
+            for variable, drift in drifts.items():
+                drift.missing, drift.extra = missing, extra
+                for start in range(0, len(present), per_chunk):
+                    building_ids = present[start : start + per_chunk]
+                    reference_series = reference.read(building_ids, variable)
+                    candidate_series = candidate.read(building_ids, variable)
+                    for building_id in building_ids:
+                        drift.compare_series(
+                            str(building_id),
+                            reference_series[building_id],
+                            candidate_series[building_id],
+                        )
+        return DiffReport(
+            self.tolerance, tuple(drift.result() for drift in drifts.values())
+        )
+
+
+class _DriftAccumulator:
+    def __init__(self, quantity: str, differ: ResultDiffer) -> None:
+        self.quantity = quantity
+        self.tolerance = differ.tolerance
+        self.worst_count = differ.worst_count
+        self.compared = 0
+        self.exceeding = 0
+        self.missing = 0
+        self.extra = 0
+        self.absolute_drift = HistogramSketch(differ.relative_accuracy)
+        self.relative_drift = HistogramSketch(differ.relative_accuracy)
+        self.worst: TopK[tuple[str, float, float]] = TopK(differ.worst_count)
+
+    def compare_values(
+        self,
+        building_ids: Sequence[str],
+        reference: Sequence[float],
+        candidate: Sequence[float],
+    ) -> None:
+        """Compare one value per building."""
+        ratios = self._compare(reference, candidate)
+        for position in heapq.nlargest(
+            self.worst_count, range(len(ratios)), key=ratios.__getitem__
+        ):
+            if ratios[position] > 0:
+                self.worst.push(
+                    ratios[position],
+                    (
+                        building_ids[position],
+                        reference[position],
+                        candidate[position],
+                    ),
+                )
+
+    def compare_series(
+        self,
+        building_id: str,
+        reference: Sequence[Sequence[float]],
+        candidate: Sequence[Sequence[float]],
+    ) -> None:
+        """Compare the zone series of one building."""
+        if len(reference) != len(candidate):
+            self.missing += 1
+            return
+        worst = (0.0, 0.0, 0.0)
+        for reference_zone, candidate_zone in zip(reference, candidate):
+            ratios = self._compare(reference_zone, candidate_zone)
+            if ratios:
+                position = max(range(len(ratios)), key=ratios.__getitem__)
+                if ratios[position] > worst[0]:
+                    worst = (
+                        ratios[position],
+                        reference_zone[position],
+                        candidate_zone[position],
+                    )
+        if worst[0] > 0:
+            self.worst.push(worst[0], (building_id, worst[1], worst[2]))
+
+    def _compare(
+        self, reference: Sequence[float], candidate: Sequence[float]
+    ) -> list[float]:
+        """Drift of each value as a multiple of its tolerance."""
+        absolute_tolerance = self.tolerance.absolute
+        relative_tolerance = self.tolerance.relative
+        drifts = [abs(new - old) for old, new in zip(reference, candidate)]
+        ratios = [
+            (
+                0.0
+                if drift == 0
+                else (
+                    drift / limit
+                    if (limit := absolute_tolerance + relative_tolerance * abs(old))
+                    else math.inf
+                )
+            )
+            for drift, old in zip(drifts, reference)
+        ]
+        if any(ratio != ratio for ratio in ratios):
+            ratios = [
+                ratio if ratio == ratio else _undefined_drift_ratio(old, new)
+                for ratio, old, new in zip(ratios, reference, candidate)
+            ]
+        self.compared += len(drifts)
+        self.exceeding += sum(1 for ratio in ratios if ratio > 1)
+        # NaN and infinite drifts compare false and stay out of the sketches
+        self.absolute_drift.extend([drift for drift in drifts if drift < math.inf])
+        self.relative_drift.extend(
+            [
+                drift / abs(old)
+                for drift, old in zip(drifts, reference)
+                if old and drift < math.inf and abs(old) < math.inf
+            ]
+        )
+        return ratios
+
+    def result(self) -> QuantityDrift:
+        return QuantityDrift(
+            quantity=self.quantity,
+            compared=self.compared,
+            exceeding=self.exceeding,
+            missing=self.missing,
+            extra=self.extra,
+            absolute_drift=self.absolute_drift,
+            relative_drift=self.relative_drift,
+            worst=tuple(
+                DriftEntry(building_id, reference, candidate, ratio)
+                for (building_id, reference, candidate), ratio in self.worst.items()
+            ),
+        )
+
+
+def _kind(path: Path) -> str:
+    if path.suffix == RESULT_STORE_SUFFIX and path.is_file():
+        return "store"
+    if (path / MANIFEST_NAME).is_file():
+        return "batch"
+    raise ValueError(f"{path} is neither a batch run output nor a result store")
+
+
+def _shard_files(output_dir: Path) -> list[Path]:
+    shards = sorted(output_dir.glob(_SHARD_PATTERN))
+    if not shards:
+        raise ValueError(f"{output_dir} has no shard results")
+    return shards
+
+
+def _shard_quantity(shard: Path) -> str:
+    with shard.open(encoding="utf-8") as stream:
+        header = stream.readline().replace(",", " ").split()
+    if len(header) != 2:
+        raise ValueError(f"{shard} is not a shard results file")
+    return header[1]
+
+
+def _iter_shard_chunks(
+    shards: Sequence[Path], quantity: str, chunk_size: int
+) -> Iterator[_ShardChunk]:
+    """Yield (building ids, values) chunks of shards holding a quantity."""
+    for shard in shards:
+        # Shard files hold only UUIDs and float reprs, so splitting on commas
+        # and whitespace yields the header then alternating ids and values
+        fields = shard.read_text(encoding="utf-8").replace(",", " ").split()
+        if len(fields) < 2 or len(fields) % 2:
+            raise ValueError(f"{shard} is not a shard results file")
+        if fields[1] != quantity:
+            raise ValueError(f"{shard} holds '{fields[1]}', not '{quantity}'")
+        building_ids = fields[2::2]
+        values = list(map(float, fields[3::2]))
+        for start in range(0, len(building_ids), chunk_size):
+            yield (
+                building_ids[start : start + chunk_size],
+                values[start : start + chunk_size],
+            )
+
+
+def _undefined_drift_ratio(old: float, new: float) -> float:
+    # NaN on one side only is infinitely far out; NaN on both agrees, and so
+    # do equal infinities
+    return 0.0 if old == new or (old != old and new != new) else math.inf
+
+
+def _summary(sketch: HistogramSketch) -> dict[str, float] | None:
+    if not sketch.count:
+        return None
+    return {
+        "mean": sketch.mean,
+        "p50": sketch.quantile(0.5),
+        "p99": sketch.quantile(0.99),
+        "max": sketch.maximum,
+    }
@@ -0,0 +1,9 @@
+from .design_load_calculator import DesignLoadSummary, PortfolioDesignLoadCalculator
+from .streaming_statistics import HistogramSketch, TopK
+
+__all__ = [
+    "DesignLoadSummary",
+    "HistogramSketch",
+    "PortfolioDesignLoadCalculator",
+    "TopK",
+]
@@ -0,0 +1,122 @@
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from uuid import UUID
+
+from application.portfolio.streaming_statistics import HistogramSketch, TopK
+from domain.building.aggregates.building import Building
+from domain.building.services import DesignHeatLoadService
+from domain.energy.value_objects import Power
+from domain.shared.value_objects import Temperature
+
+
+@dataclass(frozen=True)
+class DesignLoadSummary:
+    """Summary of design heat loads across a portfolio.
+
+    Attributes:
+        building_count: Number of buildings included
+        coincident_peak: Sum of design heat losses, scaled by the coincidence factor
+        regional_coincident_peaks: Coincident peak per design temperature region
+        largest_loads: Buildings with the largest design heat loss, largest first
+        percentiles: Design heat loss at each requested percentile
+    """
+
+    building_count: int
+    coincident_peak: Power
+    regional_coincident_peaks: dict[str, Power]
+    largest_loads: list[tuple[UUID, Power]]
+    percentiles: dict[float, Power]
+
+
+class PortfolioDesignLoadCalculator:
+    """Single-pass design heat load calculator for building portfolios.
+
+    Each building's design heat loss is calculated from its HTC and the
+    design temperature of its region, then folded into running totals, a
+    top-K heap and a histogram sketch. Nothing is sorted or kept per
+    building, so the portfolio can be streamed from disk, and calculators
+    from parallel workers can be merged.
+
+    Attributes:
+        design_temperatures: External design temperature per region
+        coincidence_factor: Fraction of the summed design loads expected at peak
+    """
+
+    def __init__(
+        self,
+        design_temperatures: Mapping[str, Temperature],
+        top_k: int = 100,
+        relative_accuracy: float = 0.01,
+        coincidence_factor: float = 1.0,
+    ) -> None:
+        if not 0 < coincidence_factor <= 1:
+            raise ValueError("Coincidence factor must be between 0 and 1")
+        self.design_temperatures = dict(design_temperatures)
+        self.coincidence_factor = coincidence_factor
+        self._design_heat_load_service = DesignHeatLoadService()
+        self._largest: TopK[UUID] = TopK(top_k)
+        self._sketch = HistogramSketch(relative_accuracy=relative_accuracy)
+        self._regional_totals: dict[str, float] = {}
+
+    def add(self, building: Building, region: str) -> Power:
+        """Calculate and record the design heat loss of one building.
+
+        Args:
+            building: The building to add
+            region: The design temperature region the building is in
+
+        Returns:
+            The design heat loss of the building in W as Power value object
+        """
+        try:
+            design_temperature = self.design_temperatures[region]
+        except KeyError:
+            raise ValueError(f"No design temperature for region '{region}'") from None
+
+        design_heat_loss = self._design_heat_load_service.calculate_design_heat_loss(
+            building=building, design_temperature=design_temperature
+        )
+        self.add_load(building.id, design_heat_loss.watts, region)
+        return design_heat_loss
+
+    def add_load(self, building_id: UUID, watts: float, region: str) -> None:
+        """Record an already calculated design heat loss in W."""
+        self._largest.push(watts, building_id)
+        self._sketch.add(watts)
+        self._regional_totals[region] = self._regional_totals.get(region, 0.0) + watts
+
+    def add_all(self, buildings: Iterable[tuple[Building, str]]) -> None:
+        """Add every (building, region) pair from an iterable."""
+        for building, region in buildings:
+            self.add(building, region)
+
+    def merge(self, other: "PortfolioDesignLoadCalculator") -> None:
+        """Add the loads recorded by another calculator into this one."""
+        self._largest.merge(other._largest)
+        self._sketch.merge(other._sketch)
+        for region, watts in other._regional_totals.items():
+            self._regional_totals[region] = (
+                self._regional_totals.get(region, 0.0) + watts
+            )
+
+    def percentile(self, percent: float) -> Power:
+        """Estimate the design heat loss at a percentile of the portfolio."""
+        return Power(watts=self._sketch.quantile(percent / 100))
+
+    def summary(
+        self, percentiles: Iterable[float] = (50.0, 90.0, 99.0)
+    ) -> DesignLoadSummary:
+        """Summarise the design loads recorded so far."""
+        return DesignLoadSummary(
+            building_count=self._sketch.count,
+            coincident_peak=Power(watts=self._sketch.total * self.coincidence_factor),
+            regional_coincident_peaks={
+                region: Power(watts=watts * self.coincidence_factor)
+                for region, watts in self._regional_totals.items()
+            },
+            largest_loads=[
+                (building_id, Power(watts=watts))
+                for building_id, watts in self._largest.items()
+            ],
+            percentiles={percent: self.percentile(percent) for percent in percentiles},
+        )
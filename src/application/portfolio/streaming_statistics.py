@@ -0,0 +1,155 @@
+"""Single-pass statistics for portfolio-scale result streams.
+
+Both structures use memory independent of the number of values added and can
+be merged, so partial results from parallel workers combine exactly.
+"""
+
+import heapq
+import math
+from collections import Counter
+from collections.abc import Hashable, Sequence
+from itertools import count
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TopK(Generic[K]):
+    """Streaming top-K tracker.
+
+    Keeps the K largest values seen, with their keys, in a min-heap so each
+    push costs O(log K).
+
+    Attributes:
+        k: Number of largest values to keep
+    """
+
+    def __init__(self, k: int) -> None:
+        if k <= 0:
+            raise ValueError("K must be positive")
+        self.k = k
+        self._heap: list[tuple[float, int, K]] = []
+        self._sequence = count()
+
+    def push(self, value: float, key: K) -> None:
+        """Offer a value to the tracker."""
+        entry = (value, next(self._sequence), key)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif value > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: "TopK[K]") -> None:
+        """Add the values kept by another tracker into this one."""
+        for value, _, key in other._heap:
+            self.push(value, key)
+
+    def items(self) -> list[tuple[K, float]]:
+        """Kept keys and values, largest first."""
+        return [
+            (key, value)
+            for value, _, key in sorted(self._heap, key=lambda entry: -entry[0])
+        ]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class HistogramSketch:
+    """Log-bucketed histogram sketch for quantiles of non-negative values.
+
+    Values are counted in geometrically sized buckets, so any quantile is
+    returned within the configured relative accuracy regardless of how many
+    values were added.
+
+    Attributes:
+        relative_accuracy: Maximum relative error of reported quantiles
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a non-negative value to the sketch."""
+        if value < 0 or not math.isfinite(value):
+            raise ValueError("Sketch values must be finite and non-negative")
+        if value == 0:
+            self._zero_count += 1
+        else:
+            bucket = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def extend(self, values: Sequence[float]) -> None:
+        """Add many non-negative values to the sketch at once."""
+        if not values:
+            return
+        low, high = min(values), max(values)
+        if low < 0 or not math.isfinite(high):
+            raise ValueError("Sketch values must be finite and non-negative")
+        log, ceil, log_gamma = math.log, math.ceil, self._log_gamma
+        nonzero = [ceil(log(value) / log_gamma) for value in values if value]
+        for bucket, bucket_count in Counter(nonzero).items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + bucket_count
+        self._zero_count += len(values) - len(nonzero)
+        self.count += len(values)
+        self.total += sum(values)
+        self.minimum = min(self.minimum, low)
+        self.maximum = max(self.maximum, high)
+
+    def merge(self, other: "HistogramSketch") -> None:
+        """Add the counts of another sketch with the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for bucket, bucket_count in other._buckets.items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + bucket_count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile of the values added.
+
+        Args:
+            q: The quantile to estimate, between 0 and 1
+
+        Returns:
+            The estimated quantile, within the relative accuracy of the sketch
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            raise ValueError("Cannot take a quantile of an empty sketch")
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if rank < seen:
+                estimate = 2 * self._gamma**bucket / (self._gamma + 1)
+                return min(max(estimate, self.minimum), self.maximum)
+        return self.maximum
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values added."""
+        if self.count == 0:
+            raise ValueError("Cannot take the mean of an empty sketch")
+        return self.total / self.count
@@ -0,0 +1,13 @@
+from .heat_loss_query_service import (
+    HeatLossClient,
+    HeatLossQueryService,
+    HeatLossResult,
+    LocalHeatLossClient,
+)
+
+__all__ = [
+    "HeatLossClient",
+    "HeatLossQueryService",
+    "HeatLossResult",
+    "LocalHeatLossClient",
+]
@@ -0,0 +1,202 @@
+"""In-process micro-batching service for HTC and HLP queries.
+
+Callers await one building at a time. Requests that arrive while a batch is
+being collected are coalesced, evaluated together on the columnar batch path,
+and each caller's future is resolved with its own result.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Protocol
+from uuid import UUID
+
+from domain.building.aggregates.building import Building
+from domain.building.columns import BuildingColumns
+from domain.building.services import BatchThermalCalculationService
+from domain.building.value_objects import ThermalConductance
+from domain.shared.value_objects import ThermalTransmittance
+
+
+@dataclass(frozen=True)
+class HeatLossResult:
+    """Heat loss figures of one building.
+
+    Attributes:
+        building_id: Identifier of the building
+        heat_transfer_coefficient: Total HTC in W/K
+        heat_loss_parameter: HLP in W/m²·K
+    """
+
+    building_id: UUID
+    heat_transfer_coefficient: ThermalConductance
+    heat_loss_parameter: ThermalTransmittance
+
+
+class HeatLossClient(Protocol):
+    """Client interface for heat loss queries."""
+
+    async def heat_loss(self, building: Building) -> HeatLossResult:
+        """Query the heat loss figures of one building."""
+        ...
+
+
+class HeatLossQueryService:
+    """Coalesces concurrent heat loss queries into batch evaluations.
+
+    A batch is evaluated once it holds max_batch_size requests, or
+    max_latency_seconds after its first request arrived, whichever is first.
+
+    Attributes:
+        max_batch_size: Largest number of buildings evaluated together
+        max_latency_seconds: Longest time a request waits for others to join
+        batches_evaluated: Number of batches evaluated so far
+        requests_served: Number of requests resolved so far
+    """
+
+    def __init__(
+        self, max_batch_size: int = 256, max_latency_seconds: float = 0.002
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("Max batch size must be positive")
+        if max_latency_seconds < 0:
+            raise ValueError("Max latency must be non-negative")
+        self.max_batch_size = max_batch_size
+        self.max_latency_seconds = max_latency_seconds
+        self.batches_evaluated = 0
+        self.requests_served = 0
+        self._service = BatchThermalCalculationService()
+        self._queue: asyncio.Queue[tuple[Building, asyncio.Future[HeatLossResult]]]
+        self._worker: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start collecting and evaluating batches."""
+        if self._worker is not None:
+            raise RuntimeError("Heat loss query service is already running")
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Evaluate queued requests, then stop the service."""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def __aenter__(self) -> "HeatLossQueryService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def query(self, building: Building) -> HeatLossResult:
+        """Queue a building and wait for its heat loss figures."""
+        if self._worker is None:
+            raise RuntimeError("Heat loss query service is not running")
+        future: asyncio.Future[HeatLossResult] = (
+            asyncio.get_running_loop().create_future()
+        )
+        await self._queue.put((building, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            try:
+                self._evaluate(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _evaluate(
+        self, batch: list[tuple[Building, "asyncio.Future[HeatLossResult]"]]
+    ) -> None:
+        columns = BuildingColumns()
+        pending: list[tuple[Building, "asyncio.Future[HeatLossResult]"]] = []
+        floor_area: list[float] = []
+        for building, future in batch:
+            if future.cancelled():
+                continue
+            # A building that fails validation fails only its own caller, and
+            # is checked before any of its rows reach the shared columns
+            try:
+                area = building.total_floor_area.square_metres
+            except Exception as error:
+                future.set_exception(error)
+                self.requests_served += 1
+                continue
+            try:
+                columns.add_building(building)
+            except Exception as error:
+                future.set_exception(error)
+                self.requests_served += 1
+                # Drop the rows the failed building left behind
+                columns = BuildingColumns.from_buildings(
+                    [valid for valid, _ in pending]
+                )
+                continue
+            pending.append((building, future))
+            floor_area.append(area)
+
+        try:
+            htc = self._service.calculate_heat_transfer_coefficients(columns)
+        except Exception as error:
+            for _, future in pending:
+                future.set_exception(error)
+            return
+
+        self.batches_evaluated += 1
+        for index, (building, future) in enumerate(pending):
+            try:
+                result = HeatLossResult(
+                    building_id=building.id,
+                    heat_transfer_coefficient=ThermalConductance(w_per_k=htc[index]),
+                    heat_loss_parameter=ThermalTransmittance(
+                        w_per_m2_k=htc[index] / floor_area[index]
+                    ),
+                )
+            except ValueError as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+            self.requests_served += 1
+
+
+class LocalHeatLossClient:
+    """Stand-in client that calls a HeatLossQueryService in the same process.
+
+    Has the interface a remote client would, so callers and tests can run
+    without a network.
+    """
+
+    def __init__(self, service: HeatLossQueryService) -> None:
+        self._service = service
+
+    async def heat_loss(self, building: Building) -> HeatLossResult:
+        """Query the heat loss figures of one building."""
+        return await self._service.query(building)
+
+    async def heat_loss_many(
+        self, buildings: Iterable[Building]
+    ) -> list[HeatLossResult]:
+        """Query many buildings concurrently, returning results in order."""
+        queries = (self.heat_loss(building) for building in buildings)
+        return list(await asyncio.gather(*queries))
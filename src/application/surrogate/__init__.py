@@ -0,0 +1,16 @@
+from .annual_demand_model import AnnualDemandModel, DesignPoint
+from .surrogate_table import (
+    DemandEstimate,
+    SurrogateDesign,
+    SurrogateTable,
+    SurrogateTrainer,
+)
+
+__all__ = [
+    "AnnualDemandModel",
+    "DemandEstimate",
+    "DesignPoint",
+    "SurrogateDesign",
+    "SurrogateTable",
+    "SurrogateTrainer",
+]
@@ -0,0 +1,172 @@
+"""Hourly two-node heat balance giving annual space heating demand.
+
+The model works per m² of floor area, so a dwelling is described by its heat
+loss parameter (HLP), thermal mass parameter (TMP) and glazing ratio, and its
+demand scales with floor area. It has an air node and a thermal mass node:
+
+- The air node holds the air's heat capacity and loses a fixed share of the
+  HLP (ventilation and glazing) straight to outside. Internal gains and
+  heating enter here.
+- The mass node holds the TMP and is coupled to the air through the internal
+  surfaces, ISO 13790 style (h_ms · A_m). The rest of the HLP is fabric loss
+  through the mass node, whose outside conductance is chosen so that the
+  air-to-outside conductance through it equals its HLP share. Solar gains
+  land on the mass.
+
+Each hour is an implicit Euler step of the 2x2 system, solved in closed
+form. Heating is ideal: when the free-running air temperature falls below
+the setpoint, the heat input that brings it to the setpoint is added.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from domain.building.constants import (
+    AIR_DENSITY_KG_PER_M3,
+    AIR_SPECIFIC_HEAT_CAPACITY_J_PER_KG_K,
+)
+from domain.climate.value_objects import ClimateRegion
+from domain.shared.value_objects import Temperature
+
+# Mass-to-air coupling per m² of mass area and mass area per m² of floor,
+# the ISO 13790 medium construction values
+_MASS_SURFACE_COEFFICIENT_W_PER_M2_K = 9.1
+_MASS_AREA_RATIO = 2.5
+_MASS_COUPLING_W_PER_M2_K = _MASS_SURFACE_COEFFICIENT_W_PER_M2_K * _MASS_AREA_RATIO
+
+# Hours run before the year starts, taken from the end of the year
+_WARM_UP_HOURS = 14 * 24
+
+
+@dataclass(frozen=True)
+class DesignPoint:
+    """Dwelling parameters per m² of floor area.
+
+    Attributes:
+        heat_loss_parameter: Heat transfer coefficient per floor area in W/m²·K
+        thermal_mass_parameter: Heat capacity per floor area in kJ/m²·K
+        glazing_ratio: Glazed area per floor area
+    """
+
+    heat_loss_parameter: float
+    thermal_mass_parameter: float
+    glazing_ratio: float
+
+    def __post_init__(self) -> None:
+        if self.heat_loss_parameter <= 0:
+            raise ValueError("Heat loss parameter must be positive")
+        if self.thermal_mass_parameter <= 0:
+            raise ValueError("Thermal mass parameter must be positive")
+        if self.glazing_ratio < 0:
+            raise ValueError("Glazing ratio must be non-negative")
+
+
+class AnnualDemandModel:
+    """Annual space heating demand of a two-node dwelling model.
+
+    Attributes:
+        setpoint: Heating setpoint
+        internal_gains_w_per_m2: Constant internal gains per floor area
+        solar_transmittance: Share of the solar irradiance on glazing that
+            enters the dwelling
+        storey_height_m: Storey height, giving the air volume per floor area
+        air_path_fraction: Share of the HLP lost directly from the air node
+    """
+
+    def __init__(
+        self,
+        setpoint: Temperature = Temperature(celsius=21.0),
+        internal_gains_w_per_m2: float = 3.0,
+        solar_transmittance: float = 0.5,
+        storey_height_m: float = 2.5,
+        air_path_fraction: float = 0.3,
+    ) -> None:
+        if internal_gains_w_per_m2 < 0:
+            raise ValueError("Internal gains must be non-negative")
+        if not 0 <= solar_transmittance <= 1:
+            raise ValueError("Solar transmittance must be between 0 and 1")
+        if storey_height_m <= 0:
+            raise ValueError("Storey height must be positive")
+        if not 0 < air_path_fraction < 1:
+            raise ValueError("Air path fraction must be between 0 and 1")
+        self.setpoint = setpoint
+        self.internal_gains_w_per_m2 = internal_gains_w_per_m2
+        self.solar_transmittance = solar_transmittance
+        self.storey_height_m = storey_height_m
+        self.air_path_fraction = air_path_fraction
+
+    @property
+    def max_heat_loss_parameter(self) -> float:
+        """Largest HLP in W/m²·K the mass path can carry."""
+        return _MASS_COUPLING_W_PER_M2_K / (1 - self.air_path_fraction)
+
+    def annual_heating_demand(self, point: DesignPoint, region: ClimateRegion) -> float:
+        """Annual space heating demand in kWh per m² of floor area.
+
+        Raises:
+            ValueError: If the HLP is beyond what the mass path can carry
+        """
+        mass_path = (1 - self.air_path_fraction) * point.heat_loss_parameter
+        if mass_path >= _MASS_COUPLING_W_PER_M2_K:
+            raise ValueError(
+                f"Heat loss parameter must be below {self.max_heat_loss_parameter:.1f}"
+            )
+        coupling = _MASS_COUPLING_W_PER_M2_K
+        air_loss = self.air_path_fraction * point.heat_loss_parameter
+        # Series conductance mass_loss·coupling / (mass_loss + coupling)
+        # equals the mass path share of the HLP
+        mass_loss = mass_path * coupling / (coupling - mass_path)
+        air_rate = (
+            self.storey_height_m
+            * AIR_DENSITY_KG_PER_M3
+            * AIR_SPECIFIC_HEAT_CAPACITY_J_PER_KG_K
+            / 3600
+        )
+        mass_rate = point.thermal_mass_parameter * 1000 / 3600
+
+        # Implicit Euler system [[a, -coupling], [-coupling, b]]·T = rhs
+        a = air_rate + air_loss + coupling
+        b = mass_rate + mass_loss + coupling
+        determinant = a * b - coupling * coupling
+        inverse_aa, inverse_am, inverse_mm = (
+            b / determinant,
+            coupling / determinant,
+            a / determinant,
+        )
+        # Air temperature rise per W of heating
+        heating_response = inverse_aa
+
+        temperatures, irradiances = _region_series(region)
+        setpoint = self.setpoint.celsius
+        gains = self.internal_gains_w_per_m2
+        solar_factor = self.solar_transmittance * point.glazing_ratio
+        air = mass = setpoint
+        demand = 0.0
+        hours = len(temperatures)
+        for hour in range(-_WARM_UP_HOURS, hours):
+            external = temperatures[hour]
+            rhs_air = air_rate * air + air_loss * external + gains
+            rhs_mass = (
+                mass_rate * mass
+                + mass_loss * external
+                + solar_factor * irradiances[hour]
+            )
+            air = inverse_aa * rhs_air + inverse_am * rhs_mass
+            mass = inverse_am * rhs_air + inverse_mm * rhs_mass
+            if air < setpoint:
+                heating = (setpoint - air) / heating_response
+                air = setpoint
+                mass += inverse_am * heating
+                if hour >= 0:
+                    demand += heating
+        return demand / 1000
+
+
+@lru_cache(maxsize=16)
+def _region_series(
+    region: ClimateRegion,
+) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    return (
+        tuple(region.hourly_external_temperatures()),
+        tuple(region.hourly_solar_irradiances()),
+    )
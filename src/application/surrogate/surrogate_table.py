@@ -0,0 +1,423 @@
+"""Precomputed surrogate of the annual demand model.
+
+The dynamic model is sampled on a full-factorial grid of HLP, TMP and glazing
+ratio for every climate region, and queries are answered by trilinear
+interpolation between the eight surrounding grid nodes, which costs a few
+microseconds instead of a year of hourly steps.
+
+Every grid cell is validated against the dynamic model at its centre and at
+one seeded random point inside it. The larger of the two interpolation
+errors, scaled by a safety factor, is stored as the cell's error bound and
+reported with every estimate from that cell. Queries outside the grid are
+refused rather than extrapolated.
+
+Tables are stored as JSON. Training runs the grid and validation points of
+all regions through an execution backend.
+"""
+
+import json
+import os
+import random
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+
+from application.surrogate.annual_demand_model import AnnualDemandModel, DesignPoint
+from domain.building.aggregates.building import Building
+from domain.building.enums import ThermalBoundaryType
+from domain.climate.value_objects import ClimateRegion
+from domain.energy.value_objects import Energy
+from infrastructure.execution import ExecutionBackend, default_backend, map_tasks
+
+SURROGATE_FORMAT_VERSION = 1
+
+_JOULES_PER_KWH = 3.6e6
+
+
+@dataclass(frozen=True)
+class SurrogateDesign:
+    """Grid the dynamic model is sampled on.
+
+    Attributes:
+        heat_loss_parameters: HLP grid values in W/m²·K, increasing
+        thermal_mass_parameters: TMP grid values in kJ/m²·K, increasing
+        glazing_ratios: Glazing ratio grid values, increasing
+        validation_seed: Seed of the random validation point of each cell
+    """
+
+    heat_loss_parameters: tuple[float, ...] = (
+        0.3,
+        0.5,
+        0.75,
+        1.0,
+        1.25,
+        1.5,
+        2.0,
+        2.5,
+        3.0,
+        4.0,
+        5.0,
+    )
+    thermal_mass_parameters: tuple[float, ...] = (
+        50.0,
+        75.0,
+        100.0,
+        150.0,
+        250.0,
+        400.0,
+    )
+    glazing_ratios: tuple[float, ...] = (0.0, 0.1, 0.2, 0.3, 0.45, 0.6)
+    validation_seed: int = 0
+
+    def __post_init__(self) -> None:
+        for axis in self.axes:
+            if len(axis) < 2:
+                raise ValueError("Every grid axis needs at least two values")
+            if any(low >= high for low, high in zip(axis, axis[1:])):
+                raise ValueError("Grid axis values must be strictly increasing")
+
+    @property
+    def axes(self) -> tuple[tuple[float, ...], ...]:
+        return (
+            self.heat_loss_parameters,
+            self.thermal_mass_parameters,
+            self.glazing_ratios,
+        )
+
+    @property
+    def node_count(self) -> int:
+        return (
+            len(self.heat_loss_parameters)
+            * len(self.thermal_mass_parameters)
+            * len(self.glazing_ratios)
+        )
+
+    def nodes(self) -> list[DesignPoint]:
+        """Every grid node, last axis varying fastest."""
+        return [DesignPoint(*values) for values in product(*self.axes)]
+
+    def cells(self) -> list[tuple[int, int, int]]:
+        """Lower node indices of every grid cell, last axis varying fastest."""
+        return list(
+            product(
+                range(len(self.heat_loss_parameters) - 1),
+                range(len(self.thermal_mass_parameters) - 1),
+                range(len(self.glazing_ratios) - 1),
+            )
+        )
+
+    def validation_points(self) -> list[DesignPoint]:
+        """Centre and one seeded random point of every cell, cell by cell."""
+        rng = random.Random(self.validation_seed)
+        points = []
+        for cell in self.cells():
+            bounds = [
+                (axis[index], axis[index + 1]) for axis, index in zip(self.axes, cell)
+            ]
+            points.append(DesignPoint(*((low + high) / 2 for low, high in bounds)))
+            points.append(
+                DesignPoint(*(rng.uniform(low, high) for low, high in bounds))
+            )
+        return points
+
+    def to_dict(self) -> dict:
+        return {
+            "heat_loss_parameters": list(self.heat_loss_parameters),
+            "thermal_mass_parameters": list(self.thermal_mass_parameters),
+            "glazing_ratios": list(self.glazing_ratios),
+            "validation_seed": self.validation_seed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SurrogateDesign":
+        return cls(
+            heat_loss_parameters=tuple(data["heat_loss_parameters"]),
+            thermal_mass_parameters=tuple(data["thermal_mass_parameters"]),
+            glazing_ratios=tuple(data["glazing_ratios"]),
+            validation_seed=data["validation_seed"],
+        )
+
+
+@dataclass(frozen=True)
+class DemandEstimate:
+    """Annual space heating demand estimated by the surrogate.
+
+    Attributes:
+        annual_demand: Estimated annual space heating demand
+        error_bound: Validated bound on the interpolation error
+    """
+
+    annual_demand: Energy
+    error_bound: Energy
+
+
+class SurrogateTable:
+    """Gridded annual demand per floor area, with per-cell error bounds.
+
+    Attributes:
+        design: The sampled grid
+        demands: Demand in kWh/m² of every grid node, per region name
+        error_bounds: Error bound in kWh/m² of every grid cell, per region name
+    """
+
+    def __init__(
+        self,
+        design: SurrogateDesign,
+        demands: dict[str, array],
+        error_bounds: dict[str, array],
+    ) -> None:
+        cell_count = len(design.cells())
+        for region, values in demands.items():
+            if len(values) != design.node_count:
+                raise ValueError(f"Region {region} needs a demand per grid node")
+            if len(error_bounds.get(region, ())) != cell_count:
+                raise ValueError(f"Region {region} needs an error bound per cell")
+        self.design = design
+        self.demands = demands
+        self.error_bounds = error_bounds
+        self._axes = design.axes
+        self._strides = (
+            len(design.thermal_mass_parameters) * len(design.glazing_ratios),
+            len(design.glazing_ratios),
+            1,
+        )
+        self._cell_strides = (
+            (len(design.thermal_mass_parameters) - 1)
+            * (len(design.glazing_ratios) - 1),
+            len(design.glazing_ratios) - 1,
+            1,
+        )
+
+    @property
+    def regions(self) -> list[str]:
+        return list(self.demands)
+
+    def estimate_per_floor_area(
+        self, point: DesignPoint, region: str
+    ) -> tuple[float, float]:
+        """Demand and error bound in kWh/m² at a point of the grid.
+
+        Raises:
+            KeyError: If the table has no such region
+            ValueError: If the point is outside the grid
+        """
+        values = self.demands[region]
+        lower = []
+        weights = []
+        for axis, value in zip(
+            self._axes,
+            (
+                point.heat_loss_parameter,
+                point.thermal_mass_parameter,
+                point.glazing_ratio,
+            ),
+        ):
+            if not axis[0] <= value <= axis[-1]:
+                raise ValueError(
+                    f"{value} is outside the surrogate range {axis[0]} to {axis[-1]}"
+                )
+            index = min(bisect_right(axis, value) - 1, len(axis) - 2)
+            lower.append(index)
+            weights.append((value - axis[index]) / (axis[index + 1] - axis[index]))
+
+        base = sum(index * stride for index, stride in zip(lower, self._strides))
+        demand = 0.0
+        for corner in product((0, 1), repeat=3):
+            weight = 1.0
+            offset = base
+            for step, fraction, stride in zip(corner, weights, self._strides):
+                weight *= fraction if step else 1 - fraction
+                offset += step * stride
+            demand += weight * values[offset]
+        cell = sum(index * stride for index, stride in zip(lower, self._cell_strides))
+        return demand, self.error_bounds[region][cell]
+
+    def estimate(
+        self,
+        heat_transfer_coefficient_w_per_k: float,
+        heat_capacity_j_per_k: float,
+        glazing_area_m2: float,
+        floor_area_m2: float,
+        region: str,
+    ) -> DemandEstimate:
+        """Annual space heating demand of a dwelling.
+
+        Args:
+            heat_transfer_coefficient_w_per_k: Total HTC in W/K
+            heat_capacity_j_per_k: Effective heat capacity in J/K
+            glazing_area_m2: Glazed area in m²
+            floor_area_m2: Total floor area in m²
+            region: Name of the climate region
+        """
+        if floor_area_m2 <= 0:
+            raise ValueError("Floor area must be positive")
+        point = DesignPoint(
+            heat_loss_parameter=heat_transfer_coefficient_w_per_k / floor_area_m2,
+            thermal_mass_parameter=heat_capacity_j_per_k / 1000 / floor_area_m2,
+            glazing_ratio=glazing_area_m2 / floor_area_m2,
+        )
+        demand, error = self.estimate_per_floor_area(point, region)
+        return DemandEstimate(
+            annual_demand=Energy(
+                joules=max(demand, 0.0) * floor_area_m2 * _JOULES_PER_KWH
+            ),
+            error_bound=Energy(joules=error * floor_area_m2 * _JOULES_PER_KWH),
+        )
+
+    def estimate_building(self, building: Building, region: str) -> DemandEstimate:
+        """Annual space heating demand of a building aggregate."""
+        elements = building.building_elements
+        return self.estimate(
+            heat_transfer_coefficient_w_per_k=(
+                building.calculate_total_heat_transfer_coefficient().w_per_k
+            ),
+            heat_capacity_j_per_k=sum(
+                element.area.square_metres * element.areal_heat_capacity.j_per_m2_k
+                for element in elements
+            ),
+            glazing_area_m2=sum(
+                element.area.square_metres
+                for element in elements
+                if element.thermal_boundary_type == ThermalBoundaryType.EXTERNAL_GLAZING
+            ),
+            floor_area_m2=building.total_floor_area.square_metres,
+            region=region,
+        )
+
+    def save(self, path: Path | str) -> None:
+        """Write the table as JSON."""
+        Path(path).write_text(
+            json.dumps(
+                {
+                    "version": SURROGATE_FORMAT_VERSION,
+                    "design": self.design.to_dict(),
+                    "regions": {
+                        region: {
+                            "demands_kwh_per_m2": list(values),
+                            "error_bounds_kwh_per_m2": list(self.error_bounds[region]),
+                        }
+                        for region, values in self.demands.items()
+                    },
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, path: Path | str) -> "SurrogateTable":
+        """Read a table written by save.
+
+        Raises:
+            ValueError: If the file is of an unsupported format version
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != SURROGATE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported surrogate table version in {path}")
+        regions = data["regions"]
+        return cls(
+            design=SurrogateDesign.from_dict(data["design"]),
+            demands={
+                region: array("d", values["demands_kwh_per_m2"])
+                for region, values in regions.items()
+            },
+            error_bounds={
+                region: array("d", values["error_bounds_kwh_per_m2"])
+                for region, values in regions.items()
+            },
+        )
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"SurrogateTable(regions={len(self.demands)}, "
+            f"nodes={self.design.node_count})"
+        )
+
+
+class SurrogateTrainer:
+    """Samples the annual demand model and fits surrogate tables.
+
+    Attributes:
+        model: The dynamic model being emulated
+        safety_factor: Multiplier on the largest validation error of a cell
+        workers: Number of workers
+        chunk_size: Number of model runs per worker task
+        backend: Backend the model runs are made on
+    """
+
+    def __init__(
+        self,
+        model: AnnualDemandModel | None = None,
+        safety_factor: float = 2.0,
+        workers: int | None = None,
+        chunk_size: int = 32,
+        backend: ExecutionBackend | None = None,
+    ) -> None:
+        if safety_factor < 1:
+            raise ValueError("Safety factor must be at least 1")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        self.model = model or AnnualDemandModel()
+        self.safety_factor = safety_factor
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.backend = backend or default_backend()
+
+    def train(
+        self, regions: Sequence[ClimateRegion], design: SurrogateDesign | None = None
+    ) -> SurrogateTable:
+        """Sample every region over the design and validate every cell."""
+        design = design or SurrogateDesign()
+        nodes = design.nodes()
+        validation = design.validation_points()
+        for point in nodes:
+            if point.heat_loss_parameter >= self.model.max_heat_loss_parameter:
+                raise ValueError("Design HLP range exceeds what the model can carry")
+
+        tasks = []
+        for region in regions:
+            points = nodes + validation
+            for start in range(0, len(points), self.chunk_size):
+                tasks.append((region, points[start : start + self.chunk_size]))
+        chunks = map_tasks(
+            simulate_points,
+            [(self.model, *task) for task in tasks],
+            self.backend,
+            self.workers,
+        )
+        results = iter(value for chunk in chunks for value in chunk)
+
+        demands: dict[str, array] = {}
+        error_bounds: dict[str, array] = {}
+        for region in regions:
+            demands[region.name] = array("d", (next(results) for _ in nodes))
+            exact = [next(results) for _ in validation]
+            table = SurrogateTable(
+                design,
+                {region.name: demands[region.name]},
+                {region.name: array("d", bytes(8 * len(design.cells())))},
+            )
+            bounds = array("d")
+            for cell in range(len(design.cells())):
+                error = 0.0
+                for sample in (2 * cell, 2 * cell + 1):
+                    estimate, _ = table.estimate_per_floor_area(
+                        validation[sample], region.name
+                    )
+                    error = max(error, abs(estimate - exact[sample]))
+                bounds.append(error * self.safety_factor)
+            error_bounds[region.name] = bounds
+        return SurrogateTable(design, demands, error_bounds)
+
+
+def simulate_points(
+    model: AnnualDemandModel, region: ClimateRegion, points: list[DesignPoint]
+) -> list[float]:
+    """Run the annual demand model at each point.
+
+    Runs in a worker thread or process.
+    """
+    return [model.annual_heating_demand(point, region) for point in points]
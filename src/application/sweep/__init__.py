@@ -0,0 +1,15 @@
+from .parametric_sweep import (
+    ParametricSweep,
+    SweepParameter,
+    SweepResult,
+    SweepRun,
+    SweepTarget,
+)
+
+__all__ = [
+    "ParametricSweep",
+    "SweepParameter",
+    "SweepResult",
+    "SweepRun",
+    "SweepTarget",
+]
@@ -0,0 +1,417 @@
+"""Parametric sweeps over a base building.
+
+A sweep is the Cartesian product of a few parameters, each overriding one
+kind of building input (zone setpoints, zone ventilation rates, element
+construction resistances or the design temperature) with a list of values.
+
+Variants are evaluated on a BuildingCalculationGraph, which only discards
+the cached sub-results downstream of an input that changed. The product is
+walked in reflected mixed-radix Gray code order, so consecutive variants
+differ in exactly one parameter, and parameters that touch the most inputs
+vary slowest. Element U-values and zone HTCs that a step does not affect
+are reused from the previous variant instead of being recalculated.
+
+Parameters may override the same input, for example a ventilation rate for
+all zones and another for one zone. The later parameter of the sweep then
+wins, as if every parameter were applied in order to a fresh building.
+"""
+
+import os
+from collections.abc import Hashable, Iterable, Sequence
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from domain.building.aggregates.building import Building
+from domain.building.calculation_graph import BuildingCalculationGraph
+from domain.building.enums import ThermalBoundaryType
+from domain.building.value_objects import AirChangeRate, ThermalConductance
+from domain.energy.value_objects import Power
+from domain.shared.value_objects import (
+    Temperature,
+    ThermalResistance,
+    ThermalTransmittance,
+)
+from infrastructure.execution import ExecutionBackend, default_backend, map_tasks
+
+
+class SweepTarget(Enum):
+    """Building input a sweep parameter overrides."""
+
+    SETPOINT = "setpoint"
+    VENTILATION_RATE = "ventilation_rate"
+    THERMAL_RESISTANCE = "thermal_resistance"
+    DESIGN_TEMPERATURE = "design_temperature"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value.replace("_", " ")
+
+
+_VALUE_TYPES: dict[SweepTarget, type] = {
+    SweepTarget.SETPOINT: Temperature,
+    SweepTarget.VENTILATION_RATE: AirChangeRate,
+    SweepTarget.THERMAL_RESISTANCE: ThermalResistance,
+    SweepTarget.DESIGN_TEMPERATURE: Temperature,
+}
+
+
+@dataclass(frozen=True)
+class SweepParameter:
+    """One swept building input and the values it takes.
+
+    Use the setpoint(), ventilation_rate(), thermal_resistance() and
+    design_temperature() constructors.
+
+    Attributes:
+        name: Label of the parameter, unique within a sweep
+        target: Building input the parameter overrides
+        values: Values the input takes, as value objects of the target
+        zone_ids: Zones whose inputs are overridden; all zones when None
+        boundary_types: Boundary types of the elements whose resistance is
+            overridden
+    """
+
+    name: str
+    target: SweepTarget
+    values: tuple[Any, ...]
+    zone_ids: frozenset[UUID] | None = None
+    boundary_types: frozenset[ThermalBoundaryType] = frozenset()
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            raise ValueError("Sweep parameter must have a name")
+        if not self.values:
+            raise ValueError(f"Sweep parameter '{self.name}' needs at least one value")
+        value_type = _VALUE_TYPES[self.target]
+        if not all(isinstance(value, value_type) for value in self.values):
+            raise ValueError(
+                f"Values of sweep parameter '{self.name}' must be "
+                f"{value_type.__name__} objects"
+            )
+        if self.target == SweepTarget.THERMAL_RESISTANCE and not self.boundary_types:
+            raise ValueError(
+                f"Sweep parameter '{self.name}' needs the boundary types it applies to"
+            )
+
+    @classmethod
+    def setpoint(
+        cls,
+        values: Iterable[Temperature],
+        zone_ids: Iterable[UUID] | None = None,
+        name: str = "setpoint",
+    ) -> "SweepParameter":
+        """Sweep the heating setpoint of some or all zones."""
+        return cls(name, SweepTarget.SETPOINT, tuple(values), _optional_set(zone_ids))
+
+    @classmethod
+    def ventilation_rate(
+        cls,
+        values: Iterable[AirChangeRate],
+        zone_ids: Iterable[UUID] | None = None,
+        name: str = "ventilation_rate",
+    ) -> "SweepParameter":
+        """Sweep the air change rate of some or all zones."""
+        return cls(
+            name, SweepTarget.VENTILATION_RATE, tuple(values), _optional_set(zone_ids)
+        )
+
+    @classmethod
+    def thermal_resistance(
+        cls,
+        values: Iterable[ThermalResistance],
+        boundary_types: Iterable[ThermalBoundaryType] = (
+            ThermalBoundaryType.EXTERNAL_SOLID,
+        ),
+        zone_ids: Iterable[UUID] | None = None,
+        name: str = "thermal_resistance",
+    ) -> "SweepParameter":
+        """Sweep the construction resistance of elements by boundary type."""
+        return cls(
+            name,
+            SweepTarget.THERMAL_RESISTANCE,
+            tuple(values),
+            _optional_set(zone_ids),
+            frozenset(boundary_types),
+        )
+
+    @classmethod
+    def design_temperature(
+        cls, values: Iterable[Temperature], name: str = "design_temperature"
+    ) -> "SweepParameter":
+        """Sweep the external design temperature."""
+        return cls(name, SweepTarget.DESIGN_TEMPERATURE, tuple(values))
+
+    def targets(self, building: Building) -> tuple[UUID, ...]:
+        """Ids of the zones or elements of a building the parameter overrides.
+
+        Raises:
+            ValueError: If the parameter selects nothing in the building
+        """
+        if self.target == SweepTarget.DESIGN_TEMPERATURE:
+            return (building.id,)
+        zones = [
+            zone
+            for zone in building.zones
+            if self.zone_ids is None or zone.id in self.zone_ids
+        ]
+        if self.target == SweepTarget.THERMAL_RESISTANCE:
+            ids = tuple(
+                element.id
+                for zone in zones
+                for element in zone.building_elements
+                if element.thermal_boundary_type in self.boundary_types
+            )
+        else:
+            ids = tuple(zone.id for zone in zones)
+        if not ids:
+            raise ValueError(
+                f"Sweep parameter '{self.name}' selects nothing in building "
+                f"{building.id}"
+            )
+        return ids
+
+    def affected_inputs(self, building: Building) -> tuple[Hashable, ...]:
+        """Keys of the calculation graph inputs the parameter overrides."""
+        if self.target == SweepTarget.DESIGN_TEMPERATURE:
+            return (("building", "design_temperature"),)
+        kind = "element" if self.target == SweepTarget.THERMAL_RESISTANCE else "zone"
+        return tuple(
+            (kind, target, self.target.value) for target in self.targets(building)
+        )
+
+    def apply(
+        self, graph: BuildingCalculationGraph, targets: Sequence[UUID], value: Any
+    ) -> None:
+        """Override the targeted inputs of a calculation graph with a value."""
+        if self.target == SweepTarget.SETPOINT:
+            for zone_id in targets:
+                graph.set_zone_setpoint(zone_id, value)
+        elif self.target == SweepTarget.VENTILATION_RATE:
+            for zone_id in targets:
+                graph.set_zone_ventilation_rate(zone_id, value)
+        elif self.target == SweepTarget.THERMAL_RESISTANCE:
+            for element_id in targets:
+                graph.set_element_thermal_resistance(element_id, value)
+        else:
+            graph.set_design_temperature(value)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Building results of one sweep variant.
+
+    Attributes:
+        index: Position of the variant in the Cartesian product, with the
+            last parameter varying fastest
+        values: Value of each parameter, in sweep parameter order
+        heat_transfer_coefficient: Building HTC
+        heat_loss_parameter: Building HLP
+        design_heat_loss: Building heat loss at the design temperature
+    """
+
+    index: int
+    values: tuple[Any, ...]
+    heat_transfer_coefficient: ThermalConductance
+    heat_loss_parameter: ThermalTransmittance
+    design_heat_loss: Power
+
+
+@dataclass(frozen=True)
+class SweepRun:
+    """Results of a parametric sweep.
+
+    Attributes:
+        parameters: The swept parameters
+        results: Results of every variant, by index
+        node_evaluations: Graph nodes evaluated over the whole sweep
+        nodes_per_variant: Graph nodes evaluated for one variant from scratch
+    """
+
+    parameters: tuple[SweepParameter, ...]
+    results: tuple[SweepResult, ...]
+    node_evaluations: int
+    nodes_per_variant: int
+
+    @property
+    def reuse_fraction(self) -> float:
+        """Share of sub-results reused rather than recalculated."""
+        full = len(self.results) * self.nodes_per_variant
+        return 1 - self.node_evaluations / full if full else 0.0
+
+
+class ParametricSweep:
+    """Evaluates every combination of parameter values on a base building.
+
+    Attributes:
+        building: The base building the parameters override
+        parameters: The swept parameters
+        design_temperature: Design temperature, unless it is swept
+        workers: Number of workers
+        chunk_size: Number of consecutive variants per worker task
+        backend: Backend the variant chunks are evaluated on
+    """
+
+    def __init__(
+        self,
+        building: Building,
+        parameters: Sequence[SweepParameter],
+        design_temperature: Temperature = Temperature(celsius=-3.0),
+        workers: int | None = None,
+        chunk_size: int = 64,
+        backend: ExecutionBackend | None = None,
+    ) -> None:
+        if not parameters:
+            raise ValueError("A sweep needs at least one parameter")
+        names = [parameter.name for parameter in parameters]
+        if len(set(names)) != len(names):
+            raise ValueError("Sweep parameter names must be unique")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        for parameter in parameters:
+            # Raises for parameters that select nothing in the building
+            parameter.targets(building)
+        self.building = building
+        self.parameters = tuple(parameters)
+        self.design_temperature = design_temperature
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.backend = backend or default_backend()
+
+    @property
+    def variant_count(self) -> int:
+        """Number of variants in the Cartesian product."""
+        count = 1
+        for parameter in self.parameters:
+            count *= len(parameter.values)
+        return count
+
+    def run(self) -> SweepRun:
+        """Evaluate every variant of the sweep."""
+        # Parameters overriding the most inputs vary slowest
+        order = sorted(
+            range(len(self.parameters)),
+            key=lambda position: -len(
+                self.parameters[position].affected_inputs(self.building)
+            ),
+        )
+        walk = []
+        for ordered in _gray_code([len(self.parameters[p].values) for p in order]):
+            positions = [0] * len(order)
+            for parameter, position in zip(order, ordered):
+                positions[parameter] = position
+            walk.append(tuple(positions))
+
+        tasks = [
+            walk[start : start + self.chunk_size]
+            for start in range(0, len(walk), self.chunk_size)
+        ]
+        chunks = map_tasks(
+            evaluate_variants,
+            [
+                (self.building, self.parameters, self.design_temperature, task)
+                for task in tasks
+            ],
+            self.backend,
+            self.workers,
+        )
+
+        results = sorted(
+            (result for chunk_results, _, _ in chunks for result in chunk_results),
+            key=lambda result: result.index,
+        )
+        return SweepRun(
+            parameters=self.parameters,
+            results=tuple(results),
+            node_evaluations=sum(evaluations for _, evaluations, _ in chunks),
+            nodes_per_variant=max(cold for _, _, cold in chunks),
+        )
+
+
+def evaluate_variants(
+    building: Building,
+    parameters: Sequence[SweepParameter],
+    design_temperature: Temperature,
+    variants: Sequence[tuple[int, ...]],
+) -> tuple[list[SweepResult], int, int]:
+    """Evaluate consecutive variants on one calculation graph.
+
+    Runs in a worker thread or process. Only parameters whose value differs from the
+    previous variant are applied, so the graph keeps every sub-result the
+    change does not reach. Later parameters overriding some of the same
+    inputs are applied again after them, so they keep precedence.
+
+    Args:
+        building: The base building
+        parameters: The swept parameters
+        design_temperature: Design temperature, unless it is swept
+        variants: Value positions of each variant, in parameter order
+
+    Returns:
+        The variant results, the number of graph node evaluations, and the
+        number of evaluations of the first variant
+    """
+    graph = BuildingCalculationGraph(building, design_temperature)
+    targets = [parameter.targets(building) for parameter in parameters]
+    inputs = [set(parameter.affected_inputs(building)) for parameter in parameters]
+    # Earlier parameters sharing inputs with each parameter
+    overlapping = [
+        [earlier for earlier in range(number) if inputs[earlier] & inputs[number]]
+        for number in range(len(parameters))
+    ]
+    strides = []
+    stride = 1
+    for parameter in reversed(parameters):
+        strides.append(stride)
+        stride *= len(parameter.values)
+    strides.reverse()
+
+    results = []
+    applied: list[int | None] = [None] * len(parameters)
+    cold_evaluations = 0
+    for positions in variants:
+        changed = [False] * len(parameters)
+        for number, (parameter, position) in enumerate(zip(parameters, positions)):
+            changed[number] = applied[number] != position or any(
+                changed[earlier] for earlier in overlapping[number]
+            )
+            if changed[number]:
+                parameter.apply(graph, targets[number], parameter.values[position])
+                applied[number] = position
+        results.append(
+            SweepResult(
+                index=sum(
+                    position * stride for position, stride in zip(positions, strides)
+                ),
+                values=tuple(
+                    parameter.values[position]
+                    for parameter, position in zip(parameters, positions)
+                ),
+                heat_transfer_coefficient=graph.heat_transfer_coefficient(),
+                heat_loss_parameter=graph.heat_loss_parameter(),
+                design_heat_loss=graph.design_heat_loss(),
+            )
+        )
+        if not cold_evaluations:
+            cold_evaluations = sum(graph.graph.evaluation_counts.values())
+    return results, sum(graph.graph.evaluation_counts.values()), cold_evaluations
+
+
+def _gray_code(radices: Sequence[int]) -> list[tuple[int, ...]]:
+    # Reflected mixed-radix Gray code: the first position varies slowest, and
+    # consecutive tuples differ in exactly one position, by one
+    order: list[tuple[int, ...]] = [()]
+    for radix in radices:
+        order = [
+            (*prefix, position)
+            for number, prefix in enumerate(order)
+            for position in (
+                range(radix) if number % 2 == 0 else range(radix - 1, -1, -1)
+            )
+        ]
+    return order
+
+
+def _optional_set(ids: Iterable[UUID] | None) -> frozenset[UUID] | None:
+    return frozenset(ids) if ids is not None else None
@@ -0,0 +1,250 @@
+"""Coupled heat balance of the zones of a block of buildings.
+
+Every zone of every building in the block is a node. A node loses heat to the
+outside through its heat transfer coefficient (fabric, ventilation and
+bridges) and exchanges heat with other zones through zone couplings, such as
+partitions between rooms or party walls between dwellings. The conductance
+matrix is sparse, so blocks of hundreds of zones need memory in proportion
+to their couplings rather than to the square of their zone count.
+
+Time stepping is implicit Euler::
+
+    (C/Δt + K)·T(t + Δt) = C/Δt·T(t) + H·T_ext + Q
+
+with C the zone heat capacities, K the conductance matrix, H the zone
+conductances to outside and Q the heat gains. The symbolic factorisation of
+K is computed once and reused whenever the time step or the conductances to
+outside change; the numeric factor is reused across time steps.
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from uuid import UUID
+
+from domain.building.aggregates.building import Building
+from domain.building.columns import BuildingColumns
+from domain.building.constants import (
+    AIR_DENSITY_KG_PER_M3,
+    AIR_SPECIFIC_HEAT_CAPACITY_J_PER_KG_K,
+)
+from domain.building.services import BatchThermalCalculationService
+from domain.building.value_objects import ZoneCoupling
+from domain.shared.sparse_cholesky import (
+    CholeskyFactor,
+    SkylineCholesky,
+    SparseSymmetricMatrix,
+)
+from domain.simulation.value_objects import TimeStepDuration
+
+
+class BlockHeatBalance:
+    """Implicit heat balance of coupled zones.
+
+    Attributes:
+        zone_ids: Identifier of each zone, in node order
+        external_conductances: Conductance of each zone to outside in W/K
+        heat_capacities: Heat capacity of each zone's air and elements in J/K
+        timestep: Duration of each time step
+    """
+
+    def __init__(
+        self,
+        buildings: Sequence[Building],
+        couplings: Iterable[ZoneCoupling],
+        timestep: TimeStepDuration,
+    ) -> None:
+        """Assemble the block and factorise its matrices.
+
+        Args:
+            buildings: Buildings of the block
+            couplings: Heat transfer paths between zones of the block
+            timestep: Duration of each time step
+
+        Raises:
+            ValueError: If a coupling names a zone outside the block
+        """
+        columns = BuildingColumns.from_buildings(list(buildings))
+        self.zone_ids: list[UUID] = list(columns.zone_ids)
+        self._zone_index = {
+            zone_id: index for index, zone_id in enumerate(self.zone_ids)
+        }
+        self.external_conductances = (
+            BatchThermalCalculationService().calculate_zone_heat_transfer_coefficients(
+                columns
+            )
+        )
+        self.heat_capacities = array(
+            "d",
+            (
+                volume * AIR_DENSITY_KG_PER_M3 * AIR_SPECIFIC_HEAT_CAPACITY_J_PER_KG_K
+                for volume in columns.zone_volume
+            ),
+        )
+        for element, zone in enumerate(columns.element_zone):
+            self.heat_capacities[zone] += (
+                columns.element_area[element]
+                * columns.element_areal_heat_capacity[element]
+            )
+
+        self._couplings = SparseSymmetricMatrix(len(self.zone_ids))
+        for coupling in couplings:
+            self._couplings.add_conductance(
+                self._index(coupling.zone_id),
+                self._index(coupling.adjacent_zone_id),
+                coupling.conductance.w_per_k,
+            )
+        self._symbolic = SkylineCholesky.for_matrix(self._couplings)
+        self._steady_factor: CholeskyFactor | None = None
+        self.set_timestep(timestep)
+
+    @property
+    def zone_count(self) -> int:
+        return len(self.zone_ids)
+
+    @property
+    def envelope_size(self) -> int:
+        """Number of entries stored by the matrix factors."""
+        return self._symbolic.envelope_size
+
+    def zone_index(self, zone_id: UUID) -> int:
+        """Node index of a zone.
+
+        Raises:
+            KeyError: If the zone is not part of the block
+        """
+        return self._zone_index[zone_id]
+
+    def set_timestep(self, timestep: TimeStepDuration) -> None:
+        """Change the time step, refactorising with the same symbolic factor."""
+        self.timestep = timestep
+        self._capacity_rates = array(
+            "d",
+            (
+                capacity / timestep.duration.total_seconds()
+                for capacity in self.heat_capacities
+            ),
+        )
+        self._step_factor = self._symbolic.factor(
+            self._conductance_matrix(self._capacity_rates)
+        )
+
+    def set_external_conductances(self, conductances: Sequence[float]) -> None:
+        """Change each zone's conductance to outside, e.g. for a ventilation schedule.
+
+        Args:
+            conductances: Conductance to outside of each zone in W/K, node order
+        """
+        if len(conductances) != self.zone_count:
+            raise ValueError("Need one conductance per zone")
+        if any(conductance < 0 for conductance in conductances):
+            raise ValueError("Conductances must be non-negative")
+        self.external_conductances = array("d", conductances)
+        self._steady_factor = None
+        self._step_factor = self._symbolic.factor(
+            self._conductance_matrix(self._capacity_rates)
+        )
+
+    def step(
+        self,
+        temperatures: Sequence[float],
+        external_temperature: float,
+        heat_gains: Sequence[float] | None = None,
+    ) -> array:
+        """Advance zone temperatures by one time step.
+
+        Args:
+            temperatures: Zone temperatures in °C at the start of the step
+            external_temperature: External temperature in °C during the step
+            heat_gains: Heat input to each zone in W, including any heating
+
+        Returns:
+            Zone temperatures in °C at the end of the step
+        """
+        if len(temperatures) != self.zone_count:
+            raise ValueError("Need one temperature per zone")
+        right_hand_side = self._external_load(external_temperature, heat_gains)
+        for zone, rate in enumerate(self._capacity_rates):
+            right_hand_side[zone] += rate * temperatures[zone]
+        return self._step_factor.solve(right_hand_side)
+
+    def solve_steady_state(
+        self,
+        external_temperature: float,
+        heat_gains: Sequence[float] | None = None,
+    ) -> array:
+        """Zone temperatures in °C at equilibrium with constant conditions.
+
+        Raises:
+            ValueError: If a group of coupled zones has no path to outside
+        """
+        if self._steady_factor is None:
+            self._steady_factor = self._symbolic.factor(self._conductance_matrix(None))
+        return self._steady_factor.solve(
+            self._external_load(external_temperature, heat_gains)
+        )
+
+    def calculate_heating_loads(
+        self, setpoints: Sequence[float], external_temperature: float
+    ) -> array:
+        """Steady heat input each zone needs to hold every zone at its setpoint.
+
+        Heat flowing between zones at different setpoints is credited to the
+        colder zone, so a negative load means a zone is held above its
+        setpoint by its neighbours.
+
+        Args:
+            setpoints: Setpoint of each zone in °C, node order
+            external_temperature: External temperature in °C
+
+        Returns:
+            Heat input of each zone in W
+        """
+        if len(setpoints) != self.zone_count:
+            raise ValueError("Need one setpoint per zone")
+        loads = self._couplings.multiply(setpoints)
+        for zone, conductance in enumerate(self.external_conductances):
+            loads[zone] += conductance * (setpoints[zone] - external_temperature)
+        return loads
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"BlockHeatBalance(zones={self.zone_count}, "
+            f"couplings={len(self._couplings.off_diagonal)})"
+        )
+
+    def _index(self, zone_id: UUID) -> int:
+        try:
+            return self._zone_index[zone_id]
+        except KeyError:
+            raise ValueError(f"Zone {zone_id} is not part of the block") from None
+
+    def _conductance_matrix(
+        self, capacity_rates: Sequence[float] | None
+    ) -> SparseSymmetricMatrix:
+        matrix = SparseSymmetricMatrix(self.zone_count)
+        matrix.off_diagonal = self._couplings.off_diagonal
+        for zone in range(self.zone_count):
+            matrix.diagonal[zone] = (
+                self._couplings.diagonal[zone] + self.external_conductances[zone]
+            )
+            if capacity_rates is not None:
+                matrix.diagonal[zone] += capacity_rates[zone]
+        return matrix
+
+    def _external_load(
+        self, external_temperature: float, heat_gains: Sequence[float] | None
+    ) -> array:
+        load = array(
+            "d",
+            (
+                conductance * external_temperature
+                for conductance in self.external_conductances
+            ),
+        )
+        if heat_gains is not None:
+            if len(heat_gains) != self.zone_count:
+                raise ValueError("Need one heat gain per zone")
+            for zone, gain in enumerate(heat_gains):
+                load[zone] += gain
+        return load
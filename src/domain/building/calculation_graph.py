@@ -0,0 +1,288 @@
+from collections.abc import Iterable
+from uuid import UUID
+
+from domain.building.aggregates.building import Building
+from domain.building.columns import BOUNDARY_TYPE_CODES
+from domain.building.enums import ThermalBoundaryType
+from domain.building.services import BatchThermalCalculationService
+from domain.building.value_objects import (
+    AirChangeRate,
+    Area,
+    JunctionCatalogue,
+    Pitch,
+    ThermalBridgeJunction,
+    ThermalConductance,
+    Volume,
+)
+from domain.building.value_objects.junction_catalogue import (
+    DEFAULT_JUNCTION_CATALOGUE,
+)
+from domain.energy.value_objects import Power
+from domain.shared.calculation_graph import CalculationGraph
+from domain.shared.value_objects import (
+    Length,
+    Temperature,
+    ThermalResistance,
+    ThermalTransmittance,
+)
+
+
+class BuildingCalculationGraph:
+    """Calculation graph of a building's derived thermal quantities.
+
+    Element U-values and HTCs, zone fabric, ventilation and bridge HTCs, and
+    building HTC, HLP and design heat loss are graph nodes built from the
+    building's inputs. Quantities are calculated on first request and cached;
+    changing an input through a setter only discards the quantities that
+    depend on it.
+
+    Attributes:
+        building_id: Identifier of the building the graph was built from
+        graph: The underlying calculation graph
+    """
+
+    def __init__(
+        self,
+        building: Building,
+        design_temperature: Temperature = Temperature(celsius=-3.0),
+        junction_catalogue: JunctionCatalogue = DEFAULT_JUNCTION_CATALOGUE,
+    ) -> None:
+        self.building_id = building.id
+        self.graph = CalculationGraph()
+        self.junction_catalogue = junction_catalogue
+        self._service = BatchThermalCalculationService(junction_catalogue)
+        graph = self.graph
+
+        graph.add_input(("building", "design_temperature"), design_temperature.celsius)
+        zone_keys = []
+        for zone in building.zones:
+            zone_key = ("zone", zone.id)
+            zone_keys.append(zone_key)
+            graph.add_input((*zone_key, "area"), zone.area.square_metres)
+            graph.add_input((*zone_key, "volume"), zone.volume.cubic_metres)
+            graph.add_input(
+                (*zone_key, "ventilation_rate"), zone.ventilation_rate.changes_per_hour
+            )
+            graph.add_input((*zone_key, "setpoint"), zone.temperature_setpoint.celsius)
+            graph.add_input(
+                (*zone_key, "thermal_bridges"),
+                tuple(bridge.w_per_k for bridge in zone.thermal_bridges),
+            )
+            graph.add_input((*zone_key, "junctions"), tuple(zone.junctions))
+
+            element_htc_keys = []
+            for element in zone.building_elements:
+                element_key = ("element", element.id)
+                graph.add_input(
+                    (*element_key, "boundary_type"), element.thermal_boundary_type
+                )
+                graph.add_input((*element_key, "area"), element.area.square_metres)
+                graph.add_input(
+                    (*element_key, "thermal_resistance"),
+                    element.thermal_resistance.m2_k_per_w,
+                )
+                graph.add_input((*element_key, "pitch"), element.pitch.degrees)
+                graph.add_input(
+                    (*element_key, "exposed_perimeter"),
+                    (
+                        element.exposed_perimeter.meters
+                        if element.exposed_perimeter is not None
+                        else 0.0
+                    ),
+                )
+                graph.add_node(
+                    (*element_key, "u_value"),
+                    [
+                        (*element_key, "boundary_type"),
+                        (*element_key, "thermal_resistance"),
+                        (*element_key, "pitch"),
+                        (*element_key, "area"),
+                        (*element_key, "exposed_perimeter"),
+                    ],
+                    self._u_value,
+                )
+                graph.add_node(
+                    (*element_key, "fabric_htc"),
+                    [(*element_key, "area"), (*element_key, "u_value")],
+                    lambda area, u_value: area * u_value,
+                )
+                element_htc_keys.append((*element_key, "fabric_htc"))
+
+            graph.add_node((*zone_key, "fabric_htc"), element_htc_keys, _total)
+            graph.add_node(
+                (*zone_key, "ventilation_htc"),
+                [(*zone_key, "ventilation_rate"), (*zone_key, "volume")],
+                self._service.calculate_ventilation_heat_transfer_coefficient,
+            )
+            graph.add_node(
+                (*zone_key, "thermal_bridge_htc"),
+                [(*zone_key, "thermal_bridges"), (*zone_key, "junctions")],
+                self._thermal_bridge_htc,
+            )
+            graph.add_node(
+                (*zone_key, "htc"),
+                [
+                    (*zone_key, "fabric_htc"),
+                    (*zone_key, "ventilation_htc"),
+                    (*zone_key, "thermal_bridge_htc"),
+                ],
+                _total,
+            )
+
+        graph.add_node(
+            ("building", "htc"), [(*key, "htc") for key in zone_keys], _total
+        )
+        graph.add_node(
+            ("building", "floor_area"), [(*key, "area") for key in zone_keys], _total
+        )
+        graph.add_node(
+            ("building", "hlp"),
+            [("building", "htc"), ("building", "floor_area")],
+            lambda htc, area: htc / area,
+        )
+        graph.add_node(
+            ("building", "setpoint"),
+            [("building", "floor_area")]
+            + [
+                input_key
+                for key in zone_keys
+                for input_key in ((*key, "area"), (*key, "setpoint"))
+            ],
+            _area_weighted_mean,
+        )
+        graph.add_node(
+            ("building", "design_heat_loss"),
+            [
+                ("building", "htc"),
+                ("building", "setpoint"),
+                ("building", "design_temperature"),
+            ],
+            lambda htc, setpoint, design: max(htc * (setpoint - design), 0.0),
+        )
+
+    def heat_transfer_coefficient(self) -> ThermalConductance:
+        """Total Heat Transfer Coefficient (HTC) of the building in W/K."""
+        return ThermalConductance(w_per_k=self.graph.get(("building", "htc")))
+
+    def heat_loss_parameter(self) -> ThermalTransmittance:
+        """Heat Loss Parameter (HLP) of the building in W/m²·K."""
+        return ThermalTransmittance(w_per_m2_k=self.graph.get(("building", "hlp")))
+
+    def design_heat_loss(self) -> Power:
+        """Design heat loss of the building in W."""
+        return Power(watts=self.graph.get(("building", "design_heat_loss")))
+
+    def zone_heat_transfer_coefficient(self, zone_id: UUID) -> ThermalConductance:
+        """Total HTC of a zone in W/K."""
+        return ThermalConductance(w_per_k=self.graph.get(("zone", zone_id, "htc")))
+
+    def element_u_value(self, element_id: UUID) -> float:
+        """U-value of a building element in W/m²·K (zero for internal partitions)."""
+        return float(self.graph.get(("element", element_id, "u_value")))
+
+    def set_element_thermal_resistance(
+        self, element_id: UUID, thermal_resistance: ThermalResistance
+    ) -> None:
+        """Change the construction resistance of a building element."""
+        self.graph.set_input(
+            ("element", element_id, "thermal_resistance"), thermal_resistance.m2_k_per_w
+        )
+
+    def set_element_area(self, element_id: UUID, area: Area) -> None:
+        """Change the area of a building element."""
+        self.graph.set_input(("element", element_id, "area"), area.square_metres)
+
+    def set_element_pitch(self, element_id: UUID, pitch: Pitch) -> None:
+        """Change the pitch of a building element."""
+        self.graph.set_input(("element", element_id, "pitch"), pitch.degrees)
+
+    def set_element_exposed_perimeter(
+        self, element_id: UUID, exposed_perimeter: Length | None
+    ) -> None:
+        """Change the exposed perimeter of a ground floor element."""
+        self.graph.set_input(
+            ("element", element_id, "exposed_perimeter"),
+            exposed_perimeter.meters if exposed_perimeter is not None else 0.0,
+        )
+
+    def set_element_boundary_type(
+        self, element_id: UUID, boundary_type: ThermalBoundaryType
+    ) -> None:
+        """Change the thermal boundary type of a building element."""
+        self.graph.set_input(("element", element_id, "boundary_type"), boundary_type)
+
+    def set_zone_ventilation_rate(
+        self, zone_id: UUID, ventilation_rate: AirChangeRate
+    ) -> None:
+        """Change the air change rate of a zone."""
+        self.graph.set_input(
+            ("zone", zone_id, "ventilation_rate"), ventilation_rate.changes_per_hour
+        )
+
+    def set_zone_volume(self, zone_id: UUID, volume: Volume) -> None:
+        """Change the volume of a zone."""
+        self.graph.set_input(("zone", zone_id, "volume"), volume.cubic_metres)
+
+    def set_zone_setpoint(self, zone_id: UUID, setpoint: Temperature) -> None:
+        """Change the temperature setpoint of a zone."""
+        self.graph.set_input(("zone", zone_id, "setpoint"), setpoint.celsius)
+
+    def set_zone_thermal_bridges(
+        self, zone_id: UUID, thermal_bridges: Iterable[ThermalConductance]
+    ) -> None:
+        """Replace the thermal bridges of a zone."""
+        self.graph.set_input(
+            ("zone", zone_id, "thermal_bridges"),
+            tuple(bridge.w_per_k for bridge in thermal_bridges),
+        )
+
+    def set_zone_junctions(
+        self, zone_id: UUID, junctions: Iterable[ThermalBridgeJunction]
+    ) -> None:
+        """Replace the thermal bridge junctions of a zone."""
+        self.graph.set_input(("zone", zone_id, "junctions"), tuple(junctions))
+
+    def set_design_temperature(self, design_temperature: Temperature) -> None:
+        """Change the external design temperature."""
+        self.graph.set_input(
+            ("building", "design_temperature"), design_temperature.celsius
+        )
+
+    def _thermal_bridge_htc(
+        self,
+        thermal_bridges: tuple[float, ...],
+        junctions: tuple[ThermalBridgeJunction, ...],
+    ) -> float:
+        return sum(thermal_bridges) + sum(
+            self.junction_catalogue.psi_value(junction.junction_type).w_per_m_k
+            * junction.length.meters
+            for junction in junctions
+        )
+
+    def _u_value(
+        self,
+        boundary_type: ThermalBoundaryType,
+        thermal_resistance: float,
+        pitch: float,
+        area: float,
+        exposed_perimeter: float,
+    ) -> float:
+        return self._service.calculate_u_values_from_arrays(
+            boundary_types=(BOUNDARY_TYPE_CODES[boundary_type],),
+            thermal_resistances=(thermal_resistance,),
+            pitches=(pitch,),
+            areas=(area,),
+            exposed_perimeters=(exposed_perimeter,),
+        )[0]
+
+
+def _total(*values: float) -> float:
+    return sum(values)
+
+
+def _area_weighted_mean(total_area: float, *areas_and_values: float) -> float:
+    weighted = sum(
+        area * value
+        for area, value in zip(areas_and_values[::2], areas_and_values[1::2])
+    )
+    return weighted / total_area
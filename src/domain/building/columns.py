@@ -0,0 +1,210 @@
+"""Columnar representation of many buildings for batch calculations.
+
+Buildings, zones and elements are stored as parallel arrays of raw floats
+rather than entities and value objects, with integer parent indices linking
+elements to zones and zones to buildings. Values are validated by the code
+that appends them, so batch kernels can work on the arrays directly.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from domain.building.enums import ThermalBoundaryType
+from domain.building.value_objects.junction_catalogue import JUNCTION_TYPE_CODES
+
+if TYPE_CHECKING:
+    from domain.building.aggregates.building import Building
+
+BOUNDARY_TYPES: tuple[ThermalBoundaryType, ...] = tuple(ThermalBoundaryType)
+BOUNDARY_TYPE_CODES: dict[ThermalBoundaryType, int] = {
+    boundary_type: code for code, boundary_type in enumerate(BOUNDARY_TYPES)
+}
+
+
+@dataclass
+class BuildingColumns:
+    """Buildings, zones and building elements as parallel arrays.
+
+    Attributes:
+        building_ids: Identifier of each building
+        zone_ids: Identifier of each zone
+        zone_building: Index of the building each zone belongs to
+        zone_area: Useful floor area of each zone in m²
+        zone_volume: Volume of each zone in m³
+        zone_air_change_rate: Air change rate of each zone in 1/h
+        zone_setpoint: Temperature setpoint of each zone in °C
+        zone_thermal_bridges: Summed thermal bridge conductance of each zone in W/K
+        element_ids: Identifier of each building element
+        element_zone: Index of the zone each element belongs to
+        element_boundary_type: Thermal boundary type code of each element
+        element_area: Area of each element in m²
+        element_thermal_resistance: Construction resistance of each element in m²·K/W
+        element_areal_heat_capacity: Areal heat capacity of each element in J/m²·K
+        element_orientation: Orientation of each element in degrees
+        element_pitch: Pitch of each element in degrees
+        element_exposed_perimeter: Exposed perimeter of each ground floor in m,
+            zero when not given
+        junction_zone: Index of the zone each thermal bridge junction belongs to
+        junction_type: Junction type code of each junction
+        junction_length: Length of each junction in m
+    """
+
+    building_ids: list[UUID] = field(default_factory=list)
+    zone_ids: list[UUID] = field(default_factory=list)
+    zone_building: array = field(default_factory=lambda: array("l"))
+    zone_area: array = field(default_factory=lambda: array("d"))
+    zone_volume: array = field(default_factory=lambda: array("d"))
+    zone_air_change_rate: array = field(default_factory=lambda: array("d"))
+    zone_setpoint: array = field(default_factory=lambda: array("d"))
+    zone_thermal_bridges: array = field(default_factory=lambda: array("d"))
+    element_ids: list[UUID] = field(default_factory=list)
+    element_zone: array = field(default_factory=lambda: array("l"))
+    element_boundary_type: array = field(default_factory=lambda: array("b"))
+    element_area: array = field(default_factory=lambda: array("d"))
+    element_thermal_resistance: array = field(default_factory=lambda: array("d"))
+    element_areal_heat_capacity: array = field(default_factory=lambda: array("d"))
+    element_orientation: array = field(default_factory=lambda: array("d"))
+    element_pitch: array = field(default_factory=lambda: array("d"))
+    element_exposed_perimeter: array = field(default_factory=lambda: array("d"))
+    junction_zone: array = field(default_factory=lambda: array("l"))
+    junction_type: array = field(default_factory=lambda: array("b"))
+    junction_length: array = field(default_factory=lambda: array("d"))
+
+    @classmethod
+    def from_buildings(cls, buildings: "list[Building]") -> "BuildingColumns":
+        """Flatten building aggregates into columns."""
+        columns = cls()
+        for building in buildings:
+            columns.add_building(building)
+        return columns
+
+    def add_building(self, building: "Building") -> int:
+        """Append a building aggregate with its zones and elements.
+
+        Returns:
+            The index of the building within the columns
+        """
+        building_index = self.append_building(building.id)
+        for zone in building.zones:
+            zone_index = self.append_zone(
+                zone_id=zone.id,
+                building_index=building_index,
+                area=zone.area.square_metres,
+                volume=zone.volume.cubic_metres,
+                air_change_rate=zone.ventilation_rate.changes_per_hour,
+                setpoint=zone.temperature_setpoint.celsius,
+                thermal_bridges=sum(bridge.w_per_k for bridge in zone.thermal_bridges),
+            )
+            for element in zone.building_elements:
+                self.append_element(
+                    element_id=element.id,
+                    zone_index=zone_index,
+                    boundary_type=BOUNDARY_TYPE_CODES[element.thermal_boundary_type],
+                    area=element.area.square_metres,
+                    thermal_resistance=element.thermal_resistance.m2_k_per_w,
+                    areal_heat_capacity=element.areal_heat_capacity.j_per_m2_k,
+                    orientation=element.orientation.degrees,
+                    pitch=element.pitch.degrees,
+                    exposed_perimeter=(
+                        element.exposed_perimeter.meters
+                        if element.exposed_perimeter is not None
+                        else 0.0
+                    ),
+                )
+            for junction in zone.junctions:
+                self.append_junction(
+                    zone_index=zone_index,
+                    junction_type=JUNCTION_TYPE_CODES[junction.junction_type],
+                    length=junction.length.meters,
+                )
+        return building_index
+
+    def append_building(self, building_id: UUID) -> int:
+        """Append a building row and return its index."""
+        self.building_ids.append(building_id)
+        return len(self.building_ids) - 1
+
+    def append_zone(
+        self,
+        zone_id: UUID,
+        building_index: int,
+        area: float,
+        volume: float,
+        air_change_rate: float,
+        setpoint: float,
+        thermal_bridges: float,
+    ) -> int:
+        """Append a zone row and return its index."""
+        self.zone_ids.append(zone_id)
+        self.zone_building.append(building_index)
+        self.zone_area.append(area)
+        self.zone_volume.append(volume)
+        self.zone_air_change_rate.append(air_change_rate)
+        self.zone_setpoint.append(setpoint)
+        self.zone_thermal_bridges.append(thermal_bridges)
+        return len(self.zone_ids) - 1
+
+    def append_element(
+        self,
+        element_id: UUID,
+        zone_index: int,
+        boundary_type: int,
+        area: float,
+        thermal_resistance: float,
+        areal_heat_capacity: float,
+        orientation: float,
+        pitch: float,
+        exposed_perimeter: float = 0.0,
+    ) -> int:
+        """Append a building element row and return its index."""
+        self.element_ids.append(element_id)
+        self.element_zone.append(zone_index)
+        self.element_boundary_type.append(boundary_type)
+        self.element_area.append(area)
+        self.element_thermal_resistance.append(thermal_resistance)
+        self.element_areal_heat_capacity.append(areal_heat_capacity)
+        self.element_orientation.append(orientation)
+        self.element_pitch.append(pitch)
+        self.element_exposed_perimeter.append(exposed_perimeter)
+        return len(self.element_ids) - 1
+
+    def append_junction(
+        self, zone_index: int, junction_type: int, length: float
+    ) -> int:
+        """Append a thermal bridge junction row and return its index."""
+        self.junction_zone.append(zone_index)
+        self.junction_type.append(junction_type)
+        self.junction_length.append(length)
+        return len(self.junction_zone) - 1
+
+    @property
+    def building_count(self) -> int:
+        """Number of buildings in the columns."""
+        return len(self.building_ids)
+
+    @property
+    def zone_count(self) -> int:
+        """Number of zones in the columns."""
+        return len(self.zone_ids)
+
+    @property
+    def element_count(self) -> int:
+        """Number of building elements in the columns."""
+        return len(self.element_ids)
+
+    @property
+    def junction_count(self) -> int:
+        """Number of thermal bridge junctions in the columns."""
+        return len(self.junction_zone)
+
+    def __len__(self) -> int:
+        return self.building_count
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"BuildingColumns(buildings={self.building_count}, "
+            f"zones={self.zone_count}, elements={self.element_count})"
+        )
@@ -43,3 +43,8 @@ R_CURTAINS_BLINDS = 0.04  # m²K/W - Thermal resistance of curtains/blinds
 # These appear to be standard atmospheric air properties at ~20°C, 1 atm
 AIR_DENSITY_KG_PER_M3 = 1.204  # kg/m³ (0.001204 kg/litre × 1000)
 AIR_SPECIFIC_HEAT_CAPACITY_J_PER_KG_K = 1006.0  # J/kg·K
+
+# Ground floor heat transfer, BS EN ISO 13370:2017
+# Full thickness of the walls surrounding a ground floor, used for the
+# equivalent thickness of the floor when no wall thickness is known
+GROUND_FLOOR_WALL_THICKNESS_M = 0.3
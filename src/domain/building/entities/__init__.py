@@ -1,4 +1,20 @@
-from .building_element import BuildingElement
-from .zone import Zone
+from typing import TYPE_CHECKING
 
-__all__ = ["BuildingElement", "Zone"]
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .building_element import BuildingElement
+    from .zone import Zone
+
+__all__ = [
+    "BuildingElement",
+    "Zone",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BuildingElement": ".building_element",
+        "Zone": ".zone",
+    },
+)
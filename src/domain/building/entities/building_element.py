@@ -10,7 +10,11 @@ from domain.building.value_objects import (
     Pitch,
     ThermalConductance,
 )
-from domain.shared.value_objects import ThermalResistance, ThermalTransmittance
+from domain.shared.value_objects import (
+    Length,
+    ThermalResistance,
+    ThermalTransmittance,
+)
 
 
 @dataclass(frozen=True)
@@ -29,6 +33,8 @@ class BuildingElement:
         thermal_mass: Areal heat capacity in J/m²·K
         orientation: Geographical azimuth angle in degrees
         pitch: Tilt angle from horizontal in degrees
+        exposed_perimeter: Exposed perimeter of a ground floor in meters, which
+            enables the ISO 13370 ground model for ground contact elements
     """
 
     id: UUID
@@ -39,6 +45,7 @@ class BuildingElement:
     areal_heat_capacity: ArealHeatCapacity
     orientation: Orientation
     pitch: Pitch
+    exposed_perimeter: Length | None = None
 
     def calculate_u_value(self) -> ThermalTransmittance:
         """Calculate the U-value of the building element.
@@ -51,6 +58,8 @@ class BuildingElement:
             construction_resistance=self.thermal_resistance,
             pitch=self.pitch,
             thermal_boundary_type=self.thermal_boundary_type,
+            area=self.area,
+            exposed_perimeter=self.exposed_perimeter,
         )
 
     def calculate_fabric_heat_transfer_coefficient(self) -> ThermalConductance:
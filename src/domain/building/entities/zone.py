@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from uuid import UUID
 
 from domain.building.constants import (
@@ -9,9 +9,14 @@ from domain.building.entities import BuildingElement
 from domain.building.value_objects import (
     AirChangeRate,
     Area,
+    JunctionCatalogue,
+    ThermalBridgeJunction,
     ThermalConductance,
     Volume,
 )
+from domain.building.value_objects.junction_catalogue import (
+    DEFAULT_JUNCTION_CATALOGUE,
+)
 from domain.shared.value_objects import Temperature
 
 
@@ -31,6 +36,7 @@ class Zone:
         ventilation_rate: Air change rate for ventilation
         temperature_setpoint: Target temperature for the zone
         thermal_bridges: List of pre-normalized thermal bridges as ThermalConductance value objects
+        junctions: List of linear thermal bridge junctions (psi-value x length)
     """
 
     id: UUID
@@ -41,6 +47,7 @@ class Zone:
     ventilation_rate: AirChangeRate
     temperature_setpoint: Temperature
     thermal_bridges: list[ThermalConductance]
+    junctions: list[ThermalBridgeJunction] = field(default_factory=list)
 
     def calculate_total_building_element_area(self) -> Area:
         """Calculate the total area of all building elements in the zone.
@@ -73,16 +80,41 @@ class Zone:
 
         return ThermalConductance(w_per_k=thermal_conductance)
 
+    def calculate_junction_heat_transfer_coefficient(
+        self, junction_catalogue: JunctionCatalogue = DEFAULT_JUNCTION_CATALOGUE
+    ) -> ThermalConductance:
+        """Calculate the heat transfer coefficient of the zone's junctions.
+
+        This is the sum of psi-value * length over all junctions.
+
+        Args:
+            junction_catalogue: Catalogue giving the psi-value of each junction type
+
+        Returns:
+            Junction heat transfer coefficient in W/K as ThermalConductance value object
+
+        Raises:
+            ValueError: If the junctions transfer no heat, because the zone
+                has none or every one has a psi-value of zero in the catalogue
+        """
+        return ThermalConductance(w_per_k=self._junction_w_per_k(junction_catalogue))
+
     def calculate_total_thermal_bridge_heat_transfer_coefficient(
-        self,
+        self, junction_catalogue: JunctionCatalogue = DEFAULT_JUNCTION_CATALOGUE
     ) -> ThermalConductance:
         """Calculate total thermal bridge heat transfer coefficient.
 
+        Includes the pre-normalized thermal bridges and the junctions.
+
+        Args:
+            junction_catalogue: Catalogue giving the psi-value of each junction type
+
         Returns:
             Total thermal bridge heat transfer coefficient in W/K as ThermalConductance value object
         """
         return ThermalConductance(
             w_per_k=sum(bridge.w_per_k for bridge in self.thermal_bridges)
+            + self._junction_w_per_k(junction_catalogue)
         )
 
     def calculate_total_fabric_heat_transfer_coefficient(self) -> ThermalConductance:
@@ -100,6 +132,13 @@ class Zone:
         )
         return ThermalConductance(w_per_k=total_fabric_heat_transfer_coefficient)
 
+    def _junction_w_per_k(self, junction_catalogue: JunctionCatalogue) -> float:
+        return sum(
+            junction_catalogue.psi_value(junction.junction_type).w_per_m_k
+            * junction.length.meters
+            for junction in self.junctions
+        )
+
     def __str__(self) -> str:
         """String representation for display."""
         return f"{self.name} ({self.area.square_metres:.1f} m²)"
@@ -19,3 +19,38 @@ class ThermalBoundaryType(Enum):
     def __str__(self) -> str:
         """String representation for display."""
         return self.value.replace("_", " ").title()
+
+
+class JunctionType(Enum):
+    """Linear thermal bridge junction types.
+
+    Values are the junction references of SAP 10.2 Appendix K, Table K1.
+    E17 (inverted corner) is omitted as its psi-value is negative.
+    """
+
+    STEEL_LINTEL = "E1"
+    OTHER_LINTEL = "E2"
+    SILL = "E3"
+    JAMB = "E4"
+    GROUND_FLOOR = "E5"
+    INTERMEDIATE_FLOOR = "E6"
+    PARTY_FLOOR = "E7"
+    BALCONY_WITHIN_DWELLING = "E8"
+    BALCONY_BETWEEN_DWELLINGS = "E9"
+    EAVES_INSULATION_AT_CEILING = "E10"
+    EAVES_INSULATION_AT_RAFTERS = "E11"
+    GABLE_INSULATION_AT_CEILING = "E12"
+    GABLE_INSULATION_AT_RAFTERS = "E13"
+    FLAT_ROOF = "E14"
+    FLAT_ROOF_WITH_PARAPET = "E15"
+    CORNER = "E16"
+    PARTY_WALL_BETWEEN_DWELLINGS = "E18"
+    PARTY_WALL_GROUND_FLOOR = "P1"
+    PARTY_WALL_INTERMEDIATE_FLOOR_WITHIN_DWELLING = "P2"
+    PARTY_WALL_INTERMEDIATE_FLOOR_BETWEEN_DWELLINGS = "P3"
+    PARTY_WALL_ROOF_INSULATION_AT_CEILING = "P4"
+    PARTY_WALL_ROOF_INSULATION_AT_RAFTERS = "P5"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return f"{self.value} {self.name.replace('_', ' ').lower()}"
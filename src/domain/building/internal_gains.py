@@ -0,0 +1,336 @@
+"""Internal heat gains of occupants, appliances and lighting.
+
+Annual amounts follow SAP 2012 Appendix L and Table 5, driven by the total
+floor area (TFA) of the dwelling:
+
+- occupancy N = 1 + 1.76·(1 - exp(-0.000349·(TFA - 13.9)²)) + 0.0013·(TFA -
+  13.9), or 1 for TFA ≤ 13.9 m², with 60 W of metabolic gain per person
+- appliances E_A = 207.8·(TFA·N)^0.4714 kWh a year, varying by month with
+  1 + 0.157·cos(2π(m - 1.78)/12)
+- lighting E_L = 59.73·(TFA·N)^0.4714 kWh a year, varying by month with
+  1 + 0.5·cos(2π(m - 0.2)/12), of which 85 % is a heat gain
+
+A gains profile spreads each of these over the day with 24 hourly weights,
+normalised so the annual totals are kept. Gains are split between zones in
+proportion to zone floor area.
+
+Deterministic gains per m² are computed for the whole clock timeline at the
+middle of the building's floor area band and cached by (band, profile,
+timeline), so every building in a band shares one calculation. Ensembles
+vary the occupancy, appliance and lighting levels of each member with
+lognormal factors and shift its daily schedule, seeded per member so
+ensembles are reproducible.
+"""
+
+import math
+import random
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from uuid import UUID
+
+from domain.building.aggregates.building import Building
+from domain.simulation.entities.simulation_clock import SimulationClock
+
+_METABOLIC_GAIN_W_PER_PERSON = 60.0
+_APPLIANCE_COEFFICIENT_KWH = 207.8
+_LIGHTING_COEFFICIENT_KWH = 59.73
+_ENERGY_EXPONENT = 0.4714
+_LIGHTING_GAIN_FRACTION = 0.85
+_HOURS_PER_YEAR = 8760
+
+
+@dataclass(frozen=True)
+class GainsProfile:
+    """Daily shapes of internal gains.
+
+    Each shape holds 24 non-negative weights, one per hour of the day from
+    midnight. Weights are relative: each shape is scaled to a mean of 1, so
+    the profile moves gains between hours without changing the daily total.
+
+    Attributes:
+        name: Identifier of the profile
+        occupancy: Metabolic gain of occupants by hour
+        appliances: Appliance use by hour
+        lighting: Lighting use by hour
+    """
+
+    name: str
+    occupancy: tuple[float, ...]
+    appliances: tuple[float, ...]
+    lighting: tuple[float, ...]
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            raise ValueError("Gains profile must have a name")
+        for label, shape in (
+            ("occupancy", self.occupancy),
+            ("appliances", self.appliances),
+            ("lighting", self.lighting),
+        ):
+            if len(shape) != 24:
+                raise ValueError(f"Gains profile {label} needs 24 hourly weights")
+            if min(shape) < 0 or sum(shape) <= 0:
+                raise ValueError(
+                    f"Gains profile {label} weights must be non-negative, "
+                    "and not all zero"
+                )
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.name
+
+
+# Hourly weights from midnight: 6 h asleep, 3 h getting up, 7 h mostly out
+# and 8 h of evening
+_OCCUPANCY_WEIGHTS = (
+    (0.9,) * 6 + (1.1, 1.1, 0.7) + (0.5,) * 7 + (0.9, 1.2, 1.3, 1.3, 1.3, 1.2, 1.1, 1.0)
+)
+_APPLIANCE_WEIGHTS = (
+    (0.4,) * 6 + (1.0, 1.4, 1.0) + (0.7,) * 7 + (1.2, 1.8, 1.9, 1.7, 1.5, 1.3, 1.0, 0.7)
+)
+_LIGHTING_WEIGHTS = (
+    (0.1,) * 6 + (1.0, 1.2, 0.6) + (0.2,) * 7 + (0.9, 2.2, 2.8, 2.8, 2.6, 2.3, 1.7, 0.9)
+)
+
+DEFAULT_GAINS_PROFILE = GainsProfile(
+    name="typical_dwelling",
+    occupancy=_OCCUPANCY_WEIGHTS,
+    appliances=_APPLIANCE_WEIGHTS,
+    lighting=_LIGHTING_WEIGHTS,
+)
+
+
+@dataclass(frozen=True)
+class GainsVariation:
+    """Spread of internal gains between the members of an ensemble.
+
+    Attributes:
+        occupancy_sigma: Standard deviation of the log occupancy factor
+        appliance_sigma: Standard deviation of the log appliance factor
+        lighting_sigma: Standard deviation of the log lighting factor
+        max_shift_hours: Largest shift of a member's daily schedule, either
+            way
+    """
+
+    occupancy_sigma: float = 0.2
+    appliance_sigma: float = 0.3
+    lighting_sigma: float = 0.3
+    max_shift_hours: int = 1
+
+    def __post_init__(self) -> None:
+        if min(self.occupancy_sigma, self.appliance_sigma, self.lighting_sigma) < 0:
+            raise ValueError("Gains variation sigmas must be non-negative")
+        if not 0 <= self.max_shift_hours < 12:
+            raise ValueError("Schedule shift must be between 0 and 11 hours")
+
+
+@dataclass(frozen=True)
+class InternalGains:
+    """Internal gains of each zone of a building over a clock timeline.
+
+    Attributes:
+        zone_ids: Ids of the zones, in building order
+        zone_gains: Gain of each zone in W at every time step
+    """
+
+    zone_ids: tuple[UUID, ...]
+    zone_gains: tuple[array, ...]
+
+    def for_zone(self, zone_id: UUID) -> array:
+        """Gain of one zone in W at every time step."""
+        try:
+            return self.zone_gains[self.zone_ids.index(zone_id)]
+        except ValueError:
+            raise KeyError(zone_id) from None
+
+    def step_gains(self) -> Iterator[tuple[float, ...]]:
+        """Gain of every zone at each time step, as heat balances take them."""
+        return zip(*self.zone_gains)
+
+    def total(self) -> array:
+        """Gain of the whole building in W at every time step."""
+        return array("d", map(sum, zip(*self.zone_gains)))
+
+
+class InternalGainsModel:
+    """Generates internal gains of building zones over a clock timeline.
+
+    Attributes:
+        profile: Daily shapes of the gains
+        band_width_m2: Width of the floor area bands gains are cached by
+        variation: Spread of gains between ensemble members
+    """
+
+    def __init__(
+        self,
+        profile: GainsProfile = DEFAULT_GAINS_PROFILE,
+        band_width_m2: float = 10.0,
+        variation: GainsVariation = GainsVariation(),
+    ) -> None:
+        if band_width_m2 <= 0:
+            raise ValueError("Floor area band width must be positive")
+        self.profile = profile
+        self.band_width_m2 = band_width_m2
+        self.variation = variation
+
+    @staticmethod
+    def occupancy(floor_area_m2: float) -> float:
+        """Assumed number of occupants of a dwelling."""
+        excess = floor_area_m2 - 13.9
+        if excess <= 0:
+            return 1.0
+        return 1 + 1.76 * (1 - math.exp(-0.000349 * excess**2)) + 0.0013 * excess
+
+    def zone_gains(self, building: Building, clock: SimulationClock) -> InternalGains:
+        """Deterministic gains of each zone of a building."""
+        return self._scaled(building, clock, 1.0, 1.0, 1.0, 0)
+
+    def ensemble(
+        self, building: Building, clock: SimulationClock, members: int, seed: int = 0
+    ) -> list[InternalGains]:
+        """Gains of each zone of a building for every member of an ensemble.
+
+        Member i draws its factors from a generator seeded with (seed, i), so
+        a member's gains do not depend on how many members are generated.
+        Factors have a mean of 1, so the ensemble mean stays close to the
+        deterministic gains.
+        """
+        if members <= 0:
+            raise ValueError("Ensemble needs at least one member")
+        variation = self.variation
+        steps_per_hour = timedelta(hours=1) / clock.timestep_duration.duration
+        ensemble = []
+        for member in range(members):
+            rng = random.Random(f"{seed}:{member}")
+            occupancy = _unit_mean_lognormal(rng, variation.occupancy_sigma)
+            appliances = _unit_mean_lognormal(rng, variation.appliance_sigma)
+            lighting = _unit_mean_lognormal(rng, variation.lighting_sigma)
+            shift_hours = rng.randint(
+                -variation.max_shift_hours, variation.max_shift_hours
+            )
+            ensemble.append(
+                self._scaled(
+                    building,
+                    clock,
+                    occupancy,
+                    appliances,
+                    lighting,
+                    round(shift_hours * steps_per_hour),
+                )
+            )
+        return ensemble
+
+    def _scaled(
+        self,
+        building: Building,
+        clock: SimulationClock,
+        occupancy_factor: float,
+        appliance_factor: float,
+        lighting_factor: float,
+        shift_steps: int,
+    ) -> InternalGains:
+        floor_area = building.total_floor_area.square_metres
+        band = math.floor(floor_area / self.band_width_m2)
+        occupants, appliances, lighting = _gains_per_m2(
+            self.profile,
+            (band + 0.5) * self.band_width_m2,
+            clock.start_time.datetime,
+            clock.timestep_duration.duration,
+            clock.total_time_steps,
+        )
+        per_m2 = [
+            occupancy_factor * occupant
+            + appliance_factor * appliance
+            + lighting_factor * light
+            for occupant, appliance, light in zip(occupants, appliances, lighting)
+        ]
+        if shift_steps and per_m2:
+            # A later schedule moves every gain shift_steps forward in time
+            shift = shift_steps % len(per_m2)
+            per_m2 = per_m2[-shift:] + per_m2[:-shift]
+        zones = building.zones
+        return InternalGains(
+            zone_ids=tuple(zone.id for zone in zones),
+            zone_gains=tuple(
+                array("d", [zone.area.square_metres * gain for gain in per_m2])
+                for zone in zones
+            ),
+        )
+
+
+@lru_cache(maxsize=64)
+def _gains_per_m2(
+    profile: GainsProfile,
+    floor_area_m2: float,
+    start: datetime,
+    timestep: timedelta,
+    step_count: int,
+) -> tuple[array, array, array]:
+    """Occupant, appliance and lighting gains per m² of floor area in W."""
+    occupants = InternalGainsModel.occupancy(floor_area_m2)
+    energy_scale = (floor_area_m2 * occupants) ** _ENERGY_EXPONENT
+    # Mean gains in W per m²
+    metabolic = _METABOLIC_GAIN_W_PER_PERSON * occupants / floor_area_m2
+    appliances = (
+        _APPLIANCE_COEFFICIENT_KWH * energy_scale * 1000 / _HOURS_PER_YEAR
+    ) / floor_area_m2
+    lighting = (
+        _LIGHTING_GAIN_FRACTION
+        * _LIGHTING_COEFFICIENT_KWH
+        * energy_scale
+        * 1000
+        / _HOURS_PER_YEAR
+    ) / floor_area_m2
+
+    hours, months = _timeline_calendar(start, timestep, step_count)
+    occupancy_shape = _hourly(profile.occupancy, metabolic)
+    appliance_shape = _hourly(profile.appliances, appliances)
+    lighting_shape = _hourly(profile.lighting, lighting)
+    appliance_months = [
+        1 + 0.157 * math.cos(2 * math.pi * (month - 1.78) / 12) for month in range(13)
+    ]
+    lighting_months = [
+        1 + 0.5 * math.cos(2 * math.pi * (month - 0.2) / 12) for month in range(13)
+    ]
+    return (
+        array("d", [occupancy_shape[hour] for hour in hours]),
+        array(
+            "d",
+            [
+                appliance_shape[hour] * appliance_months[month]
+                for hour, month in zip(hours, months)
+            ],
+        ),
+        array(
+            "d",
+            [
+                lighting_shape[hour] * lighting_months[month]
+                for hour, month in zip(hours, months)
+            ],
+        ),
+    )
+
+
+@lru_cache(maxsize=8)
+def _timeline_calendar(
+    start: datetime, timestep: timedelta, step_count: int
+) -> tuple[array, array]:
+    # Hour of day and month number of every step
+    hours, months = array("b"), array("b")
+    for step in range(step_count):
+        moment = start + step * timestep
+        hours.append(moment.hour)
+        months.append(moment.month)
+    return hours, months
+
+
+def _unit_mean_lognormal(rng: random.Random, sigma: float) -> float:
+    return rng.lognormvariate(-sigma * sigma / 2, sigma)
+
+
+def _hourly(weights: Sequence[float], mean: float) -> list[float]:
+    scale = mean * len(weights) / sum(weights)
+    return [weight * scale for weight in weights]
@@ -0,0 +1,236 @@
+"""Reduced-order RC models by lumping mass nodes with similar time constants.
+
+A detailed network has a mass node per building element. Elements of one
+zone whose time constants C / (g_zone + g_outside) are close respond alike,
+so they can be merged into one node holding their summed capacity and
+conductances. Merging only nodes that all reach outside, or all do not,
+keeps the steady-state heat transfer coefficient exact; only the dynamic
+response changes.
+
+``ModelReducer`` merges the mass nodes of each zone into as few groups as
+possible, splitting the time constants at their widest gaps, and adds groups
+until a test simulation stays within an error bound of the detailed
+network. ``ReducedModelCache`` keeps reduced networks by building content,
+so identical buildings in a portfolio are only reduced once.
+"""
+
+import hashlib
+import math
+from array import array
+from collections import OrderedDict
+from datetime import timedelta
+
+from domain.building.aggregates.building import Building
+from domain.building.columns import BuildingColumns
+from domain.building.thermal_network import RCNetwork, build_element_network
+from domain.shared.sparse_cholesky import SparseSymmetricMatrix
+from domain.simulation.value_objects import TimeStepDuration
+
+
+class ModelReducer:
+    """Reduce RC networks to few states within an error bound.
+
+    The test simulation starts every node at 20 °C and drives the network
+    with a daily external temperature swing around 5 °C and a heat gain to
+    each zone switched on for the first half of every day.
+
+    Attributes:
+        error_bound_k: Largest zone air temperature deviation allowed in K
+        test_duration: Length of the test simulation
+        test_heat_gain_w: Heat gain per zone during the test in W
+    """
+
+    def __init__(
+        self,
+        error_bound_k: float = 0.1,
+        test_duration: timedelta = timedelta(days=7),
+        test_heat_gain_w: float = 1000.0,
+    ) -> None:
+        if error_bound_k <= 0:
+            raise ValueError("Error bound must be positive")
+        if test_duration <= timedelta(0):
+            raise ValueError("Test duration must be positive")
+        self.error_bound_k = error_bound_k
+        self.test_duration = test_duration
+        self.test_heat_gain_w = test_heat_gain_w
+
+    def reduce(self, network: RCNetwork) -> tuple[RCNetwork, float]:
+        """Reduce a network to the fewest groups meeting the error bound.
+
+        Mass nodes linked to exactly one zone air node are lumped; any other
+        node is kept as it is.
+
+        Returns:
+            The reduced network and its test error in K
+        """
+        groups = _lumpable_groups(network)
+        reference = self._test_response(network)
+        largest = max((len(nodes) for nodes in groups.values()), default=0)
+        reduced, error = network, 0.0
+        for clusters in range(1, largest + 1):
+            reduced = _lump(network, groups, clusters)
+            error = _max_deviation(reference, self._test_response(reduced))
+            if error <= self.error_bound_k:
+                return reduced, error
+        return network, 0.0
+
+    def test_error(self, network: RCNetwork, reduced: RCNetwork) -> float:
+        """Largest zone air temperature deviation in K over the test."""
+        return _max_deviation(
+            self._test_response(network), self._test_response(reduced)
+        )
+
+    def _test_response(self, network: RCNetwork) -> list[array]:
+        step_hours = network.timestep.hours
+        steps = max(int(self.test_duration / network.timestep.duration), 1)
+        external = [
+            5.0 + 5.0 * math.sin(2 * math.pi * step * step_hours / 24)
+            for step in range(steps)
+        ]
+        on = [self.test_heat_gain_w] * network.zone_count
+        off = [0.0] * network.zone_count
+        gains = [on if (step * step_hours) % 24 < 12 else off for step in range(steps)]
+        return network.simulate(20.0, external, gains)
+
+
+class ReducedModelCache:
+    """Reduced networks cached by building content and time step.
+
+    Buildings with the same zones and elements share an entry whatever their
+    identifiers, so a portfolio of repeated archetypes is reduced once per
+    archetype.
+
+    Attributes:
+        reducer: Reducer used for buildings not yet cached
+        max_entries: Number of reduced networks kept, least recently used first out
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that reduced a network
+    """
+
+    def __init__(self, reducer: ModelReducer | None = None, max_entries: int = 1024):
+        if max_entries <= 0:
+            raise ValueError("Cache size must be positive")
+        self.reducer = reducer or ModelReducer()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, float], RCNetwork] = OrderedDict()
+
+    def get(self, building: Building, timestep: TimeStepDuration) -> RCNetwork:
+        """The reduced network of a building, reducing it on first use."""
+        key = (building_content_hash(building), timestep.duration.total_seconds())
+        network = self._entries.get(key)
+        if network is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return network
+        self.misses += 1
+        network, _ = self.reducer.reduce(build_element_network(building, timestep))
+        self._entries[key] = network
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return network
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def building_content_hash(building: Building) -> str:
+    """Hash of a building's thermal content, ignoring names and identifiers."""
+    columns = BuildingColumns.from_buildings([building])
+    digest = hashlib.sha256()
+    for name, value in vars(columns).items():
+        if name.endswith("_ids"):
+            continue
+        digest.update(name.encode())
+        digest.update(value.tobytes())
+    return digest.hexdigest()
+
+
+def _lumpable_groups(network: RCNetwork) -> dict[tuple[int, bool], list[int]]:
+    # Mass nodes keyed by (zone, reaches outside)
+    zone_of_air_node = {node: zone for zone, node in enumerate(network.zone_nodes)}
+    links: dict[int, list[int]] = {}
+    for row, column in network.conductances.pattern():
+        links.setdefault(row, []).append(column)
+        links.setdefault(column, []).append(row)
+    groups: dict[tuple[int, bool], list[int]] = {}
+    for node in range(network.node_count):
+        linked = links.get(node, [])
+        if node in zone_of_air_node or len(linked) != 1:
+            continue
+        zone = zone_of_air_node.get(linked[0])
+        if zone is None:
+            continue
+        outside = network.external_conductances[node] > 0
+        groups.setdefault((zone, outside), []).append(node)
+    return groups
+
+
+def _time_constant(network: RCNetwork, node: int) -> float:
+    conductance = network.conductances.diagonal[node] + (
+        network.external_conductances[node]
+    )
+    return network.capacities[node] / conductance
+
+
+def _clusters(network: RCNetwork, nodes: list[int], count: int) -> list[list[int]]:
+    # Split the nodes, sorted by time constant, at the count - 1 widest gaps
+    # between consecutive log time constants
+    ordered = sorted(nodes, key=lambda node: _time_constant(network, node))
+    if count >= len(ordered):
+        return [[node] for node in ordered]
+    logs = [math.log(_time_constant(network, node)) for node in ordered]
+    gaps = sorted(
+        range(1, len(ordered)), key=lambda i: logs[i] - logs[i - 1], reverse=True
+    )
+    cuts = sorted(gaps[: count - 1])
+    bounds = [0, *cuts, len(ordered)]
+    return [ordered[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+
+def _lump(
+    network: RCNetwork, groups: dict[tuple[int, bool], list[int]], count: int
+) -> RCNetwork:
+    lumped = {node for nodes in groups.values() for node in nodes}
+    kept = [node for node in range(network.node_count) if node not in lumped]
+    new_index = {node: index for index, node in enumerate(kept)}
+
+    capacities = array("d", (network.capacities[node] for node in kept))
+    external = array("d", (network.external_conductances[node] for node in kept))
+    merged_nodes: list[tuple[int, list[int]]] = []
+    for (zone, _), nodes in groups.items():
+        for cluster in _clusters(network, nodes, count):
+            merged_nodes.append((network.zone_nodes[zone], cluster))
+
+    conductances = SparseSymmetricMatrix(len(kept) + len(merged_nodes))
+    for (row, column), value in network.conductances.off_diagonal.items():
+        if row in new_index and column in new_index:
+            conductances.add_conductance(new_index[row], new_index[column], -value)
+    for air_node, cluster in merged_nodes:
+        index = len(capacities)
+        capacities.append(sum(network.capacities[node] for node in cluster))
+        external.append(sum(network.external_conductances[node] for node in cluster))
+        conductances.add_conductance(
+            new_index[air_node],
+            index,
+            sum(network.conductances.diagonal[node] for node in cluster),
+        )
+    return RCNetwork(
+        capacities=capacities,
+        external_conductances=external,
+        conductances=conductances,
+        zone_nodes=[new_index[node] for node in network.zone_nodes],
+        timestep=network.timestep,
+    )
+
+
+def _max_deviation(reference: list[array], candidate: list[array]) -> float:
+    return max(
+        (
+            abs(expected - actual)
+            for expected_zone, actual_zone in zip(reference, candidate)
+            for expected, actual in zip(expected_zone, actual_zone)
+        ),
+        default=0.0,
+    )
@@ -0,0 +1,244 @@
+from array import array
+from collections.abc import Sequence
+
+from domain.building.columns import BOUNDARY_TYPE_CODES, BuildingColumns
+from domain.building.constants import (
+    AIR_DENSITY_KG_PER_M3,
+    AIR_SPECIFIC_HEAT_CAPACITY_J_PER_KG_K,
+    PITCH_LIMIT_HORIZ_CEILING,
+    PITCH_LIMIT_HORIZ_FLOOR,
+    R_CURTAINS_BLINDS,
+    R_SE,
+    R_SI_DOWNWARDS,
+    R_SI_HORIZONTAL,
+    R_SI_UPWARDS,
+)
+from domain.building.enums import ThermalBoundaryType
+from domain.building.services import GroundHeatTransferService
+from domain.building.value_objects import SoilProperties
+from domain.building.value_objects.junction_catalogue import (
+    DEFAULT_JUNCTION_CATALOGUE,
+    JunctionCatalogue,
+)
+from domain.building.value_objects.soil_properties import DEFAULT_SOIL_PROPERTIES
+
+_GROUND_CONTACT = BOUNDARY_TYPE_CODES[ThermalBoundaryType.GROUND_CONTACT]
+_INTERNAL_PARTITION = BOUNDARY_TYPE_CODES[ThermalBoundaryType.INTERNAL_PARTITION]
+_EXTERNAL_GLAZING = BOUNDARY_TYPE_CODES[ThermalBoundaryType.EXTERNAL_GLAZING]
+
+# Ventilation conductance per (1/h x m³), matching Zone's ventilation calculation
+_VENTILATION_FACTOR = (
+    AIR_DENSITY_KG_PER_M3 * AIR_SPECIFIC_HEAT_CAPACITY_J_PER_KG_K / 3600 / 3600
+)
+
+
+class BatchThermalCalculationService:
+    """Domain service for thermal calculations over many buildings at once.
+
+    Works on BuildingColumns instead of entities, producing the same results
+    as the per-object calculations on Building, Zone and BuildingElement
+    without allocating a value object per element.
+
+    Attributes:
+        junction_catalogue: Catalogue giving the psi-value of each junction type
+        ground_heat_transfer_service: Ground model for floors with an exposed
+            perimeter
+    """
+
+    def __init__(
+        self,
+        junction_catalogue: JunctionCatalogue = DEFAULT_JUNCTION_CATALOGUE,
+        soil_properties: SoilProperties = DEFAULT_SOIL_PROPERTIES,
+    ) -> None:
+        self.junction_catalogue = junction_catalogue
+        self.ground_heat_transfer_service = GroundHeatTransferService(soil_properties)
+        self._psi_table = junction_catalogue.psi_table()
+
+    def calculate_u_values(self, columns: BuildingColumns) -> array:
+        """Calculate the U-value of every building element.
+
+        Returns:
+            U-values in W/m²·K, one per element
+        """
+        return self.calculate_u_values_from_arrays(
+            boundary_types=columns.element_boundary_type,
+            thermal_resistances=columns.element_thermal_resistance,
+            pitches=columns.element_pitch,
+            areas=columns.element_area,
+            exposed_perimeters=columns.element_exposed_perimeter,
+        )
+
+    def calculate_u_values_from_arrays(
+        self,
+        boundary_types: Sequence[int],
+        thermal_resistances: Sequence[float],
+        pitches: Sequence[float],
+        areas: Sequence[float] | None = None,
+        exposed_perimeters: Sequence[float] | None = None,
+    ) -> array:
+        """Calculate U-values from parallel element arrays.
+
+        Ground contact elements with a positive exposed perimeter use the
+        ground model; other ground contact elements take their construction
+        resistance as U-value, as ThermalCalculationService does.
+
+        Args:
+            boundary_types: Thermal boundary type code of each element
+            thermal_resistances: Construction resistance of each element in m²·K/W
+            pitches: Pitch of each element in degrees
+            areas: Area of each element in m², needed with exposed_perimeters
+            exposed_perimeters: Exposed perimeter of each ground floor in m
+
+        Returns:
+            U-values in W/m²·K, one per element
+        """
+        u_values = array("d", bytes(8 * len(boundary_types)))
+        ground_floors = []
+        for index, boundary_type in enumerate(boundary_types):
+            resistance = thermal_resistances[index]
+            if boundary_type == _GROUND_CONTACT:
+                if exposed_perimeters is not None and exposed_perimeters[index] > 0:
+                    ground_floors.append(index)
+                else:
+                    u_values[index] = resistance
+                continue
+            if boundary_type == _INTERNAL_PARTITION:
+                continue
+
+            pitch = pitches[index]
+            if PITCH_LIMIT_HORIZ_CEILING <= pitch <= PITCH_LIMIT_HORIZ_FLOOR:
+                resistance += R_SI_HORIZONTAL
+            elif pitch < PITCH_LIMIT_HORIZ_CEILING:
+                resistance += R_SI_UPWARDS
+            else:
+                resistance += R_SI_DOWNWARDS
+            resistance += R_SE
+            if boundary_type == _EXTERNAL_GLAZING:
+                resistance += R_CURTAINS_BLINDS
+            u_values[index] = 1.0 / resistance
+
+        if ground_floors:
+            if areas is None or exposed_perimeters is None:
+                raise ValueError("Ground floor U-values need element areas")
+            ground_service = self.ground_heat_transfer_service
+            ground_u_values = (
+                ground_service.calculate_ground_floor_u_values_from_arrays(
+                    areas=[areas[i] for i in ground_floors],
+                    exposed_perimeters=[exposed_perimeters[i] for i in ground_floors],
+                    floor_resistances=[thermal_resistances[i] for i in ground_floors],
+                )
+            )
+            for index, u_value in zip(ground_floors, ground_u_values):
+                u_values[index] = u_value
+        return u_values
+
+    def calculate_ventilation_heat_transfer_coefficient(
+        self, air_change_rate: float, volume: float
+    ) -> float:
+        """Calculate the ventilation HTC in W/K of a zone, as Zone does.
+
+        Args:
+            air_change_rate: Air change rate in 1/h
+            volume: Zone volume in m³
+        """
+        return air_change_rate * volume * _VENTILATION_FACTOR
+
+    def calculate_junction_heat_transfer_coefficients(
+        self, columns: BuildingColumns
+    ) -> array:
+        """Calculate the psi-value * length sum of the junctions of every zone.
+
+        Psi-values are looked up once per junction type in a table indexed by
+        junction type code.
+
+        Returns:
+            Junction heat transfer coefficients in W/K, one per zone
+        """
+        psi_table = self._psi_table
+        junction_htc = array("d", bytes(8 * columns.zone_count))
+        junction_type = columns.junction_type
+        junction_length = columns.junction_length
+        for junction, zone in enumerate(columns.junction_zone):
+            junction_htc[zone] += (
+                psi_table[junction_type[junction]] * junction_length[junction]
+            )
+        return junction_htc
+
+    def calculate_zone_heat_transfer_coefficients(
+        self, columns: BuildingColumns
+    ) -> array:
+        """Calculate the total HTC (fabric, ventilation and bridges) of every zone.
+
+        Returns:
+            Zone heat transfer coefficients in W/K, one per zone
+        """
+        zone_htc = self.calculate_junction_heat_transfer_coefficients(columns)
+        for zone, air_change_rate in enumerate(columns.zone_air_change_rate):
+            zone_htc[zone] += (
+                self.calculate_ventilation_heat_transfer_coefficient(
+                    air_change_rate, columns.zone_volume[zone]
+                )
+                + columns.zone_thermal_bridges[zone]
+            )
+
+        u_values = self.calculate_u_values(columns)
+        element_area = columns.element_area
+        for element, zone in enumerate(columns.element_zone):
+            zone_htc[zone] += element_area[element] * u_values[element]
+        return zone_htc
+
+    def calculate_heat_transfer_coefficients(self, columns: BuildingColumns) -> array:
+        """Calculate the total Heat Transfer Coefficient (HTC) of every building.
+
+        Returns:
+            Heat transfer coefficients in W/K, one per building
+        """
+        zone_htc = self.calculate_zone_heat_transfer_coefficients(columns)
+        return self._sum_zones_by_building(columns, zone_htc)
+
+    def calculate_heat_loss_parameters(self, columns: BuildingColumns) -> array:
+        """Calculate the Heat Loss Parameter (HLP) of every building.
+
+        Returns:
+            Heat loss parameters in W/m²·K, one per building
+        """
+        htc = self.calculate_heat_transfer_coefficients(columns)
+        floor_area = self._sum_zones_by_building(columns, columns.zone_area)
+        for building, area in enumerate(floor_area):
+            htc[building] /= area
+        return htc
+
+    def calculate_design_heat_losses(
+        self, columns: BuildingColumns, design_temperature: float
+    ) -> array:
+        """Calculate the design heat loss of every building.
+
+        Matches DesignHeatLoadService: HTC multiplied by the difference between
+        the floor-area weighted setpoint and the design temperature.
+
+        Args:
+            columns: The buildings to calculate
+            design_temperature: External design temperature in °C
+
+        Returns:
+            Design heat losses in W, one per building
+        """
+        htc = self.calculate_heat_transfer_coefficients(columns)
+        weighted_setpoints = array("d", bytes(8 * columns.building_count))
+        for zone, building in enumerate(columns.zone_building):
+            weighted_setpoints[building] += (
+                columns.zone_setpoint[zone] * columns.zone_area[zone]
+            )
+        floor_area = self._sum_zones_by_building(columns, columns.zone_area)
+        for building, area in enumerate(floor_area):
+            setpoint = weighted_setpoints[building] / area
+            htc[building] = max(htc[building] * (setpoint - design_temperature), 0.0)
+        return htc
+
+    def _sum_zones_by_building(
+        self, columns: BuildingColumns, zone_values: Sequence[float]
+    ) -> array:
+        totals = array("d", bytes(8 * columns.building_count))
+        for zone, building in enumerate(columns.zone_building):
+            totals[building] += zone_values[zone]
+        return totals
@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING
+
+from domain.energy.value_objects import Power
+from domain.shared.value_objects import Temperature
+
+if TYPE_CHECKING:
+    from domain.building.aggregates.building import Building
+
+
+class DesignHeatLoadService:
+    """Domain service for design heat load calculations.
+
+    The design heat load is the steady-state heat loss of a building when the
+    outside air is at the regional design temperature:
+
+        design heat loss = HTC * (setpoint - design temperature)
+    """
+
+    def calculate_design_setpoint(self, building: "Building") -> Temperature:
+        """Calculate the floor-area weighted setpoint of a building.
+
+        Args:
+            building: The building to calculate the setpoint for
+
+        Returns:
+            The area-weighted mean zone setpoint as Temperature value object
+        """
+        weighted_setpoint = sum(
+            zone.temperature_setpoint.celsius * zone.area.square_metres
+            for zone in building.zones
+        )
+        return Temperature(
+            celsius=weighted_setpoint / building.total_floor_area.square_metres
+        )
+
+    def calculate_design_heat_loss(
+        self, building: "Building", design_temperature: Temperature
+    ) -> Power:
+        """Calculate the design heat loss of a building.
+
+        Args:
+            building: The building to calculate the design heat loss for
+            design_temperature: The regional external design temperature
+
+        Returns:
+            The design heat loss in W as Power value object. Buildings whose
+            setpoint is below the design temperature have no heat loss.
+        """
+        heat_transfer_coefficient = (
+            building.calculate_total_heat_transfer_coefficient().w_per_k
+        )
+        setpoint = self.calculate_design_setpoint(building)
+        temperature_difference = setpoint.celsius - design_temperature.celsius
+        return Power(watts=max(heat_transfer_coefficient * temperature_difference, 0.0))
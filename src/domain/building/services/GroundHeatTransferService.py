@@ -0,0 +1,269 @@
+import math
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+
+from domain.building.columns import BOUNDARY_TYPE_CODES, BuildingColumns
+from domain.building.constants import (
+    GROUND_FLOOR_WALL_THICKNESS_M,
+    R_SE,
+    R_SI_DOWNWARDS,
+)
+from domain.building.enums import ThermalBoundaryType
+from domain.building.value_objects import Area, SoilProperties, ThermalConductance
+from domain.building.value_objects.soil_properties import DEFAULT_SOIL_PROPERTIES
+from domain.climate.value_objects import AnnualTemperatureCycle
+from domain.shared.value_objects import (
+    Length,
+    Temperature,
+    ThermalResistance,
+    ThermalTransmittance,
+)
+
+_GROUND_CONTACT = BOUNDARY_TYPE_CODES[ThermalBoundaryType.GROUND_CONTACT]
+
+
+class GroundHeatTransferService:
+    """Domain service for slab-on-ground floor heat transfer.
+
+    Follows BS EN ISO 13370: the steady-state U-value comes from the floor's
+    characteristic dimension B' = A / (0.5·P) and equivalent thickness, and
+    the annual cycle of heat flow from a periodic heat transfer coefficient
+    with a phase lag behind the external temperature.
+
+    Attributes:
+        soil_properties: Properties of the ground under the floors
+    """
+
+    def __init__(
+        self, soil_properties: SoilProperties = DEFAULT_SOIL_PROPERTIES
+    ) -> None:
+        self.soil_properties = soil_properties
+        self._conductivity = soil_properties.thermal_conductivity.w_per_m_k
+        self._penetration_depth = soil_properties.periodic_penetration_depth.meters
+
+    def calculate_characteristic_dimension(
+        self, area: Area, exposed_perimeter: Length
+    ) -> Length:
+        """Calculate the characteristic dimension B' of a floor.
+
+        Args:
+            area: Floor area
+            exposed_perimeter: Length of the floor edge next to the outside
+
+        Returns:
+            B' = A / (0.5·P) as Length value object
+        """
+        return Length(meters=area.square_metres / (0.5 * exposed_perimeter.meters))
+
+    def calculate_ground_floor_u_value(
+        self,
+        area: Area,
+        exposed_perimeter: Length,
+        floor_resistance: ThermalResistance,
+    ) -> ThermalTransmittance:
+        """Calculate the steady-state U-value of a slab-on-ground floor.
+
+        Args:
+            area: Floor area
+            exposed_perimeter: Length of the floor edge next to the outside
+            floor_resistance: Thermal resistance of the floor construction
+
+        Returns:
+            The U-value in W/m²·K as ThermalTransmittance value object
+        """
+        return ThermalTransmittance(
+            w_per_m2_k=self._u_value(
+                area.square_metres,
+                exposed_perimeter.meters,
+                floor_resistance.m2_k_per_w,
+            )
+        )
+
+    def calculate_ground_floor_u_values_from_arrays(
+        self,
+        areas: Sequence[float],
+        exposed_perimeters: Sequence[float],
+        floor_resistances: Sequence[float],
+    ) -> array:
+        """Calculate steady-state U-values of many floors from parallel arrays.
+
+        Args:
+            areas: Floor areas in m²
+            exposed_perimeters: Exposed perimeters in m, all positive
+            floor_resistances: Floor construction resistances in m²·K/W
+
+        Returns:
+            U-values in W/m²·K, one per floor
+        """
+        u_value = self._u_value
+        return array(
+            "d",
+            (
+                u_value(area, exposed_perimeters[index], floor_resistances[index])
+                for index, area in enumerate(areas)
+            ),
+        )
+
+    def calculate_periodic_heat_transfer_coefficient(
+        self, exposed_perimeter: Length, floor_resistance: ThermalResistance
+    ) -> ThermalConductance:
+        """Calculate the external periodic heat transfer coefficient of a floor.
+
+        Args:
+            exposed_perimeter: Length of the floor edge next to the outside
+            floor_resistance: Thermal resistance of the floor construction
+
+        Returns:
+            H_pe = 0.37·P·λ·ln(δ/d_t + 1) in W/K as ThermalConductance value object
+        """
+        return ThermalConductance(
+            w_per_k=self._periodic_coefficient(
+                exposed_perimeter.meters, floor_resistance.m2_k_per_w
+            )
+        )
+
+    def calculate_ground_temperature_profile(
+        self, temperature_cycle: AnnualTemperatureCycle, depth: Length
+    ) -> tuple[Temperature, ...]:
+        """Monthly mean undisturbed ground temperatures at a depth.
+
+        The annual external cycle is damped by exp(-z/δ) and delayed by z/δ
+        radians at depth z. Profiles are cached per location, soil and depth.
+
+        Args:
+            temperature_cycle: Annual external temperature cycle of the location
+            depth: Depth below the ground surface
+
+        Returns:
+            Twelve monthly temperatures, January first
+        """
+        return tuple(
+            Temperature(celsius=celsius)
+            for celsius in _ground_temperature_profile(
+                temperature_cycle, self.soil_properties, depth.meters
+            )
+        )
+
+    def calculate_monthly_ground_heat_losses(
+        self,
+        columns: BuildingColumns,
+        temperature_cycle: AnnualTemperatureCycle,
+    ) -> list[array]:
+        """Calculate monthly mean ground floor heat losses of every building.
+
+        Covers ground contact elements with an exposed perimeter, each held at
+        its zone's setpoint. The loss of month m is
+        H_g·(θ_i - θ_e,mean) + H_pe·θ̂_e·cos(2π(m - τ - β)/12), with τ the
+        coldest month and β the floor's phase lag in months.
+
+        Args:
+            columns: The buildings to calculate
+            temperature_cycle: Annual external temperature cycle of the location
+
+        Returns:
+            Twelve arrays, January first, of heat losses in W per building
+        """
+        cosines, sines = _external_cycle_components(temperature_cycle)
+        annual_mean = temperature_cycle.annual_mean.celsius
+        losses = [array("d", bytes(8 * columns.building_count)) for _ in range(12)]
+
+        perimeters = columns.element_exposed_perimeter
+        for element, boundary_type in enumerate(columns.element_boundary_type):
+            perimeter = perimeters[element]
+            if boundary_type != _GROUND_CONTACT or perimeter <= 0:
+                continue
+            area = columns.element_area[element]
+            resistance = columns.element_thermal_resistance[element]
+            zone = columns.element_zone[element]
+            building = columns.zone_building[zone]
+
+            steady = (
+                area
+                * self._u_value(area, perimeter, resistance)
+                * (columns.zone_setpoint[zone] - annual_mean)
+            )
+            periodic = self._periodic_coefficient(perimeter, resistance)
+            lag = 2 * math.pi * self._phase_lag(resistance) / 12
+            cos_lag = periodic * math.cos(lag)
+            sin_lag = periodic * math.sin(lag)
+            for month in range(12):
+                losses[month][building] += (
+                    steady + cosines[month] * cos_lag + sines[month] * sin_lag
+                )
+        return losses
+
+    def _equivalent_thickness(self, floor_resistance: float) -> float:
+        return GROUND_FLOOR_WALL_THICKNESS_M + self._conductivity * (
+            R_SI_DOWNWARDS + floor_resistance + R_SE
+        )
+
+    def _u_value(
+        self, area: float, exposed_perimeter: float, floor_resistance: float
+    ) -> float:
+        conductivity = self._conductivity
+        characteristic_dimension = area / (0.5 * exposed_perimeter)
+        thickness = self._equivalent_thickness(floor_resistance)
+        if thickness < characteristic_dimension:
+            # Uninsulated and moderately insulated floors
+            return (
+                2
+                * conductivity
+                / (math.pi * characteristic_dimension + thickness)
+                * math.log(math.pi * characteristic_dimension / thickness + 1)
+            )
+        # Well-insulated floors
+        return conductivity / (0.457 * characteristic_dimension + thickness)
+
+    def _periodic_coefficient(
+        self, exposed_perimeter: float, floor_resistance: float
+    ) -> float:
+        thickness = self._equivalent_thickness(floor_resistance)
+        return (
+            0.37
+            * exposed_perimeter
+            * self._conductivity
+            * math.log(self._penetration_depth / thickness + 1)
+        )
+
+    def _phase_lag(self, floor_resistance: float) -> float:
+        thickness = self._equivalent_thickness(floor_resistance)
+        # ISO 13370 periodic method: β = 1.5 - 0.42·ln(δ / (d_t + 1)) months
+        return max(
+            1.5 - 0.42 * math.log(self._penetration_depth / (thickness + 1)), 0.0
+        )
+
+
+@lru_cache(maxsize=64)
+def _external_cycle_components(
+    temperature_cycle: AnnualTemperatureCycle,
+) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    # θ̂·cos and θ̂·sin of each month's phase, so a floor's phase lag β only
+    # needs cos(β) and sin(β): cos(x - β) = cos x·cos β + sin x·sin β
+    amplitude = temperature_cycle.amplitude_k
+    phases = [
+        2 * math.pi * (month - temperature_cycle.coldest_month) / 12
+        for month in range(1, 13)
+    ]
+    return (
+        tuple(amplitude * math.cos(phase) for phase in phases),
+        tuple(amplitude * math.sin(phase) for phase in phases),
+    )
+
+
+@lru_cache(maxsize=256)
+def _ground_temperature_profile(
+    temperature_cycle: AnnualTemperatureCycle,
+    soil_properties: SoilProperties,
+    depth_m: float,
+) -> tuple[float, ...]:
+    damping = depth_m / soil_properties.periodic_penetration_depth.meters
+    amplitude = temperature_cycle.amplitude_k * math.exp(-damping)
+    return tuple(
+        temperature_cycle.annual_mean.celsius
+        - amplitude
+        * math.cos(
+            2 * math.pi * (month - temperature_cycle.coldest_month) / 12 - damping
+        )
+        for month in range(1, 13)
+    )
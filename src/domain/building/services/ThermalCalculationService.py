@@ -8,8 +8,13 @@ from domain.building.constants import (
     R_SI_UPWARDS,
 )
 from domain.building.enums import ThermalBoundaryType
-from domain.building.value_objects import Pitch
-from domain.shared.value_objects import ThermalResistance, ThermalTransmittance
+from domain.building.services import GroundHeatTransferService
+from domain.building.value_objects import Area, Pitch, ThermalConductance
+from domain.shared.value_objects import (
+    Length,
+    ThermalResistance,
+    ThermalTransmittance,
+)
 
 
 class ThermalCalculationService:
@@ -36,11 +41,33 @@ class ThermalCalculationService:
 
         return ThermalResistance(m2_k_per_w=resistance_value)
 
+    def calculate_internal_element_conductance(
+        self, area: Area, construction_resistance: ThermalResistance, pitch: Pitch
+    ) -> ThermalConductance:
+        """Calculate the conductance between the zones either side of an element.
+
+        Both faces are internal, so the internal surface resistance applies
+        on each side.
+
+        Args:
+            area: The area of the building element
+            construction_resistance: The thermal resistance of the construction
+            pitch: The pitch of the building element
+
+        Returns:
+            The zone-to-zone conductance in W/K as ThermalConductance value object
+        """
+        r_si = self.calculate_internal_surface_resistance(pitch=pitch)
+        total_resistance = construction_resistance.m2_k_per_w + 2 * r_si.m2_k_per_w
+        return ThermalConductance(w_per_k=area.square_metres / total_resistance)
+
     def calculate_u_value(
         self,
         construction_resistance: ThermalResistance,
         pitch: Pitch,
         thermal_boundary_type: ThermalBoundaryType,
+        area: Area | None = None,
+        exposed_perimeter: Length | None = None,
     ) -> ThermalTransmittance:
         """Calculate the u-value of a building element, including the internal surface resistance.
 
@@ -48,11 +75,20 @@ class ThermalCalculationService:
             construction_resistance: The thermal resistance of the construction
             pitch: The pitch of the building element
             thermal_boundary_type: The thermal boundary type of the building element
+            area: The area of the building element, used for ground floors
+            exposed_perimeter: The exposed perimeter of a ground floor; without it
+                a ground contact element's U-value is its construction resistance
 
         Returns:
             The u-value of the building element in W/m²·K as ThermalTransmittance value object
         """
         if thermal_boundary_type == ThermalBoundaryType.GROUND_CONTACT:
+            if area is not None and exposed_perimeter is not None:
+                return GroundHeatTransferService().calculate_ground_floor_u_value(
+                    area=area,
+                    exposed_perimeter=exposed_perimeter,
+                    floor_resistance=construction_resistance,
+                )
             return ThermalTransmittance(w_per_m2_k=construction_resistance.m2_k_per_w)
 
         if thermal_boundary_type == ThermalBoundaryType.INTERNAL_PARTITION:
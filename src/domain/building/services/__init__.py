@@ -1,3 +1,26 @@
-from .ThermalCalculationService import ThermalCalculationService
+from typing import TYPE_CHECKING
 
-__all__ = ["ThermalCalculationService"]
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .BatchThermalCalculationService import BatchThermalCalculationService
+    from .DesignHeatLoadService import DesignHeatLoadService
+    from .GroundHeatTransferService import GroundHeatTransferService
+    from .ThermalCalculationService import ThermalCalculationService
+
+__all__ = [
+    "BatchThermalCalculationService",
+    "DesignHeatLoadService",
+    "GroundHeatTransferService",
+    "ThermalCalculationService",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BatchThermalCalculationService": ".BatchThermalCalculationService",
+        "DesignHeatLoadService": ".DesignHeatLoadService",
+        "GroundHeatTransferService": ".GroundHeatTransferService",
+        "ThermalCalculationService": ".ThermalCalculationService",
+    },
+)
@@ -1,19 +1,50 @@
-from .air_change_rate import AirChangeRate
-from .area import Area
-from .areal_heat_capacity import ArealHeatCapacity
-from .linear_thermal_transmittance import LinearThermalTransmittance
-from .orientation import Orientation
-from .pitch import Pitch
-from .thermal_conductance import ThermalConductance
-from .volume import Volume
+from typing import TYPE_CHECKING
+
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .air_change_rate import AirChangeRate
+    from .area import Area
+    from .areal_heat_capacity import ArealHeatCapacity
+    from .junction_catalogue import JunctionCatalogue
+    from .linear_thermal_transmittance import LinearThermalTransmittance
+    from .orientation import Orientation
+    from .pitch import Pitch
+    from .soil_properties import SoilProperties
+    from .thermal_bridge_junction import ThermalBridgeJunction
+    from .thermal_conductance import ThermalConductance
+    from .volume import Volume
+    from .zone_coupling import ZoneCoupling
 
 __all__ = [
+    "AirChangeRate",
     "Area",
     "ArealHeatCapacity",
-    "Pitch",
+    "JunctionCatalogue",
+    "LinearThermalTransmittance",
     "Orientation",
+    "Pitch",
+    "SoilProperties",
+    "ThermalBridgeJunction",
     "ThermalConductance",
-    "AirChangeRate",
     "Volume",
-    "LinearThermalTransmittance",
+    "ZoneCoupling",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AirChangeRate": ".air_change_rate",
+        "Area": ".area",
+        "ArealHeatCapacity": ".areal_heat_capacity",
+        "JunctionCatalogue": ".junction_catalogue",
+        "LinearThermalTransmittance": ".linear_thermal_transmittance",
+        "Orientation": ".orientation",
+        "Pitch": ".pitch",
+        "SoilProperties": ".soil_properties",
+        "ThermalBridgeJunction": ".thermal_bridge_junction",
+        "ThermalConductance": ".thermal_conductance",
+        "Volume": ".volume",
+        "ZoneCoupling": ".zone_coupling",
+    },
+)
@@ -0,0 +1,90 @@
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from domain.building.enums import JunctionType
+from domain.building.value_objects.linear_thermal_transmittance import (
+    LinearThermalTransmittance,
+)
+
+# Default psi-values in W/m·K from SAP 10.2 Appendix K, Table K1
+DEFAULT_PSI_VALUES_W_PER_M_K: dict[JunctionType, float] = {
+    JunctionType.STEEL_LINTEL: 1.00,
+    JunctionType.OTHER_LINTEL: 0.50,
+    JunctionType.SILL: 0.50,
+    JunctionType.JAMB: 0.50,
+    JunctionType.GROUND_FLOOR: 0.32,
+    JunctionType.INTERMEDIATE_FLOOR: 0.14,
+    JunctionType.PARTY_FLOOR: 0.14,
+    JunctionType.BALCONY_WITHIN_DWELLING: 1.00,
+    JunctionType.BALCONY_BETWEEN_DWELLINGS: 0.14,
+    JunctionType.EAVES_INSULATION_AT_CEILING: 0.12,
+    JunctionType.EAVES_INSULATION_AT_RAFTERS: 0.24,
+    JunctionType.GABLE_INSULATION_AT_CEILING: 0.48,
+    JunctionType.GABLE_INSULATION_AT_RAFTERS: 0.16,
+    JunctionType.FLAT_ROOF: 0.08,
+    JunctionType.FLAT_ROOF_WITH_PARAPET: 0.56,
+    JunctionType.CORNER: 0.18,
+    JunctionType.PARTY_WALL_BETWEEN_DWELLINGS: 0.12,
+    JunctionType.PARTY_WALL_GROUND_FLOOR: 0.16,
+    JunctionType.PARTY_WALL_INTERMEDIATE_FLOOR_WITHIN_DWELLING: 0.00,
+    JunctionType.PARTY_WALL_INTERMEDIATE_FLOOR_BETWEEN_DWELLINGS: 0.00,
+    JunctionType.PARTY_WALL_ROOF_INSULATION_AT_CEILING: 0.24,
+    JunctionType.PARTY_WALL_ROOF_INSULATION_AT_RAFTERS: 0.16,
+}
+
+JUNCTION_TYPES: tuple[JunctionType, ...] = tuple(JunctionType)
+JUNCTION_TYPE_CODES: dict[JunctionType, int] = {
+    junction_type: code for code, junction_type in enumerate(JUNCTION_TYPES)
+}
+
+
+@dataclass(frozen=True)
+class JunctionCatalogue:
+    """Catalogue of psi-values per junction type.
+
+    Junction types missing from the given psi-values fall back to the SAP
+    defaults, so a catalogue only needs the project-specific overrides.
+
+    Attributes:
+        psi_values: Linear thermal transmittance per junction type
+    """
+
+    psi_values: Mapping[JunctionType, LinearThermalTransmittance] = field(
+        default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        for junction_type, psi_value in self.psi_values.items():
+            if not isinstance(junction_type, JunctionType):
+                raise ValueError("Junction catalogue keys must be JunctionTypes")
+            if not isinstance(psi_value, LinearThermalTransmittance):
+                raise ValueError(
+                    "Junction catalogue values must be LinearThermalTransmittances"
+                )
+
+    def psi_value(self, junction_type: JunctionType) -> LinearThermalTransmittance:
+        """Psi-value of a junction type."""
+        psi_value = self.psi_values.get(junction_type)
+        if psi_value is None:
+            return LinearThermalTransmittance(
+                w_per_m_k=DEFAULT_PSI_VALUES_W_PER_M_K[junction_type]
+            )
+        return psi_value
+
+    def psi_table(self) -> array:
+        """Psi-values in W/m·K indexed by junction type code."""
+        return array(
+            "d",
+            (
+                self.psi_value(junction_type).w_per_m_k
+                for junction_type in JUNCTION_TYPES
+            ),
+        )
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return f"JunctionCatalogue(overrides={len(self.psi_values)})"
+
+
+DEFAULT_JUNCTION_CATALOGUE = JunctionCatalogue()
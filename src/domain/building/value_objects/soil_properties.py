@@ -0,0 +1,64 @@
+import math
+from dataclasses import dataclass
+
+from domain.shared.value_objects import (
+    Density,
+    Length,
+    SpecificHeatCapacity,
+    ThermalConductivity,
+)
+
+SECONDS_PER_YEAR = 3.15e7
+
+
+@dataclass(frozen=True)
+class SoilProperties:
+    """Soil properties value object for ground heat transfer.
+
+    Attributes:
+        thermal_conductivity: Thermal conductivity of the unfrozen ground in W/m·K
+        density: Density of the ground in kg/m³
+        specific_heat_capacity: Specific heat capacity of the ground in J/kg·K
+    """
+
+    thermal_conductivity: ThermalConductivity
+    density: Density
+    specific_heat_capacity: SpecificHeatCapacity
+
+    @property
+    def volumetric_heat_capacity(self) -> float:
+        """Heat capacity per volume in J/m³·K."""
+        return self.density.kg_per_m3 * self.specific_heat_capacity.j_per_kg_k
+
+    @property
+    def periodic_penetration_depth(self) -> Length:
+        """Depth at which the annual temperature cycle is damped by 1/e.
+
+        Follows ISO 13370: sqrt(λ·t / (π·ρ·c)) with t one year in seconds.
+        """
+        return Length(
+            meters=math.sqrt(
+                self.thermal_conductivity.w_per_m_k
+                * SECONDS_PER_YEAR
+                / (math.pi * self.volumetric_heat_capacity)
+            )
+        )
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return f"Soil ({self.thermal_conductivity}, {self.density})"
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"SoilProperties({self.thermal_conductivity.w_per_m_k}, "
+            f"{self.density.kg_per_m3}, {self.specific_heat_capacity.j_per_kg_k})"
+        )
+
+
+# ISO 13370 default for unknown soil: λ = 2.0 W/m·K, ρ·c = 2.0e6 J/m³·K
+DEFAULT_SOIL_PROPERTIES = SoilProperties(
+    thermal_conductivity=ThermalConductivity(w_per_m_k=2.0),
+    density=Density(kg_per_m3=2000.0),
+    specific_heat_capacity=SpecificHeatCapacity(j_per_kg_k=1000.0),
+)
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+
+from domain.building.enums import JunctionType
+from domain.shared.value_objects import Length
+
+
+@dataclass(frozen=True)
+class ThermalBridgeJunction:
+    """Thermal bridge junction value object.
+
+    Represents a run of a linear thermal bridge. Its heat transfer
+    coefficient is the junction length multiplied by the psi-value a
+    JunctionCatalogue gives for its junction type.
+
+    Attributes:
+        junction_type: Type of the junction
+        length: Length of the junction in meters
+    """
+
+    junction_type: JunctionType
+    length: Length
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.junction_type, JunctionType):
+            raise ValueError("Junction type must be a JunctionType")
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return f"{self.junction_type.value} ({self.length})"
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"ThermalBridgeJunction({self.junction_type.value}, "
+            f"{self.length.meters})"
+        )
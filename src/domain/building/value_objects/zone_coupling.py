@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from domain.building.value_objects.thermal_conductance import ThermalConductance
+
+
+@dataclass(frozen=True)
+class ZoneCoupling:
+    """Zone coupling value object.
+
+    Represents the heat transfer path between two zones, such as a partition
+    wall between rooms or a party wall between dwellings.
+
+    Attributes:
+        zone_id: Identifier of one zone
+        adjacent_zone_id: Identifier of the zone on the other side
+        conductance: Conductance between the two zones in W/K
+    """
+
+    zone_id: UUID
+    adjacent_zone_id: UUID
+    conductance: ThermalConductance
+
+    def __post_init__(self) -> None:
+        if self.zone_id == self.adjacent_zone_id:
+            raise ValueError("A zone cannot be coupled to itself")
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return f"{self.zone_id} ↔ {self.adjacent_zone_id} ({self.conductance})"
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"ZoneCoupling({self.zone_id}, {self.adjacent_zone_id}, "
+            f"{self.conductance.w_per_k})"
+        )
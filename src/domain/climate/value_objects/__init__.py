@@ -0,0 +1,35 @@
+from typing import TYPE_CHECKING
+
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .annual_temperature_cycle import AnnualTemperatureCycle
+    from .climate_region import ClimateRegion
+    from .humidity import Humidity
+    from .precipitation_rate import PrecipitationRate
+    from .solar_irradiance import SolarIrradiance
+    from .wind_direction import WindDirection
+    from .wind_speed import WindSpeed
+
+__all__ = [
+    "AnnualTemperatureCycle",
+    "ClimateRegion",
+    "Humidity",
+    "PrecipitationRate",
+    "SolarIrradiance",
+    "WindDirection",
+    "WindSpeed",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AnnualTemperatureCycle": ".annual_temperature_cycle",
+        "ClimateRegion": ".climate_region",
+        "Humidity": ".humidity",
+        "PrecipitationRate": ".precipitation_rate",
+        "SolarIrradiance": ".solar_irradiance",
+        "WindDirection": ".wind_direction",
+        "WindSpeed": ".wind_speed",
+    },
+)
@@ -0,0 +1,48 @@
+import math
+from dataclasses import dataclass
+
+from domain.shared.value_objects import Temperature
+
+
+@dataclass(frozen=True)
+class AnnualTemperatureCycle:
+    """Annual external air temperature cycle of a location.
+
+    Approximates monthly mean external temperatures as a cosine around the
+    annual mean, coldest in the given month.
+
+    Attributes:
+        annual_mean: Annual mean external temperature
+        amplitude_k: Amplitude of the monthly mean temperature variation in K
+        coldest_month: Month with the lowest mean temperature, 1 to 12
+    """
+
+    annual_mean: Temperature
+    amplitude_k: float
+    coldest_month: int = 1
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.amplitude_k, (int, float)):
+            raise ValueError("Temperature amplitude must be a number")
+        if self.amplitude_k < 0 or not math.isfinite(self.amplitude_k):
+            raise ValueError("Temperature amplitude must be finite and non-negative")
+        if not isinstance(self.coldest_month, int) or not 1 <= self.coldest_month <= 12:
+            raise ValueError("Coldest month must be an integer from 1 to 12")
+
+    def monthly_mean(self, month: int) -> Temperature:
+        """Mean external temperature of a month, 1 to 12."""
+        phase = 2 * math.pi * (month - self.coldest_month) / 12
+        return Temperature(
+            celsius=self.annual_mean.celsius - self.amplitude_k * math.cos(phase)
+        )
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return f"{self.annual_mean} ± {self.amplitude_k:.1f} K"
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"AnnualTemperatureCycle({self.annual_mean.celsius}, "
+            f"{self.amplitude_k}, {self.coldest_month})"
+        )
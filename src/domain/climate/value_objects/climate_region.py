@@ -0,0 +1,87 @@
+import math
+from array import array
+from dataclasses import dataclass
+
+from domain.climate.value_objects.annual_temperature_cycle import (
+    AnnualTemperatureCycle,
+)
+from domain.climate.value_objects.solar_irradiance import SolarIrradiance
+
+HOURS_PER_YEAR = 8760
+_HOURS_PER_MONTH = HOURS_PER_YEAR / 12
+
+
+@dataclass(frozen=True)
+class ClimateRegion:
+    """Synthetic hourly climate of a region for annual demand estimates.
+
+    External temperature follows the region's annual cycle, interpolated
+    smoothly between mid-month means, plus a daily swing peaking at 15:00.
+    Solar irradiance on glazing peaks six months after the coldest month and
+    follows a half-sine over the hours from 06:00 to 18:00.
+
+    Attributes:
+        name: Name of the region
+        temperature_cycle: Annual cycle of monthly mean external temperature
+        mean_solar_irradiance: Annual mean solar irradiance on glazing
+        solar_amplitude: Annual variation of daily solar irradiance as a
+            fraction of its mean, 0 to 1
+        daily_temperature_range_k: Difference between daily maximum and
+            minimum external temperature in K
+    """
+
+    name: str
+    temperature_cycle: AnnualTemperatureCycle
+    mean_solar_irradiance: SolarIrradiance
+    solar_amplitude: float = 0.6
+    daily_temperature_range_k: float = 8.0
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            raise ValueError("Climate region must have a name")
+        if not 0 <= self.solar_amplitude <= 1:
+            raise ValueError("Solar amplitude must be between 0 and 1")
+        if self.daily_temperature_range_k < 0:
+            raise ValueError("Daily temperature range must be non-negative")
+
+    def hourly_external_temperatures(self) -> array:
+        """External temperature in °C of every hour of the year."""
+        cycle = self.temperature_cycle
+        half_range = self.daily_temperature_range_k / 2
+        temperatures = array("d", bytes(8 * HOURS_PER_YEAR))
+        for hour in range(HOURS_PER_YEAR):
+            phase = 2 * math.pi * (self._month(hour) - cycle.coldest_month) / 12
+            temperatures[hour] = (
+                cycle.annual_mean.celsius
+                - cycle.amplitude_k * math.cos(phase)
+                + half_range * math.cos(2 * math.pi * (hour % 24 + 0.5 - 15) / 24)
+            )
+        return temperatures
+
+    def hourly_solar_irradiances(self) -> array:
+        """Solar irradiance on glazing in W/m² of every hour of the year."""
+        peak_month = self.temperature_cycle.coldest_month + 6
+        irradiances = array("d", bytes(8 * HOURS_PER_YEAR))
+        for hour in range(HOURS_PER_YEAR):
+            hour_of_day = hour % 24 + 0.5
+            if not 6 <= hour_of_day < 18:
+                continue
+            daily_mean = self.mean_solar_irradiance.w_per_m2 * (
+                1
+                + self.solar_amplitude
+                * math.cos(2 * math.pi * (self._month(hour) - peak_month) / 12)
+            )
+            # A half-sine over 12 of 24 hours averages 1/π of its peak
+            irradiances[hour] = (
+                math.pi * daily_mean * math.sin(math.pi * (hour_of_day - 6) / 12)
+            )
+        return irradiances
+
+    @staticmethod
+    def _month(hour: int) -> float:
+        # Fractional month number, equal to the month at mid-month
+        return 0.5 + (hour + 0.5) / _HOURS_PER_MONTH
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.name
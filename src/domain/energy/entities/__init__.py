@@ -0,0 +1,17 @@
+from typing import TYPE_CHECKING
+
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .energy_ledger import EnergyLedger
+
+__all__ = [
+    "EnergyLedger",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "EnergyLedger": ".energy_ledger",
+    },
+)
@@ -0,0 +1,152 @@
+from array import array
+from collections.abc import Sequence
+from uuid import UUID
+
+from domain.energy.enums import EndUse
+from domain.energy.value_objects import Energy, LedgerChannel
+from domain.simulation.entities.simulation_clock import SimulationClock
+from domain.simulation.enums import CalendarPeriod
+from domain.simulation.value_objects import CalendarIndex, TimeStepDuration
+
+
+class EnergyLedger:
+    """Streaming energy ledger entity.
+
+    Accumulates per-timestep power values into hourly, daily, monthly and
+    annual energy totals for a fixed set of channels (building, zone and end
+    use). Every rollup level is updated as each time step is recorded, so
+    time step values never need to be stored. Memory depends on the number of
+    channels and reporting periods, not on the number of time steps.
+
+    Ledgers built on the same calendar and channels can be merged, so partial
+    ledgers from parallel workers combine into one result.
+
+    Attributes:
+        calendar: Calendar index of the simulation timeline
+        timestep_duration: Duration of a single time step
+        channels: Channels recorded by the ledger, in recording order
+    """
+
+    def __init__(
+        self,
+        calendar: CalendarIndex,
+        timestep_duration: TimeStepDuration,
+        channels: Sequence[LedgerChannel],
+    ) -> None:
+        if not channels:
+            raise ValueError("Energy ledger needs at least one channel")
+        if len(set(channels)) != len(channels):
+            raise ValueError("Energy ledger channels must be unique")
+
+        self.calendar = calendar
+        self.timestep_duration = timestep_duration
+        self.channels = tuple(channels)
+        self._timestep_seconds = timestep_duration.duration.total_seconds()
+        self._totals = {
+            period: array("d", bytes(8 * calendar.period_count(period) * len(channels)))
+            for period in CalendarPeriod
+        }
+
+    @classmethod
+    def for_clock(
+        cls, clock: SimulationClock, channels: Sequence[LedgerChannel]
+    ) -> "EnergyLedger":
+        """Create an empty ledger covering the timeline of a simulation clock."""
+        return cls(
+            calendar=clock.calendar_index,
+            timestep_duration=clock.timestep_duration,
+            channels=channels,
+        )
+
+    def record(self, timestep: int, watts: Sequence[float]) -> None:
+        """Record one time step of mean power for every channel.
+
+        Args:
+            timestep: Index of the time step within the timeline
+            watts: Mean power in W over the time step, one value per channel
+
+        Raises:
+            ValueError: If the time step is outside the timeline, or a power
+                value is negative; energy totals are non-negative, so flows
+                in both directions, such as import and export, are recorded
+                on channels of their own
+        """
+        if not 0 <= timestep < self.calendar.timestep_count:
+            raise ValueError("Time step is outside the ledger timeline")
+        channel_count = len(self.channels)
+        if len(watts) != channel_count:
+            raise ValueError("Expected one power value per ledger channel")
+        if min(watts) < 0:
+            raise ValueError(
+                "Ledger power values must be non-negative; record opposite "
+                "flows such as export on a channel of their own"
+            )
+
+        seconds = self._timestep_seconds
+        for period in CalendarPeriod:
+            totals = self._totals[period]
+            offset = self.calendar.period_indices[period][timestep] * channel_count
+            for channel, power in enumerate(watts):
+                totals[offset + channel] += power * seconds
+
+    def merge(self, other: "EnergyLedger") -> None:
+        """Add the totals of another ledger into this one.
+
+        Args:
+            other: A ledger with the same channels and calendar
+        """
+        if other.channels != self.channels:
+            raise ValueError("Cannot merge ledgers with different channels")
+        if (
+            other.calendar.period_labels != self.calendar.period_labels
+            or other.timestep_duration != self.timestep_duration
+        ):
+            raise ValueError("Cannot merge ledgers with different calendars")
+
+        for period in CalendarPeriod:
+            totals = self._totals[period]
+            for index, joules in enumerate(other._totals[period]):
+                totals[index] += joules
+
+    def totals(
+        self,
+        period: CalendarPeriod,
+        building_id: UUID | None = None,
+        zone_id: UUID | None = None,
+        end_use: EndUse | None = None,
+    ) -> dict[str, Energy]:
+        """Energy totals per period, summed over the matching channels.
+
+        Args:
+            period: The calendar period to report
+            building_id: Only include channels of this building
+            zone_id: Only include channels of this zone
+            end_use: Only include channels of this end use
+
+        Returns:
+            Energy per period label, in timeline order
+        """
+        selected = [
+            index
+            for index, channel in enumerate(self.channels)
+            if (building_id is None or channel.building_id == building_id)
+            and (zone_id is None or channel.zone_id == zone_id)
+            and (end_use is None or channel.end_use == end_use)
+        ]
+        channel_count = len(self.channels)
+        totals = self._totals[period]
+        return {
+            label: Energy(
+                joules=sum(
+                    totals[period_index * channel_count + index] for index in selected
+                )
+            )
+            for period_index, label in enumerate(self.calendar.period_labels[period])
+        }
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"EnergyLedger(channels={len(self.channels)}, "
+            f"timesteps={self.calendar.timestep_count})"
+        )
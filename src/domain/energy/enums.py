@@ -0,0 +1,20 @@
+from enum import Enum
+
+
+class EndUse(Enum):
+    """End use enumeration.
+
+    These are the end uses that delivered energy is reported against.
+    """
+
+    SPACE_HEATING = "space_heating"
+    SPACE_COOLING = "space_cooling"
+    WATER_HEATING = "water_heating"
+    LIGHTING = "lighting"
+    APPLIANCES = "appliances"
+    COOKING = "cooking"
+    PUMPS_AND_FANS = "pumps_and_fans"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value.replace("_", " ").title()
@@ -1,5 +1,26 @@
-from .power import Power
+from typing import TYPE_CHECKING
+
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .efficiency import Efficiency
+    from .energy import Energy
+    from .ledger_channel import LedgerChannel
+    from .power import Power
 
 __all__ = [
+    "Efficiency",
+    "Energy",
+    "LedgerChannel",
     "Power",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Efficiency": ".efficiency",
+        "Energy": ".energy",
+        "LedgerChannel": ".ledger_channel",
+        "Power": ".power",
+    },
+)
@@ -20,6 +20,11 @@ class Energy:
         if self.joules < 0:
             raise ValueError("Energy must be non-negative")
 
+    @property
+    def kilowatt_hours(self) -> float:
+        """Convert to kWh."""
+        return self.joules / 3600000
+
     def __str__(self) -> str:
         """String representation for display."""
         return f"{self.joules:.2f} J"
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from domain.energy.enums import EndUse
+
+
+@dataclass(frozen=True)
+class LedgerChannel:
+    """Ledger channel value object.
+
+    Identifies one stream of power values recorded into an energy ledger.
+    A channel belongs to a building and end use, and optionally to a zone
+    when the end use is metered per zone.
+
+    Attributes:
+        building_id: Identifier of the building the channel belongs to
+        end_use: End use the energy is delivered for
+        zone_id: Identifier of the zone, or None for building-level channels
+    """
+
+    building_id: UUID
+    end_use: EndUse
+    zone_id: UUID | None = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.building_id, UUID):
+            raise ValueError("Building id must be a UUID")
+        if not isinstance(self.end_use, EndUse):
+            raise ValueError("End use must be an EndUse")
+        if self.zone_id is not None and not isinstance(self.zone_id, UUID):
+            raise ValueError("Zone id must be a UUID or None")
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        zone = f"/{self.zone_id}" if self.zone_id is not None else ""
+        return f"{self.building_id}{zone} {self.end_use}"
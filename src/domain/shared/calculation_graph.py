@@ -0,0 +1,103 @@
+"""Lazy calculation graph with dependency-tracked invalidation.
+
+Quantities are nodes with declared inputs. A node is only evaluated when it
+is requested, its value is cached, and changing an input discards exactly the
+cached values downstream of it, so the next request recomputes only what the
+change affected.
+"""
+
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class _Node:
+    inputs: tuple[Hashable, ...]
+    function: Callable[..., Any]
+
+
+class CalculationGraph:
+    """Graph of inputs and derived nodes evaluated on demand.
+
+    Nodes can only depend on keys that already exist when they are added, so
+    the graph is acyclic by construction.
+
+    Attributes:
+        evaluation_counts: Number of times each node has been evaluated
+    """
+
+    def __init__(self) -> None:
+        self._inputs: dict[Hashable, Any] = {}
+        self._nodes: dict[Hashable, _Node] = {}
+        self._values: dict[Hashable, Any] = {}
+        self._dependents: dict[Hashable, list[Hashable]] = {}
+        self.evaluation_counts: dict[Hashable, int] = {}
+
+    def add_input(self, key: Hashable, value: Any) -> None:
+        """Add an input with its initial value."""
+        self._check_new(key)
+        self._inputs[key] = value
+        self._dependents[key] = []
+
+    def add_node(
+        self, key: Hashable, inputs: Sequence[Hashable], function: Callable[..., Any]
+    ) -> None:
+        """Add a derived node.
+
+        Args:
+            key: Key of the node
+            inputs: Keys of the inputs and nodes the node is calculated from
+            function: Called with the values of inputs, in order
+        """
+        self._check_new(key)
+        for input_key in inputs:
+            if input_key not in self._dependents:
+                raise KeyError(f"Unknown calculation graph input {input_key!r}")
+        self._nodes[key] = _Node(inputs=tuple(inputs), function=function)
+        self._dependents[key] = []
+        for input_key in inputs:
+            self._dependents[input_key].append(key)
+
+    def set_input(self, key: Hashable, value: Any) -> None:
+        """Change an input, invalidating every cached node downstream of it."""
+        if key not in self._inputs:
+            raise KeyError(f"Unknown calculation graph input {key!r}")
+        if self._inputs[key] == value:
+            return
+        self._inputs[key] = value
+
+        stale = list(self._dependents[key])
+        while stale:
+            node = stale.pop()
+            # Nodes downstream of an uncached node cannot be cached themselves
+            if self._values.pop(node, _MISSING) is not _MISSING:
+                stale.extend(self._dependents[node])
+
+    def get(self, key: Hashable) -> Any:
+        """Value of an input or node, evaluating the node if needed."""
+        if key in self._inputs:
+            return self._inputs[key]
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        try:
+            node = self._nodes[key]
+        except KeyError:
+            raise KeyError(f"Unknown calculation graph node {key!r}") from None
+        value = node.function(*(self.get(input_key) for input_key in node.inputs))
+        self._values[key] = value
+        self.evaluation_counts[key] = self.evaluation_counts.get(key, 0) + 1
+        return value
+
+    def is_cached(self, key: Hashable) -> bool:
+        """Whether a node currently holds a cached value."""
+        return key in self._values
+
+    def _check_new(self, key: Hashable) -> None:
+        if key in self._dependents:
+            raise ValueError(f"Calculation graph already has {key!r}")
+
+
+_MISSING = object()
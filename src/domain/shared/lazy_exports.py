@@ -0,0 +1,41 @@
+"""Lazy package exports (PEP 562).
+
+Package ``__init__`` modules declare which names they re-export from which
+submodule. A submodule is only imported the first time one of its names is
+accessed, so importing a package costs nothing until it is used.
+"""
+
+from collections.abc import Callable, Mapping
+from importlib import import_module
+from typing import Any
+
+
+def lazy_exports(
+    package: str, exports: Mapping[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build module-level ``__getattr__`` and ``__dir__`` for a package.
+
+    Args:
+        package: The ``__name__`` of the package
+        exports: Relative submodule name for every exported name
+
+    Returns:
+        The ``__getattr__`` and ``__dir__`` functions to assign in the package
+    """
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module_name = exports[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            ) from None
+        value = getattr(import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
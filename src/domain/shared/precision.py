@@ -0,0 +1,190 @@
+"""Numeric precision policy for stored results.
+
+Calculations always run in float64: accumulators, solver matrices and
+integrator state keep full precision, because rounding there compounds from
+one step to the next. A precision policy only chooses how finished values are
+stored. Single precision halves the memory of result arrays and keeps about
+seven significant digits, which is well within the uncertainty of the
+building inputs.
+
+Values rounded to storage precision can be compared against their float64
+originals with a ``PrecisionErrorTracker``, so every run can report the
+error its storage precision introduced.
+"""
+
+import math
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+
+class StoragePrecision(Enum):
+    """Floating point precision of stored values."""
+
+    DOUBLE = "float64"
+    SINGLE = "float32"
+
+    @property
+    def typecode(self) -> str:
+        """The array module type code of the precision."""
+        return "d" if self == StoragePrecision.DOUBLE else "f"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value
+
+
+@dataclass(frozen=True)
+class PrecisionPolicy:
+    """Precision of stored state and results.
+
+    Attributes:
+        storage: Precision of stored values; accumulation is always float64
+    """
+
+    storage: StoragePrecision = StoragePrecision.DOUBLE
+
+    @classmethod
+    def from_name(cls, name: str) -> "PrecisionPolicy":
+        """Policy for a storage precision name, "float64" or "float32"."""
+        try:
+            return cls(StoragePrecision(name))
+        except ValueError:
+            names = ", ".join(precision.value for precision in StoragePrecision)
+            raise ValueError(
+                f"Unknown precision '{name}'; expected one of {names}"
+            ) from None
+
+    @property
+    def typecode(self) -> str:
+        """The array module type code of stored values."""
+        return self.storage.typecode
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether stored values equal the float64 values they came from."""
+        return self.storage == StoragePrecision.DOUBLE
+
+    def storage_array(self, values: Iterable[float] = ()) -> array:
+        """Array of values at storage precision."""
+        return array(self.typecode, values)
+
+    def accumulator_array(self, size: int) -> array:
+        """Zeroed float64 array for sums and solver state."""
+        return array("d", bytes(8 * size))
+
+    def format_value(self, value: float) -> str:
+        """Shortest text that reads back as the stored value."""
+        if self.is_exact:
+            return repr(value)
+        # Nine significant digits round-trip every float32
+        return f"{value:.9g}"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return str(self.storage)
+
+
+DOUBLE_PRECISION = PrecisionPolicy(StoragePrecision.DOUBLE)
+SINGLE_PRECISION = PrecisionPolicy(StoragePrecision.SINGLE)
+
+
+@dataclass(frozen=True)
+class PrecisionReport:
+    """Error of stored values against their float64 originals.
+
+    Attributes:
+        policy: Precision policy the values were stored with
+        value_count: Number of values compared
+        max_absolute_error: Largest absolute difference
+        max_relative_error: Largest difference relative to the original,
+            over the nonzero originals
+        rms_relative_error: Root mean square relative difference
+    """
+
+    policy: PrecisionPolicy
+    value_count: int
+    max_absolute_error: float
+    max_relative_error: float
+    rms_relative_error: float
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return (
+            f"{self.policy} storage: {self.value_count} values, "
+            f"max relative error {self.max_relative_error:.2e}, "
+            f"max absolute error {self.max_absolute_error:.3g}"
+        )
+
+
+class PrecisionErrorTracker:
+    """Running comparison of stored values with their float64 originals.
+
+    Trackers from parallel workers can be merged through their dict form.
+
+    Attributes:
+        policy: Precision policy the values are stored with
+    """
+
+    def __init__(self, policy: PrecisionPolicy) -> None:
+        self.policy = policy
+        self._count = 0
+        self._max_absolute = 0.0
+        self._max_relative = 0.0
+        self._relative_squares = 0.0
+
+    def store(self, values: Sequence[float]) -> array:
+        """Round float64 values to storage precision, tracking the error."""
+        stored = self.policy.storage_array(values)
+        self.observe(values, stored)
+        return stored
+
+    def observe(self, reference: Sequence[float], stored: Sequence[float]) -> None:
+        """Compare stored values with the float64 values they came from."""
+        if len(reference) != len(stored):
+            raise ValueError("Need one stored value per reference value")
+        self._count += len(reference)
+        if self.policy.is_exact:
+            return
+        for original, value in zip(reference, stored):
+            error = abs(value - original)
+            if error > self._max_absolute:
+                self._max_absolute = error
+            if original:
+                relative = error / abs(original)
+                self._relative_squares += relative * relative
+                if relative > self._max_relative:
+                    self._max_relative = relative
+
+    def report(self) -> PrecisionReport:
+        """The error introduced so far."""
+        return PrecisionReport(
+            policy=self.policy,
+            value_count=self._count,
+            max_absolute_error=self._max_absolute,
+            max_relative_error=self._max_relative,
+            rms_relative_error=(
+                math.sqrt(self._relative_squares / self._count) if self._count else 0.0
+            ),
+        )
+
+    def merge(self, stats: dict[str, Any]) -> None:
+        """Fold in the dict form of another tracker with the same policy."""
+        if stats["precision"] != self.policy.storage.value:
+            raise ValueError("Cannot merge precision errors of different policies")
+        self._count += stats["count"]
+        self._max_absolute = max(self._max_absolute, stats["max_absolute_error"])
+        self._max_relative = max(self._max_relative, stats["max_relative_error"])
+        self._relative_squares += stats["relative_squares"]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain form of the tracker, for passing between processes."""
+        return {
+            "precision": self.policy.storage.value,
+            "count": self._count,
+            "max_absolute_error": self._max_absolute,
+            "max_relative_error": self._max_relative,
+            "relative_squares": self._relative_squares,
+        }
@@ -0,0 +1,256 @@
+"""Sparse symmetric positive definite solver.
+
+Matrices are assembled as a diagonal plus a dictionary of lower-triangle
+entries, so memory grows with the number of couplings rather than with the
+square of the number of unknowns. Factorisation is split in two:
+
+- ``SkylineCholesky`` is the symbolic part. It picks a reverse Cuthill-McKee
+  ordering that keeps nonzeros close to the diagonal and lays out the
+  envelope (skyline) of the factor. It depends only on the sparsity pattern,
+  so it can be reused for every matrix with that pattern.
+- ``CholeskyFactor`` is the numeric part, computed by ``SkylineCholesky.factor``
+  for one set of values and reused for any number of solves.
+"""
+
+import math
+from array import array
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+
+class SparseSymmetricMatrix:
+    """Symmetric matrix storing its diagonal and lower-triangle nonzeros.
+
+    Attributes:
+        size: Number of rows and columns
+        diagonal: Diagonal entries
+        off_diagonal: Lower-triangle entries keyed by (row, column), row > column
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 0:
+            raise ValueError("Matrix size must be non-negative")
+        self.size = size
+        self.diagonal = array("d", bytes(8 * size))
+        self.off_diagonal: dict[tuple[int, int], float] = {}
+
+    def add(self, row: int, column: int, value: float) -> None:
+        """Add a value to an entry and its mirror across the diagonal."""
+        if not (0 <= row < self.size and 0 <= column < self.size):
+            raise IndexError("Matrix entry out of range")
+        if row == column:
+            self.diagonal[row] += value
+            return
+        key = (row, column) if row > column else (column, row)
+        self.off_diagonal[key] = self.off_diagonal.get(key, 0.0) + value
+
+    def add_conductance(self, first: int, second: int, conductance: float) -> None:
+        """Add a conductance between two nodes, as in a nodal heat balance."""
+        self.add(first, first, conductance)
+        self.add(second, second, conductance)
+        self.add(first, second, -conductance)
+
+    def multiply(self, vector: Sequence[float]) -> array:
+        """Return the product of the matrix and a vector."""
+        if len(vector) != self.size:
+            raise ValueError("Vector length must match the matrix size")
+        result = array("d", (self.diagonal[i] * vector[i] for i in range(self.size)))
+        for (row, column), value in self.off_diagonal.items():
+            result[row] += value * vector[column]
+            result[column] += value * vector[row]
+        return result
+
+    def pattern(self) -> Iterable[tuple[int, int]]:
+        """The (row, column) positions of the lower-triangle nonzeros."""
+        return self.off_diagonal.keys()
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"SparseSymmetricMatrix(size={self.size}, "
+            f"nonzeros={self.size + 2 * len(self.off_diagonal)})"
+        )
+
+
+class SkylineCholesky:
+    """Symbolic Cholesky factorisation over a fixed sparsity pattern.
+
+    Attributes:
+        size: Number of unknowns
+        ordering: Original index of each row of the reordered matrix
+        envelope_size: Number of stored entries of the factor
+    """
+
+    def __init__(self, size: int, pattern: Iterable[tuple[int, int]]) -> None:
+        """Order the unknowns and lay out the factor's envelope.
+
+        Args:
+            size: Number of unknowns
+            pattern: Positions of the off-diagonal nonzeros, either triangle
+        """
+        self.size = size
+        neighbours: list[list[int]] = [[] for _ in range(size)]
+        for row, column in pattern:
+            if row != column:
+                neighbours[row].append(column)
+                neighbours[column].append(row)
+        self.ordering = _reverse_cuthill_mckee(neighbours)
+        self._position = array("l", bytes(8 * size))
+        for reordered, original in enumerate(self.ordering):
+            self._position[original] = reordered
+
+        # First column of each reordered row's envelope, then row offsets
+        position = self._position
+        self._first = array("l", range(size))
+        for original, adjacent in enumerate(neighbours):
+            row = position[original]
+            for other in adjacent:
+                column = position[other]
+                if column < self._first[row]:
+                    self._first[row] = column
+        self._offset = array("l", bytes(8 * (size + 1)))
+        for row in range(size):
+            self._offset[row + 1] = self._offset[row] + row - self._first[row] + 1
+        self.envelope_size = self._offset[size]
+
+    @classmethod
+    def for_matrix(cls, matrix: SparseSymmetricMatrix) -> "SkylineCholesky":
+        """Symbolic factorisation for the pattern of a matrix."""
+        return cls(matrix.size, matrix.pattern())
+
+    def factor(self, matrix: SparseSymmetricMatrix) -> "CholeskyFactor":
+        """Compute the numeric factor L (A = L·Lᵀ after reordering).
+
+        Raises:
+            ValueError: If the matrix does not match the pattern or is not
+                positive definite
+        """
+        if matrix.size != self.size:
+            raise ValueError("Matrix size does not match the factorisation")
+        first, offset, position = self._first, self._offset, self._position
+        values = array("d", bytes(8 * self.envelope_size))
+        for row in range(self.size):
+            values[offset[row + 1] - 1] = matrix.diagonal[self.ordering[row]]
+        for (original_row, original_column), value in matrix.off_diagonal.items():
+            row, column = position[original_row], position[original_column]
+            if row < column:
+                row, column = column, row
+            if column < first[row]:
+                raise ValueError("Matrix entry outside the factorised pattern")
+            values[offset[row] + column - first[row]] += value
+
+        for row in range(self.size):
+            row_first, row_offset = first[row], offset[row]
+            for column in range(row_first, row):
+                column_first, column_offset = first[column], offset[column]
+                start = max(row_first, column_first)
+                total = values[row_offset + column - row_first]
+                for k in range(start, column):
+                    total -= (
+                        values[row_offset + k - row_first]
+                        * values[column_offset + k - column_first]
+                    )
+                values[row_offset + column - row_first] = (
+                    total / values[offset[column + 1] - 1]
+                )
+            diagonal = values[offset[row + 1] - 1]
+            for k in range(row_offset, offset[row + 1] - 1):
+                diagonal -= values[k] * values[k]
+            if diagonal <= 0:
+                raise ValueError("Matrix is not positive definite")
+            values[offset[row + 1] - 1] = math.sqrt(diagonal)
+        return CholeskyFactor(self, values)
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return f"SkylineCholesky(size={self.size}, envelope={self.envelope_size})"
+
+
+class CholeskyFactor:
+    """Numeric Cholesky factor, reusable for any number of right-hand sides.
+
+    Attributes:
+        symbolic: The symbolic factorisation the factor was computed with
+    """
+
+    def __init__(self, symbolic: SkylineCholesky, values: array) -> None:
+        self.symbolic = symbolic
+        self._values = values
+
+    def solve(self, right_hand_side: Sequence[float]) -> array:
+        """Solve A·x = b for x."""
+        symbolic = self.symbolic
+        if len(right_hand_side) != symbolic.size:
+            raise ValueError("Right-hand side length must match the matrix size")
+        first, offset, values = symbolic._first, symbolic._offset, self._values
+        solution = array(
+            "d", (right_hand_side[original] for original in symbolic.ordering)
+        )
+        # Forward substitution with L
+        for row in range(symbolic.size):
+            total = solution[row]
+            row_first, row_offset = first[row], offset[row]
+            for column in range(row_first, row):
+                total -= values[row_offset + column - row_first] * solution[column]
+            solution[row] = total / values[offset[row + 1] - 1]
+        # Back substitution with Lᵀ, reading L row by row
+        for row in range(symbolic.size - 1, -1, -1):
+            solution[row] /= values[offset[row + 1] - 1]
+            value = solution[row]
+            row_first, row_offset = first[row], offset[row]
+            for column in range(row_first, row):
+                solution[column] -= values[row_offset + column - row_first] * value
+
+        result = array("d", bytes(8 * symbolic.size))
+        for position, original in enumerate(symbolic.ordering):
+            result[original] = solution[position]
+        return result
+
+
+def _reverse_cuthill_mckee(neighbours: list[list[int]]) -> array:
+    size = len(neighbours)
+    degree = [len(set(adjacent)) for adjacent in neighbours]
+    adjacency = [
+        sorted(set(adjacent), key=degree.__getitem__) for adjacent in neighbours
+    ]
+    visited = bytearray(size)
+    ordering: list[int] = []
+    for start in sorted(range(size), key=degree.__getitem__):
+        if visited[start]:
+            continue
+        root = _pseudo_peripheral_node(adjacency, start)
+        visited[root] = 1
+        queue = deque((root,))
+        while queue:
+            node = queue.popleft()
+            ordering.append(node)
+            for adjacent in adjacency[node]:
+                if not visited[adjacent]:
+                    visited[adjacent] = 1
+                    queue.append(adjacent)
+    ordering.reverse()
+    return array("l", ordering)
+
+
+def _pseudo_peripheral_node(adjacency: list[list[int]], start: int) -> int:
+    # Repeatedly jump to the farthest node of lowest degree while the
+    # breadth-first eccentricity keeps growing
+    node, eccentricity = start, -1
+    while True:
+        levels = {node: 0}
+        frontier = [node]
+        depth = 0
+        while frontier:
+            following = []
+            for current in frontier:
+                for adjacent in adjacency[current]:
+                    if adjacent not in levels:
+                        levels[adjacent] = depth + 1
+                        following.append(adjacent)
+            if following:
+                depth += 1
+            last_level, frontier = frontier, following
+        if depth <= eccentricity:
+            return node
+        eccentricity = depth
+        node = min(last_level, key=lambda candidate: len(adjacency[candidate]))
@@ -1,21 +1,41 @@
-from .density import Density
-from .flow_rate import FlowRate
-from .length import Length
-from .pressure import Pressure
-from .specific_heat_capacity import SpecificHeatCapacity
-from .temperature import Temperature
-from .thermal_conductivity import ThermalConductivity
-from .thermal_resistance import ThermalResistance
-from .thermal_transmittance import ThermalTransmittance
+from typing import TYPE_CHECKING
+
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .density import Density
+    from .flow_rate import FlowRate
+    from .length import Length
+    from .pressure import Pressure
+    from .specific_heat_capacity import SpecificHeatCapacity
+    from .temperature import Temperature
+    from .thermal_conductivity import ThermalConductivity
+    from .thermal_resistance import ThermalResistance
+    from .thermal_transmittance import ThermalTransmittance
 
 __all__ = [
-    "Temperature",
-    "ThermalResistance",
-    "ThermalConductivity",
-    "ThermalTransmittance",
+    "Density",
     "FlowRate",
-    "Pressure",
     "Length",
-    "Density",
+    "Pressure",
     "SpecificHeatCapacity",
+    "Temperature",
+    "ThermalConductivity",
+    "ThermalResistance",
+    "ThermalTransmittance",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Density": ".density",
+        "FlowRate": ".flow_rate",
+        "Length": ".length",
+        "Pressure": ".pressure",
+        "SpecificHeatCapacity": ".specific_heat_capacity",
+        "Temperature": ".temperature",
+        "ThermalConductivity": ".thermal_conductivity",
+        "ThermalResistance": ".thermal_resistance",
+        "ThermalTransmittance": ".thermal_transmittance",
+    },
+)
@@ -2,7 +2,11 @@ from dataclasses import dataclass
 from functools import cached_property
 from uuid import UUID
 
-from domain.simulation.value_objects import SimulationTime, TimeStepDuration
+from domain.simulation.value_objects import (
+    CalendarIndex,
+    SimulationTime,
+    TimeStepDuration,
+)
 
 
 @dataclass
@@ -34,6 +38,15 @@ class SimulationClock:
         ) / self.timestep_duration.duration
         return int(total_time_steps)
 
+    @cached_property
+    def calendar_index(self) -> CalendarIndex:
+        """Hour, day, month and year period index of every time step."""
+        return CalendarIndex.from_timeline(
+            start=self.start_time.datetime,
+            timestep=self.timestep_duration.duration,
+            timestep_count=self.total_time_steps,
+        )
+
     def advance(self) -> None:
         """Advance the simulation clock to the next time step."""
         self.current_timestep += 1
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class CalendarPeriod(Enum):
+    """Calendar period enumeration.
+
+    These are the reporting periods that simulation results are rolled up into,
+    ordered from finest to coarsest.
+    """
+
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+    YEAR = "year"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value.title()
@@ -1,7 +1,23 @@
-from .simulation_time import SimulationTime
-from .time_step_duration import TimeStepDuration
+from typing import TYPE_CHECKING
+
+from domain.shared.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .calendar_index import CalendarIndex
+    from .simulation_time import SimulationTime
+    from .time_step_duration import TimeStepDuration
 
 __all__ = [
+    "CalendarIndex",
     "SimulationTime",
     "TimeStepDuration",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "CalendarIndex": ".calendar_index",
+        "SimulationTime": ".simulation_time",
+        "TimeStepDuration": ".time_step_duration",
+    },
+)
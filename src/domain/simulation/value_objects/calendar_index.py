@@ -0,0 +1,90 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from domain.simulation.enums import CalendarPeriod
+
+# Period labels are prefixes of the ISO 8601 timestamp, e.g. "2025-01-31T17"
+_LABEL_LENGTHS = {
+    CalendarPeriod.HOUR: 13,
+    CalendarPeriod.DAY: 10,
+    CalendarPeriod.MONTH: 7,
+    CalendarPeriod.YEAR: 4,
+}
+
+
+@dataclass(frozen=True)
+class CalendarIndex:
+    """Calendar index value object.
+
+    Maps every time step of a simulation timeline onto the hour, day, month and
+    year it starts in. Indices are computed once per clock so that per-timestep
+    consumers (ledgers, gains profiles, meter alignment) only do integer lookups.
+
+    Attributes:
+        start: The start time of the first time step
+        timestep: The duration of a single time step
+        timestep_count: The number of time steps in the timeline
+        period_indices: Period index of every time step, per calendar period
+        period_labels: Label of every period index, per calendar period
+    """
+
+    start: datetime
+    timestep: timedelta
+    timestep_count: int
+    period_indices: dict[CalendarPeriod, array]
+    period_labels: dict[CalendarPeriod, tuple[str, ...]]
+
+    def __post_init__(self) -> None:
+        if self.timestep_count < 0:
+            raise ValueError("Time step count must be non-negative")
+        for period in CalendarPeriod:
+            if len(self.period_indices[period]) != self.timestep_count:
+                raise ValueError(f"{period} indices must cover every time step")
+
+    @classmethod
+    def from_timeline(
+        cls, start: datetime, timestep: timedelta, timestep_count: int
+    ) -> "CalendarIndex":
+        """Build the calendar index for a regular timeline.
+
+        Args:
+            start: The start time of the first time step
+            timestep: The duration of a single time step
+            timestep_count: The number of time steps in the timeline
+
+        Returns:
+            The calendar index covering every time step
+        """
+        period_indices = {period: array("l") for period in CalendarPeriod}
+        period_labels: dict[CalendarPeriod, list[str]] = {
+            period: [] for period in CalendarPeriod
+        }
+        for step in range(timestep_count):
+            timestamp = (start + step * timestep).isoformat()
+            for period, length in _LABEL_LENGTHS.items():
+                label = timestamp[:length]
+                labels = period_labels[period]
+                if not labels or labels[-1] != label:
+                    labels.append(label)
+                period_indices[period].append(len(labels) - 1)
+
+        return cls(
+            start=start,
+            timestep=timestep,
+            timestep_count=timestep_count,
+            period_indices=period_indices,
+            period_labels={
+                period: tuple(labels) for period, labels in period_labels.items()
+            },
+        )
+
+    def period_count(self, period: CalendarPeriod) -> int:
+        """Number of distinct periods of the given type in the timeline."""
+        return len(self.period_labels[period])
+
+    def timestamps(self) -> list[datetime]:
+        """Start time of every time step in the timeline."""
+        return [
+            self.start + step * self.timestep for step in range(self.timestep_count)
+        ]
@@ -0,0 +1,15 @@
+from .building_catalogue import (
+    CATALOGUE_SUFFIX,
+    BuildingCatalogue,
+    CatalogueFormatError,
+    convert_stock_file,
+    write_catalogue,
+)
+
+__all__ = [
+    "CATALOGUE_SUFFIX",
+    "BuildingCatalogue",
+    "CatalogueFormatError",
+    "convert_stock_file",
+    "write_catalogue",
+]
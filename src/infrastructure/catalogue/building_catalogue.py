@@ -0,0 +1,554 @@
+"""Memory-mapped binary building catalogue.
+
+A catalogue file holds a whole building portfolio in fixed-width records
+stored column by column, so every column can be viewed in place without
+parsing. Layout (little-endian, version 3):
+
+    header      magic, version, section count and record counts
+    sections    (offset, length) of every section, in SECTIONS order
+    data        one 8-byte aligned section per column, plus an interned
+                string table for names and an open-addressing hash table
+                mapping building id to building index
+
+Parent links use compressed row offsets: building ``b`` owns zones
+``building_zone_start[b]`` to ``building_zone_start[b + 1]``, and likewise for
+the elements, thermal bridges and junctions of each zone.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Literal, cast, get_args, overload
+from uuid import UUID
+
+from domain.building.aggregates.building import Building
+from domain.building.columns import BOUNDARY_TYPES, BuildingColumns
+from domain.building.entities import BuildingElement, Zone
+from domain.building.value_objects import (
+    AirChangeRate,
+    Area,
+    ArealHeatCapacity,
+    Orientation,
+    Pitch,
+    ThermalBridgeJunction,
+    ThermalConductance,
+    Volume,
+)
+from domain.building.value_objects.junction_catalogue import JUNCTION_TYPES
+from domain.shared.value_objects import Length, Temperature, ThermalResistance
+from infrastructure.loaders import BuildingStockLoader, building_to_record
+from infrastructure.loaders.building_stock_loader import append_record
+
+CATALOGUE_SUFFIX = ".hemcat"
+MAGIC = b"HEMCAT\x00\x00"
+VERSION = 3
+
+# (section name, array typecode); "16s" sections hold raw UUID bytes
+SECTIONS: tuple[tuple[str, str], ...] = (
+    ("building_id", "16s"),
+    ("building_name", "I"),
+    ("building_zone_start", "q"),
+    ("zone_id", "16s"),
+    ("zone_name", "I"),
+    ("zone_building", "q"),
+    ("zone_area", "d"),
+    ("zone_volume", "d"),
+    ("zone_air_change_rate", "d"),
+    ("zone_setpoint", "d"),
+    ("zone_thermal_bridges", "d"),
+    ("zone_element_start", "q"),
+    ("zone_bridge_start", "q"),
+    ("zone_junction_start", "q"),
+    ("element_id", "16s"),
+    ("element_name", "I"),
+    ("element_zone", "q"),
+    ("element_boundary_type", "b"),
+    ("element_area", "d"),
+    ("element_thermal_resistance", "d"),
+    ("element_areal_heat_capacity", "d"),
+    ("element_orientation", "d"),
+    ("element_pitch", "d"),
+    ("element_exposed_perimeter", "d"),
+    ("bridge_w_per_k", "d"),
+    ("junction_zone", "q"),
+    ("junction_type", "b"),
+    ("junction_length", "d"),
+    ("string_start", "q"),
+    ("string_data", "B"),
+    ("index_slot", "I"),
+)
+
+_ID_SECTIONS = ("building_id", "zone_id", "element_id")
+_COLUMN_SECTIONS = tuple(
+    name
+    for name, _ in SECTIONS
+    if name in BuildingColumns.__dataclass_fields__ and name not in _ID_SECTIONS
+)
+
+# memoryview formats of the fixed-width array typecodes sections are stored as
+_ItemFormat = Literal["b", "B", "h", "H", "i", "I", "l", "L", "q", "Q", "f", "d"]
+_ITEM_FORMATS: frozenset[str] = frozenset(get_args(_ItemFormat))
+
+_HEADER = struct.Struct("<8sII5Q")
+_SECTION = struct.Struct("<QQ")
+_EMPTY_SLOT = 0
+
+
+class CatalogueFormatError(ValueError):
+    """Raised when a file is not a readable building catalogue."""
+
+
+class UuidColumn(Sequence[UUID]):
+    """Read-only sequence of UUIDs over a packed 16-byte column."""
+
+    def __init__(self, data: memoryview) -> None:
+        self._data = data
+
+    @overload
+    def __getitem__(self, index: int) -> UUID: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[UUID]: ...
+
+    def __getitem__(self, index: int | slice) -> UUID | list[UUID]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("UUID column index out of range")
+        return UUID(bytes=bytes(self._data[index * 16 : index * 16 + 16]))
+
+    def __len__(self) -> int:
+        return len(self._data) // 16
+
+
+class BuildingCatalogue:
+    """Read-only, memory-mapped building catalogue.
+
+    Opening a catalogue maps the file and reads only the header. Buildings are
+    materialised on request in O(1) by index or id, and columns() exposes the
+    whole portfolio as BuildingColumns backed directly by the mapped file.
+
+    Attributes:
+        path: Path of the catalogue file
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as stream:
+            self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._sections: dict[str, Any] = {}
+        try:
+            self._sections = self._read_sections()
+        except Exception:
+            self.close()
+            raise
+
+        self.building_ids = UuidColumn(self._sections["building_id"])
+        self._index_slots = self._sections["index_slot"]
+
+    def _read_sections(self) -> dict[str, Any]:
+        if sys.byteorder != "little":
+            raise NotImplementedError("Catalogues need a little-endian host")
+        if len(self._view) < _HEADER.size:
+            raise CatalogueFormatError(f"{self.path} is too short to be a catalogue")
+        magic, version, section_count, *_ = _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise CatalogueFormatError(f"{self.path} is not a building catalogue")
+        if version != VERSION:
+            raise CatalogueFormatError(
+                f"{self.path} has catalogue version {version}, expected {VERSION}"
+            )
+        if section_count != len(SECTIONS):
+            raise CatalogueFormatError(f"{self.path} has an unexpected section count")
+
+        sections: dict[str, Any] = {}
+        for position, (name, typecode) in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(
+                self._view, _HEADER.size + position * _SECTION.size
+            )
+            if offset + length > len(self._view):
+                raise CatalogueFormatError(f"{self.path} is truncated")
+            data = self._view[offset : offset + length]
+            sections[name] = view_section(data, typecode)
+        return sections
+
+    def index_of(self, building_id: UUID) -> int:
+        """Find the index of a building by id.
+
+        Raises:
+            KeyError: If the building is not in the catalogue
+        """
+        return lookup_id_index(
+            self._index_slots, self._sections["building_id"], building_id
+        )
+
+    def __contains__(self, building_id: object) -> bool:
+        if not isinstance(building_id, UUID):
+            return False
+        try:
+            self.index_of(building_id)
+        except KeyError:
+            return False
+        return True
+
+    def get(self, building_id: UUID) -> Building:
+        """Materialise a Building aggregate by id."""
+        return self.building(self.index_of(building_id))
+
+    def building(self, index: int) -> Building:
+        """Materialise the Building aggregate at an index."""
+        sections = self._sections
+        zone_ids = UuidColumn(sections["zone_id"])
+        element_ids = UuidColumn(sections["element_id"])
+        zone_start = sections["building_zone_start"]
+        element_start = sections["zone_element_start"]
+        bridge_start = sections["zone_bridge_start"]
+        junction_start = sections["zone_junction_start"]
+
+        zones = []
+        for zone in range(zone_start[index], zone_start[index + 1]):
+            elements = [
+                BuildingElement(
+                    id=element_ids[element],
+                    name=self._string(sections["element_name"][element]),
+                    thermal_boundary_type=BOUNDARY_TYPES[
+                        sections["element_boundary_type"][element]
+                    ],
+                    area=Area(square_metres=sections["element_area"][element]),
+                    thermal_resistance=ThermalResistance(
+                        m2_k_per_w=sections["element_thermal_resistance"][element]
+                    ),
+                    areal_heat_capacity=ArealHeatCapacity(
+                        j_per_m2_k=sections["element_areal_heat_capacity"][element]
+                    ),
+                    orientation=Orientation(
+                        degrees=sections["element_orientation"][element]
+                    ),
+                    pitch=Pitch(degrees=sections["element_pitch"][element]),
+                    exposed_perimeter=_optional_length(
+                        sections["element_exposed_perimeter"][element]
+                    ),
+                )
+                for element in range(element_start[zone], element_start[zone + 1])
+            ]
+            zones.append(
+                Zone(
+                    id=zone_ids[zone],
+                    name=self._string(sections["zone_name"][zone]),
+                    area=Area(square_metres=sections["zone_area"][zone]),
+                    volume=Volume(cubic_metres=sections["zone_volume"][zone]),
+                    building_elements=elements,
+                    ventilation_rate=AirChangeRate(
+                        changes_per_hour=sections["zone_air_change_rate"][zone]
+                    ),
+                    temperature_setpoint=Temperature(
+                        celsius=sections["zone_setpoint"][zone]
+                    ),
+                    thermal_bridges=[
+                        ThermalConductance(w_per_k=sections["bridge_w_per_k"][bridge])
+                        for bridge in range(bridge_start[zone], bridge_start[zone + 1])
+                    ],
+                    junctions=[
+                        ThermalBridgeJunction(
+                            junction_type=JUNCTION_TYPES[
+                                sections["junction_type"][junction]
+                            ],
+                            length=Length(meters=sections["junction_length"][junction]),
+                        )
+                        for junction in range(
+                            junction_start[zone], junction_start[zone + 1]
+                        )
+                    ],
+                )
+            )
+
+        return Building(
+            id=self.building_ids[index],
+            name=self._string(sections["building_name"][index]),
+            zones=zones,
+        )
+
+    def __iter__(self) -> Iterator[Building]:
+        for index in range(len(self)):
+            yield self.building(index)
+
+    def __len__(self) -> int:
+        return len(self.building_ids)
+
+    def columns(self, start: int = 0, stop: int | None = None) -> BuildingColumns:
+        """Buildings start to stop as columns viewing the mapped file.
+
+        Value columns share memory with the catalogue, are read-only, and are
+        only valid until the catalogue is closed. When a sub-range is taken,
+        the zone and element parent indices are copied and rebased so they
+        index into the returned columns.
+
+        Args:
+            start: Index of the first building
+            stop: Index after the last building, defaults to the end
+        """
+        stop = len(self) if stop is None else stop
+        if not 0 <= start <= stop <= len(self):
+            raise IndexError("Building range out of bounds")
+
+        sections = self._sections
+        zone_start, zone_stop = (
+            sections["building_zone_start"][start],
+            sections["building_zone_start"][stop],
+        )
+        element_start, element_stop = (
+            sections["zone_element_start"][zone_start],
+            sections["zone_element_start"][zone_stop],
+        )
+        ranges = {
+            "building": (start, stop),
+            "zone": (zone_start, zone_stop),
+            "element": (element_start, element_stop),
+            "junction": (
+                sections["zone_junction_start"][zone_start],
+                sections["zone_junction_start"][zone_stop],
+            ),
+        }
+        # Cast views share the read interface of the arrays BuildingColumns holds
+        views: dict[str, Any] = {}
+        for name in _COLUMN_SECTIONS:
+            first, last = ranges[name.split("_")[0]]
+            views[name] = cast(array, sections[name][first:last])
+        for name in _ID_SECTIONS:
+            first, last = ranges[name.split("_")[0]]
+            views[name.replace("_id", "_ids")] = UuidColumn(
+                sections[name][first * 16 : last * 16]
+            )
+        if start > 0:
+            views["zone_building"] = array(
+                "q", (building - start for building in views["zone_building"])
+            )
+            views["element_zone"] = array(
+                "q", (zone - zone_start for zone in views["element_zone"])
+            )
+            views["junction_zone"] = array(
+                "q", (zone - zone_start for zone in views["junction_zone"])
+            )
+        return BuildingColumns(**views)
+
+    def _string(self, index: int) -> str:
+        starts = self._sections["string_start"]
+        data = self._sections["string_data"]
+        return bytes(data[starts[index] : starts[index + 1]]).decode("utf-8")
+
+    def close(self) -> None:
+        """Release the memory map.
+
+        Views returned by columns() must be released before closing.
+        """
+        for section in self._sections.values():
+            section.release()
+        self._sections = {}
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "BuildingCatalogue":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return f"BuildingCatalogue(path='{self.path}', buildings={len(self)})"
+
+
+def write_catalogue(buildings: Iterable[Building], path: Path | str) -> int:
+    """Write Building aggregates to a catalogue file.
+
+    Returns:
+        The number of buildings written
+    """
+    records = (building_to_record(building) for building in buildings)
+    return _write_records(records, path)
+
+
+def convert_stock_file(stock_path: Path | str, catalogue_path: Path | str) -> int:
+    """Convert a JSON lines or CSV stock file into a catalogue file.
+
+    Returns:
+        The number of buildings written
+    """
+    loader = BuildingStockLoader(stock_path)
+    records = (record for _, record in loader.iter_records())
+    return _write_records(records, catalogue_path)
+
+
+def _write_records(records: Iterable[dict[str, Any]], path: Path | str) -> int:
+    if sys.byteorder != "little":
+        raise NotImplementedError("Catalogues need a little-endian host")
+
+    columns = BuildingColumns()
+    names = _StringTable()
+    sections: dict[str, Any] = {
+        name: bytearray() if typecode == "16s" else array(typecode)
+        for name, typecode in SECTIONS
+    }
+    junction_count = 0
+    for record in records:
+        # append_record validates the record the same way the stock loader does
+        append_record(columns, record)
+        sections["building_name"].append(names.intern(record["name"]))
+        sections["building_zone_start"].append(len(sections["zone_name"]))
+        for zone in record["zones"]:
+            sections["zone_name"].append(names.intern(zone["name"]))
+            sections["zone_element_start"].append(len(sections["element_name"]))
+            sections["zone_bridge_start"].append(len(sections["bridge_w_per_k"]))
+            sections["zone_junction_start"].append(junction_count)
+            junction_count += len(zone.get("junctions", []))
+            sections["bridge_w_per_k"].extend(
+                float(bridge) for bridge in zone.get("thermal_bridges_w_per_k", [])
+            )
+            for element in zone["elements"]:
+                sections["element_name"].append(names.intern(element["name"]))
+
+    sections["building_zone_start"].append(len(sections["zone_name"]))
+    sections["zone_element_start"].append(len(sections["element_name"]))
+    sections["zone_bridge_start"].append(len(sections["bridge_w_per_k"]))
+    sections["zone_junction_start"].append(len(columns.junction_zone))
+    for name in _COLUMN_SECTIONS:
+        sections[name].extend(iter(getattr(columns, name)))
+    for name, ids in (
+        ("building_id", columns.building_ids),
+        ("zone_id", columns.zone_ids),
+        ("element_id", columns.element_ids),
+    ):
+        sections[name] = b"".join(identifier.bytes for identifier in ids)
+    sections["string_start"], sections["string_data"] = names.to_arrays()
+    sections["index_slot"] = build_id_index(columns.building_ids)
+
+    payloads = [bytes(sections[name]) for name, _ in SECTIONS]
+    offset = _align(_HEADER.size + len(SECTIONS) * _SECTION.size)
+    table = bytearray()
+    for payload in payloads:
+        table += _SECTION.pack(offset, len(payload))
+        offset = _align(offset + len(payload))
+
+    with Path(path).open("wb") as stream:
+        stream.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(SECTIONS),
+                columns.building_count,
+                columns.zone_count,
+                columns.element_count,
+                len(sections["bridge_w_per_k"]),
+                len(names),
+            )
+        )
+        stream.write(table)
+        for payload in payloads:
+            stream.write(b"\x00" * (_align(stream.tell()) - stream.tell()))
+            stream.write(payload)
+    return columns.building_count
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._indices: dict[str, int] = {}
+        self._encoded: list[bytes] = []
+
+    def intern(self, value: str) -> int:
+        index = self._indices.get(value)
+        if index is None:
+            index = self._indices[value] = len(self._encoded)
+            self._encoded.append(value.encode("utf-8"))
+        return index
+
+    def to_arrays(self) -> tuple[array, bytes]:
+        starts = array("q", [0])
+        for encoded in self._encoded:
+            starts.append(starts[-1] + len(encoded))
+        return starts, b"".join(self._encoded)
+
+    def __len__(self) -> int:
+        return len(self._encoded)
+
+
+def view_section(
+    data: memoryview, typecode: str
+) -> "memoryview[int] | memoryview[float]":
+    """View the bytes of a file section as items of an array typecode.
+
+    Sections of packed UUIDs ("16s") are returned as raw bytes.
+
+    Raises:
+        ValueError: If the typecode is not a fixed-width array typecode
+    """
+    if typecode == "16s":
+        return data
+    if typecode not in _ITEM_FORMATS:
+        raise ValueError(f"Unsupported section typecode '{typecode}'")
+    return data.cast(cast(_ItemFormat, typecode))
+
+
+def build_id_index(ids: Sequence[UUID]) -> array:
+    """Open-addressing hash table mapping each id to its position.
+
+    Slots hold position + 1, with 0 marking an empty slot, and the table has
+    at least twice as many slots as ids so probe chains stay short.
+
+    Raises:
+        ValueError: If an id occurs twice
+    """
+    slot_count = 1
+    while slot_count < 2 * len(ids):
+        slot_count *= 2
+    slots = array("I", bytes(4 * slot_count))
+    mask = slot_count - 1
+    for index, identifier in enumerate(ids):
+        slot = _hash_slot(identifier.bytes, mask)
+        while slots[slot] != _EMPTY_SLOT:
+            if ids[slots[slot] - 1] == identifier:
+                raise ValueError(f"Duplicate building id {identifier}")
+            slot = (slot + 1) & mask
+        slots[slot] = index + 1
+    return slots
+
+
+def lookup_id_index(
+    slots: Sequence[int], packed_ids: memoryview, identifier: UUID
+) -> int:
+    """Position of an id in a table built by build_id_index.
+
+    Args:
+        slots: The hash table
+        packed_ids: The indexed ids as packed 16-byte UUIDs
+        identifier: The id to find
+
+    Raises:
+        KeyError: If the id is not indexed
+    """
+    key = identifier.bytes
+    mask = len(slots) - 1
+    slot = _hash_slot(key, mask)
+    while (entry := slots[slot]) != _EMPTY_SLOT:
+        index = entry - 1
+        if packed_ids[index * 16 : index * 16 + 16] == key:
+            return index
+        slot = (slot + 1) & mask
+    raise KeyError(identifier)
+
+
+def _hash_slot(key: bytes, mask: int) -> int:
+    return int.from_bytes(key[:8], "little") & mask
+
+
+def _optional_length(meters: float) -> Length | None:
+    return Length(meters=meters) if meters > 0 else None
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
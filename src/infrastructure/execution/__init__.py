@@ -0,0 +1,15 @@
+from .executor import (
+    ExecutionBackend,
+    SerialExecutor,
+    create_executor,
+    default_backend,
+    map_tasks,
+)
+
+__all__ = [
+    "ExecutionBackend",
+    "SerialExecutor",
+    "create_executor",
+    "default_backend",
+    "map_tasks",
+]
@@ -0,0 +1,107 @@
+"""Execution backends that fan calculation tasks out to workers.
+
+Every backend runs the same task functions and returns the same results:
+
+- serial runs each task in the calling thread, in submission order
+- thread runs tasks on a thread pool that shares the caller's memory, so
+  buildings, columns and models are passed by reference, not pickled
+- process runs tasks on a process pool; every argument is pickled to a
+  worker and every result pickled back, and each worker holds its own copy
+  of the modules and caches it touches
+
+Task functions are module-level functions that do not mutate their
+arguments and keep no state outside their own locals, so the thread backend
+needs no locks. On a free-threaded interpreter its threads run tasks in
+parallel. With the GIL enabled, threads only overlap the file I/O of tasks;
+the thread backend then trades parallel CPU for lower memory and no
+pickling.
+"""
+
+import sys
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, TypeVar
+
+R = TypeVar("R")
+
+
+class ExecutionBackend(Enum):
+    """Execution backend enumeration."""
+
+    SERIAL = "serial"
+    THREAD = "thread"
+    PROCESS = "process"
+
+    @property
+    def in_process(self) -> bool:
+        """Whether tasks run in the calling process."""
+        return self != ExecutionBackend.PROCESS
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value
+
+
+def default_backend() -> ExecutionBackend:
+    """The thread backend on a free-threaded interpreter, else the process one."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is not None and not is_gil_enabled():
+        return ExecutionBackend.THREAD
+    return ExecutionBackend.PROCESS
+
+
+class SerialExecutor(Executor):
+    """Executor that runs each task in the calling thread as it is submitted."""
+
+    def submit(self, fn: Callable[..., R], /, *args: Any, **kwargs: Any) -> "Future[R]":
+        """Run a task now and return its already completed future."""
+        future: Future[R] = Future()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        return future
+
+
+def create_executor(backend: ExecutionBackend, workers: int) -> Executor:
+    """Executor of a backend with the given number of workers.
+
+    Raises:
+        ValueError: If the number of workers is not positive
+    """
+    if workers < 1:
+        raise ValueError("Number of workers must be positive")
+    if backend == ExecutionBackend.SERIAL:
+        return SerialExecutor()
+    if backend == ExecutionBackend.THREAD:
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def map_tasks(
+    function: Callable[..., R],
+    tasks: Sequence[tuple[Any, ...]],
+    backend: ExecutionBackend,
+    workers: int,
+) -> list[R]:
+    """Call a function with the arguments of each task, on a backend.
+
+    Tasks run in the calling thread when there is only one worker or one
+    task, whatever the backend, since a pool would only add overhead.
+
+    Args:
+        function: Module-level task function
+        tasks: Positional arguments of each call
+        backend: Backend to run the calls on
+        workers: Number of workers
+
+    Returns:
+        The result of each call, in task order
+    """
+    if backend == ExecutionBackend.SERIAL or workers == 1 or len(tasks) <= 1:
+        return [function(*task) for task in tasks]
+    with create_executor(backend, workers) as executor:
+        return list(executor.map(function, *zip(*tasks)))
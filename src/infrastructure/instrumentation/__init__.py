@@ -0,0 +1,3 @@
+from .profiler import Profiler, StageStats, active_profiler, count, stage
+
+__all__ = ["Profiler", "StageStats", "active_profiler", "count", "stage"]
@@ -0,0 +1,265 @@
+"""Optional per-stage timing and counting for calculation hot paths.
+
+Nothing is instrumented until a Profiler is entered. While it is active, the
+domain calculation methods are wrapped with stage timers and value object
+construction is counted; on exit the original methods are restored, so code
+run without a profiler pays no cost at all. Application code can mark its own
+stages with ``stage()`` and ``count()``, which do nothing when no profiler is
+active.
+
+Stages nest: each is recorded under the path of stages enclosing it, with
+both total and self time, and can be exported as JSON or as collapsed stacks
+for flamegraph tools.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ContextManager
+
+_active: "Profiler | None" = None
+_NO_STAGE = nullcontext()
+
+
+@dataclass
+class StageStats:
+    """Timing of one stage path.
+
+    Attributes:
+        calls: Number of times the stage was entered
+        total_ns: Wall time spent in the stage, including nested stages
+        self_ns: Wall time spent in the stage, excluding nested stages
+    """
+
+    calls: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+
+
+@dataclass
+class _Frame:
+    """A stage entered on the current thread and not yet left."""
+
+    name: str
+    nested_ns: int = 0
+
+
+class Profiler:
+    """Collects stage timings and counters while active.
+
+    Attributes:
+        instrument_domain: Whether domain calculations and value object
+            construction are instrumented while the profiler is active
+        stages: Timing per stage path
+        counters: Value of each named counter
+    """
+
+    def __init__(self, instrument_domain: bool = True) -> None:
+        self.instrument_domain = instrument_domain
+        self.stages: dict[tuple[str, ...], StageStats] = {}
+        self.counters: dict[str, int] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._restore: list[tuple[type, str, Any]] = []
+
+    def __enter__(self) -> "Profiler":
+        global _active
+        if _active is not None:
+            raise RuntimeError("A profiler is already active")
+        if self.instrument_domain:
+            self._install()
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _active
+        _active = None
+        for owner, name, original in reversed(self._restore):
+            setattr(owner, name, original)
+        self._restore.clear()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a stage nested in the current one."""
+        stack = self._stack()
+        frame = _Frame(name)
+        stack.append(frame)
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            path = tuple(entry.name for entry in stack)
+            stack.pop()
+            if stack:
+                stack[-1].nested_ns += elapsed
+            with self._lock:
+                stats = self.stages.get(path)
+                if stats is None:
+                    stats = self.stages[path] = StageStats()
+                stats.calls += 1
+                stats.total_ns += elapsed
+                stats.self_ns += elapsed - frame.nested_ns
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other: "Profiler | dict[str, Any]") -> None:
+        """Add the stages and counters of another profiler or its to_dict()."""
+        data = other.to_dict() if isinstance(other, Profiler) else other
+        with self._lock:
+            for entry in data["stages"]:
+                path = tuple(entry["path"])
+                stats = self.stages.setdefault(path, StageStats())
+                stats.calls += entry["calls"]
+                stats.total_ns += entry["total_ns"]
+                stats.self_ns += entry["self_ns"]
+            for name, value in data["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Aggregated stages and counters as JSON-serialisable data."""
+        return {
+            "stages": [
+                {
+                    "path": list(path),
+                    "calls": stats.calls,
+                    "total_ns": stats.total_ns,
+                    "self_ns": stats.self_ns,
+                }
+                for path, stats in sorted(self.stages.items())
+            ],
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def write_json(self, path: Path | str) -> None:
+        """Write the aggregated stats as JSON."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def collapsed_stacks(self) -> str:
+        """Self time per stage path in microseconds, in collapsed-stack format.
+
+        Each line is ``outer;inner;innermost <microseconds>``, as read by
+        flamegraph.pl, speedscope and similar tools.
+        """
+        return "".join(
+            f"{';'.join(path)} {stats.self_ns // 1000}\n"
+            for path, stats in sorted(self.stages.items())
+        )
+
+    def write_collapsed(self, path: Path | str) -> None:
+        """Write the collapsed-stack export to a file."""
+        Path(path).write_text(self.collapsed_stacks(), encoding="utf-8")
+
+    def _stack(self) -> list[_Frame]:
+        stack: list[_Frame] | None = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _install(self) -> None:
+        for owner, name, stage_name in _instrumented_methods():
+            original = owner.__dict__[name]
+            self._restore.append((owner, name, original))
+            setattr(owner, name, _timed(stage_name, original))
+        for value_object in _value_object_types():
+            original = value_object.__dict__["__post_init__"]
+            self._restore.append((value_object, "__post_init__", original))
+            setattr(
+                value_object,
+                "__post_init__",
+                _counted(f"allocations.{value_object.__name__}", original),
+            )
+
+
+def active_profiler() -> Profiler | None:
+    """The profiler currently collecting, if any."""
+    return _active
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time the enclosed block as a stage of the active profiler, if any."""
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter of the active profiler, if any."""
+    if _active is not None:
+        _active.count(name, amount)
+
+
+def _timed(stage_name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _active
+        if profiler is None:
+            return function(*args, **kwargs)
+        with profiler.stage(stage_name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _counted(counter_name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _active
+        if profiler is not None:
+            profiler.count(counter_name)
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _instrumented_methods() -> list[tuple[type, str, str]]:
+    from domain.building.aggregates.building import Building
+    from domain.building.entities import BuildingElement, Zone
+    from domain.building.services import (
+        BatchThermalCalculationService,
+        DesignHeatLoadService,
+        ThermalCalculationService,
+    )
+
+    owners: tuple[type, ...] = (
+        Building,
+        Zone,
+        BuildingElement,
+        ThermalCalculationService,
+        BatchThermalCalculationService,
+        DesignHeatLoadService,
+    )
+    return [
+        (owner, name, f"{owner.__name__}.{name}")
+        for owner in owners
+        for name, member in vars(owner).items()
+        if name.startswith("calculate_") and callable(member)
+    ]
+
+
+def _value_object_types() -> list[type]:
+    from domain.building import value_objects as building_value_objects
+    from domain.energy import value_objects as energy_value_objects
+    from domain.shared import value_objects as shared_value_objects
+    from domain.simulation import value_objects as simulation_value_objects
+
+    modules = (
+        building_value_objects,
+        energy_value_objects,
+        shared_value_objects,
+        simulation_value_objects,
+    )
+    return [
+        value_object
+        for module in modules
+        for value_object in (getattr(module, name) for name in module.__all__)
+        if "__post_init__" in vars(value_object)
+    ]
@@ -0,0 +1,33 @@
+from .building_stock_loader import (
+    CSV_COLUMNS,
+    BuildingStockLoader,
+    StockFileError,
+    StockFileFormat,
+    building_to_record,
+    write_stock_file,
+)
+from .meter_reading_loader import (
+    METER_CSV_COLUMNS,
+    DuplicatePolicy,
+    GapFillPolicy,
+    MeterFileError,
+    MeterOffsetIndex,
+    MeterReadingLoader,
+    MeterSeries,
+)
+
+__all__ = [
+    "CSV_COLUMNS",
+    "METER_CSV_COLUMNS",
+    "BuildingStockLoader",
+    "DuplicatePolicy",
+    "GapFillPolicy",
+    "MeterFileError",
+    "MeterOffsetIndex",
+    "MeterReadingLoader",
+    "MeterSeries",
+    "StockFileError",
+    "StockFileFormat",
+    "building_to_record",
+    "write_stock_file",
+]
@@ -0,0 +1,466 @@
+"""Chunked loader for long-format smart meter reading files.
+
+Meter files are CSV with one reading per row::
+
+    meter_id, timestamp, value, unit
+
+``timestamp`` is the ISO 8601 start of the interval the reading covers and
+``unit`` is an energy unit (J, kJ, MJ, Wh, kWh, MWh) for the energy used
+over the interval, or a power unit (W, kW, MW) for the mean power over it.
+The ``unit`` column may be omitted when the loader is given a default unit.
+
+Readings are aligned to the timeline of a simulation clock, one value per
+time step, and normalised to joules per time step. Readings that start off
+the time step grid or outside the timeline, and negative or non-finite
+values, are rejected and counted. Duplicate readings of a time step are
+resolved by a duplicate policy, and time steps without a reading are left
+missing (NaN) or filled by a gap fill policy.
+
+Rows of a meter must be contiguous for streaming, as they are in the usual
+per-meter exports, so only the meters of one chunk are held in memory at a
+time. Files in any row order can be read one meter at a time through an
+index of the byte ranges holding each meter's rows.
+"""
+
+import csv
+import io
+import json
+import math
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+
+from domain.energy.value_objects import Energy, Power
+from domain.simulation.entities.simulation_clock import SimulationClock
+
+METER_CSV_COLUMNS = ("meter_id", "timestamp", "value", "unit")
+
+_OPTIONAL_METER_CSV_COLUMNS = ("unit",)
+
+# Joules per unit of energy, and per unit of power held for one second
+_ENERGY_UNITS = {
+    "j": 1.0,
+    "kj": 1e3,
+    "mj": 1e6,
+    "wh": 3600.0,
+    "kwh": 3.6e6,
+    "mwh": 3.6e9,
+}
+_POWER_UNITS = {"w": 1.0, "kw": 1e3, "mw": 1e6}
+
+
+class DuplicatePolicy(Enum):
+    """How repeated readings of a meter's time step are resolved."""
+
+    FIRST = "first"
+    LAST = "last"
+    MEAN = "mean"
+    ERROR = "error"
+
+
+class GapFillPolicy(Enum):
+    """How time steps without a reading are filled."""
+
+    NONE = "none"
+    ZERO = "zero"
+    LINEAR = "linear"
+
+
+class MeterFileError(ValueError):
+    """Raised when a meter file row is malformed or out of place."""
+
+    def __init__(self, path: Path, line: int, message: str) -> None:
+        super().__init__(f"{path}:{line}: {message}")
+        self.path = path
+        self.line = line
+
+
+@dataclass(frozen=True)
+class MeterSeries:
+    """Readings of one meter aligned to a simulation timeline.
+
+    Attributes:
+        meter_id: Identifier of the meter
+        values: Energy of each time step in J, NaN where missing
+        timestep_seconds: Duration of a time step in seconds
+        duplicate_count: Readings resolved by the duplicate policy
+        rejected_count: Readings off the grid, outside the timeline or invalid
+        filled_count: Time steps filled by the gap fill policy
+    """
+
+    meter_id: str
+    values: array
+    timestep_seconds: float
+    duplicate_count: int = 0
+    rejected_count: int = 0
+    filled_count: int = 0
+
+    @property
+    def missing_count(self) -> int:
+        """Number of time steps still without a value."""
+        return sum(1 for value in self.values if value != value)
+
+    def energy(self, timestep: int) -> Energy | None:
+        """Energy used during a time step, or None if missing."""
+        value = self.values[timestep]
+        return None if value != value else Energy(joules=value)
+
+    def mean_power(self, timestep: int) -> Power | None:
+        """Mean power during a time step, or None if missing."""
+        value = self.values[timestep]
+        return None if value != value else Power(watts=value / self.timestep_seconds)
+
+    def total_energy(self) -> Energy:
+        """Energy summed over the time steps with a value."""
+        return Energy(
+            joules=math.fsum(value for value in self.values if value == value)
+        )
+
+
+@dataclass
+class MeterOffsetIndex:
+    """Byte ranges of the rows of each meter in a meter file.
+
+    Attributes:
+        file_size: Size of the indexed file, to detect a changed file
+        ranges: Start and end offsets of each run of a meter's rows
+    """
+
+    file_size: int
+    ranges: dict[str, list[tuple[int, int]]] = field(default_factory=dict)
+
+    def save(self, path: Path | str) -> None:
+        """Write the index as JSON."""
+        Path(path).write_text(
+            json.dumps({"file_size": self.file_size, "ranges": self.ranges}),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, path: Path | str) -> "MeterOffsetIndex":
+        """Read an index written by save."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            file_size=data["file_size"],
+            ranges={
+                meter_id: [(start, end) for start, end in runs]
+                for meter_id, runs in data["ranges"].items()
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def __contains__(self, meter_id: object) -> bool:
+        return meter_id in self.ranges
+
+
+class MeterReadingLoader:
+    """Loader for long-format meter reading files.
+
+    Attributes:
+        path: Path of the meter file
+        clock: Clock whose timeline readings are aligned to
+        default_unit: Unit of readings without a unit column
+        duplicates: Policy for repeated readings of a time step
+        gap_fill: Policy for time steps without a reading
+        max_gap_steps: Longest run of missing time steps filled by
+            linear interpolation
+        chunk_size: Number of meters per chunk
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        clock: SimulationClock,
+        default_unit: str | None = None,
+        duplicates: DuplicatePolicy = DuplicatePolicy.LAST,
+        gap_fill: GapFillPolicy = GapFillPolicy.NONE,
+        max_gap_steps: int = 4,
+        chunk_size: int = 1000,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+        if max_gap_steps < 0:
+            raise ValueError("Maximum gap must be non-negative")
+        if default_unit is not None:
+            _unit_scale(default_unit, 1.0)
+        self.path = Path(path)
+        self.clock = clock
+        self.default_unit = default_unit
+        self.duplicates = duplicates
+        self.gap_fill = gap_fill
+        self.max_gap_steps = max_gap_steps
+        self.chunk_size = chunk_size
+
+        self._start = clock.start_time.datetime
+        self._timestep = clock.timestep_duration.duration
+        self._timestep_seconds = self._timestep.total_seconds()
+        self._step_count = clock.total_time_steps
+        # Rows of different meters repeat the same timestamps, so each
+        # distinct timestamp is parsed once
+        self._steps: dict[str, int | None] = {}
+        self._unit_scales: dict[str | None, float] = {}
+        self._index: MeterOffsetIndex | None = None
+
+    def iter_series(self) -> Iterator[MeterSeries]:
+        """Yield the series of each meter in file order.
+
+        Raises:
+            MeterFileError: If a row is malformed or a meter's rows are
+                not contiguous
+        """
+        with self.path.open(encoding="utf-8", newline="") as stream:
+            reader = csv.reader(stream)
+            position = self._header_positions(next(reader, None))
+            if position is None:
+                return
+            builder: _SeriesBuilder | None = None
+            finished: set[str] = set()
+            for line, row in enumerate(reader, start=2):
+                if not row:
+                    continue
+                if len(row) <= position[0]:
+                    raise MeterFileError(self.path, line, "Missing meter id")
+                meter_id = row[position[0]]
+                if builder is None or meter_id != builder.meter_id:
+                    if builder is not None:
+                        finished.add(builder.meter_id)
+                        yield self._finish(builder)
+                    if meter_id in finished:
+                        raise MeterFileError(
+                            self.path,
+                            line,
+                            f"Rows of meter {meter_id} are not contiguous; "
+                            "read it through the offset index instead",
+                        )
+                    builder = _SeriesBuilder(meter_id, self._step_count)
+                self._add_row(builder, row, position, line)
+            if builder is not None:
+                yield self._finish(builder)
+
+    def iter_chunks(self) -> Iterator[list[MeterSeries]]:
+        """Yield the series of up to chunk_size meters at a time."""
+        series = self.iter_series()
+        while chunk := list(islice(series, self.chunk_size)):
+            yield chunk
+
+    def build_index(self) -> MeterOffsetIndex:
+        """Scan the file for the byte ranges of each meter's rows.
+
+        Consecutive rows of a meter share one range, so files grouped by
+        meter need one range per meter.
+        """
+        with self.path.open("rb") as stream:
+            header = stream.readline()
+            position = self._header_positions(_parse_line(header))
+            index = MeterOffsetIndex(file_size=self.path.stat().st_size)
+            if position is None:
+                self._index = index
+                return index
+            offset = len(header)
+            current: str | None = None
+            for raw in stream:
+                start, offset = offset, offset + len(raw)
+                row = _parse_line(raw)
+                if not row:
+                    continue
+                meter_id = row[position[0]]
+                runs = index.ranges.setdefault(meter_id, [])
+                if meter_id == current:
+                    runs[-1] = (runs[-1][0], offset)
+                else:
+                    runs.append((start, offset))
+                    current = meter_id
+        self._index = index
+        return index
+
+    def use_index(self, index: MeterOffsetIndex) -> None:
+        """Use an index built earlier, e.g. one loaded from disk.
+
+        Raises:
+            ValueError: If the file has changed size since it was indexed
+        """
+        if index.file_size != self.path.stat().st_size:
+            raise ValueError(f"Index does not match {self.path}; rebuild it")
+        self._index = index
+
+    def read_meter(self, meter_id: str) -> MeterSeries:
+        """Read one meter's series by random access, building the index if needed.
+
+        Raises:
+            KeyError: If the file has no rows for the meter
+        """
+        index = self._index or self.build_index()
+        runs = index.ranges[meter_id]
+        builder = _SeriesBuilder(meter_id, self._step_count)
+        with self.path.open("rb") as stream:
+            position = self._header_positions(_parse_line(stream.readline()))
+            assert position is not None
+            for start, end in runs:
+                stream.seek(start)
+                text = stream.read(end - start).decode("utf-8")
+                for row in csv.reader(io.StringIO(text, newline="")):
+                    if row:
+                        self._add_row(builder, row, position, 0)
+        return self._finish(builder)
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return f"MeterReadingLoader(path={str(self.path)!r})"
+
+    def _header_positions(
+        self, header: list[str] | None
+    ) -> tuple[int, int, int, int | None] | None:
+        if header is None:
+            return None
+        header = [name.strip() for name in header]
+        missing = [
+            name
+            for name in METER_CSV_COLUMNS
+            if name not in header and name not in _OPTIONAL_METER_CSV_COLUMNS
+        ]
+        if missing:
+            raise MeterFileError(self.path, 1, f"Missing columns: {', '.join(missing)}")
+        if "unit" not in header and self.default_unit is None:
+            raise MeterFileError(
+                self.path, 1, "Missing unit column and no default unit given"
+            )
+        return (
+            header.index("meter_id"),
+            header.index("timestamp"),
+            header.index("value"),
+            header.index("unit") if "unit" in header else None,
+        )
+
+    def _add_row(
+        self,
+        builder: "_SeriesBuilder",
+        row: list[str],
+        position: tuple[int, int, int, int | None],
+        line: int,
+    ) -> None:
+        timestamp = row[position[1]] if len(row) > position[1] else ""
+        unit = row[position[3]] if position[3] is not None else self.default_unit
+        try:
+            step = self._steps.get(timestamp, -1)
+            if step == -1:
+                step = self._step(timestamp)
+            joules = self._unit_scales.get(unit)
+            if joules is None:
+                joules = _unit_scale(unit or self.default_unit, self._timestep_seconds)
+                self._unit_scales[unit] = joules
+            value = float(row[position[2]])
+        except (IndexError, TypeError, ValueError) as error:
+            raise MeterFileError(self.path, line, str(error)) from error
+        if step is None or not math.isfinite(value) or value < 0:
+            builder.rejected_count += 1
+            return
+        if not builder.add(step, value * joules, self.duplicates):
+            raise MeterFileError(
+                self.path,
+                line,
+                f"Duplicate reading of meter {builder.meter_id} at {timestamp}",
+            )
+
+    def _step(self, timestamp: str) -> int | None:
+        offset = datetime.fromisoformat(timestamp) - self._start
+        step, remainder = divmod(offset, self._timestep)
+        result = step if not remainder and 0 <= step < self._step_count else None
+        if len(self._steps) > 2 * self._step_count + 1024:
+            # Off-grid timestamps are rarely repeated; keep the cache bounded
+            self._steps.clear()
+        self._steps[timestamp] = result
+        return result
+
+    def _finish(self, builder: "_SeriesBuilder") -> MeterSeries:
+        values = builder.values
+        if self.duplicates == DuplicatePolicy.MEAN:
+            for step, count in builder.counts.items():
+                values[step] /= count
+        filled = 0
+        if self.gap_fill == GapFillPolicy.ZERO:
+            for step, value in enumerate(values):
+                if value != value:
+                    values[step] = 0.0
+                    filled += 1
+        elif self.gap_fill == GapFillPolicy.LINEAR:
+            filled = _interpolate_gaps(values, self.max_gap_steps)
+        return MeterSeries(
+            meter_id=builder.meter_id,
+            values=values,
+            timestep_seconds=self._timestep_seconds,
+            duplicate_count=builder.duplicate_count,
+            rejected_count=builder.rejected_count,
+            filled_count=filled,
+        )
+
+
+class _SeriesBuilder:
+    """Accumulates one meter's readings into a time step array."""
+
+    def __init__(self, meter_id: str, step_count: int) -> None:
+        self.meter_id = meter_id
+        self.values = array("d", [math.nan]) * step_count
+        self.counts: dict[int, int] = {}
+        self.duplicate_count = 0
+        self.rejected_count = 0
+
+    def add(self, step: int, joules: float, duplicates: DuplicatePolicy) -> bool:
+        """Add a reading; False if it is a duplicate the policy rejects."""
+        current = self.values[step]
+        if current != current:
+            self.values[step] = joules
+            return True
+        if duplicates == DuplicatePolicy.ERROR:
+            return False
+        self.duplicate_count += 1
+        if duplicates == DuplicatePolicy.LAST:
+            self.values[step] = joules
+        elif duplicates == DuplicatePolicy.MEAN:
+            self.values[step] += joules
+            self.counts[step] = self.counts.get(step, 1) + 1
+        return True
+
+
+def _unit_scale(unit: str | None, timestep_seconds: float) -> float:
+    # Joules per time step for one unit of the reading
+    if unit is None:
+        raise ValueError("Reading has no unit")
+    key = unit.strip().lower()
+    if key in _ENERGY_UNITS:
+        return _ENERGY_UNITS[key]
+    if key in _POWER_UNITS:
+        return _POWER_UNITS[key] * timestep_seconds
+    raise ValueError(f"Unknown unit '{unit}'")
+
+
+def _interpolate_gaps(values: array, max_gap_steps: int) -> int:
+    # Fill interior runs of NaN up to max_gap_steps long by linear
+    # interpolation between the readings either side
+    filled = 0
+    previous: int | None = None
+    for step, value in enumerate(values):
+        if value != value:
+            continue
+        if previous is not None and 1 < step - previous <= max_gap_steps + 1:
+            start, end = values[previous], value
+            span = step - previous
+            for gap in range(1, span):
+                values[previous + gap] = start + (end - start) * gap / span
+            filled += span - 1
+        previous = step
+    return filled
+
+
+def _parse_line(raw: bytes) -> list[str] | None:
+    text = raw.decode("utf-8")
+    if not text.strip():
+        return [] if raw else None
+    if '"' not in text:
+        return text.rstrip("\r\n").split(",")
+    return next(csv.reader([text]))
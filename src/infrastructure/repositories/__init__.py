@@ -0,0 +1,13 @@
+from .indexed_element_repository import (
+    IndexedElementRepository,
+    OrientationRange,
+    SortedIndex,
+    ValueRange,
+)
+
+__all__ = [
+    "IndexedElementRepository",
+    "OrientationRange",
+    "SortedIndex",
+    "ValueRange",
+]
@@ -0,0 +1,472 @@
+"""Indexed, read-only repository of building elements across a portfolio.
+
+The repository indexes a ``BuildingColumns`` portfolio once so that attribute
+queries such as "north-facing external walls with R < 1 in buildings built
+before 1930" touch only candidate rows instead of scanning every element:
+
+- hash indexes map building and element identifiers to row indices;
+- sorted indexes over thermal resistance, area and pitch answer range
+  predicates with a binary search;
+- orientation is bucketed into fixed sectors and thermal boundary type into
+  one bucket per type;
+- numeric building attributes that are not part of the domain model (for
+  example ``year_built``) get sorted indexes over buildings, mapped to their
+  elements through a building → elements offset table.
+
+A query starts from the most selective indexed predicate and checks the
+remaining predicates against the raw columns for those candidates only.
+Orientation sectors are coarser than the predicate, so orientation is always
+checked against the raw column, even when its index supplies the candidates.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from domain.building.columns import BOUNDARY_TYPE_CODES, BuildingColumns
+from domain.building.enums import ThermalBoundaryType
+
+if TYPE_CHECKING:
+    from domain.building.aggregates.building import Building
+
+ORIENTATION_SECTOR_DEGREES = 22.5
+_ORIENTATION_SECTORS = int(360 / ORIENTATION_SECTOR_DEGREES)
+
+
+@dataclass(frozen=True)
+class ValueRange:
+    """Half-open range ``minimum <= value < maximum`` used in queries.
+
+    Attributes:
+        minimum: Inclusive lower bound, or None for no lower bound
+        maximum: Exclusive upper bound, or None for no upper bound
+    """
+
+    minimum: float | None = None
+    maximum: float | None = None
+
+    def __post_init__(self) -> None:
+        if (
+            self.minimum is not None
+            and self.maximum is not None
+            and self.maximum < self.minimum
+        ):
+            raise ValueError("Range maximum must not be below its minimum")
+
+    def __contains__(self, value: float) -> bool:
+        if self.minimum is not None and value < self.minimum:
+            return False
+        return self.maximum is None or value < self.maximum
+
+
+@dataclass(frozen=True)
+class OrientationRange:
+    """Orientation sector ``start <= degrees < end``, wrapping through north.
+
+    ``OrientationRange(315, 45)`` selects north-facing elements.
+
+    Attributes:
+        start: Inclusive start of the sector in degrees
+        end: Exclusive end of the sector in degrees
+    """
+
+    start: float
+    end: float
+
+    def __post_init__(self) -> None:
+        for degrees in (self.start, self.end):
+            if degrees < 0 or degrees > 360:
+                raise ValueError("Orientation must be between 0 and 360")
+
+    @property
+    def wraps(self) -> bool:
+        return self.end < self.start
+
+    def sectors(self) -> list[int]:
+        """Indices of the orientation index buckets overlapping the range."""
+        first = _orientation_sector(self.start)
+        last = _orientation_sector(max(self.end - 1e-9, 0.0))
+        if not self.wraps:
+            return list(range(first, last + 1))
+        return list(range(first, _ORIENTATION_SECTORS)) + list(range(last + 1))
+
+    def __contains__(self, degrees: float) -> bool:
+        if self.wraps:
+            return degrees >= self.start or degrees < self.end
+        return self.start <= degrees < self.end
+
+
+class SortedIndex:
+    """Row indices ordered by a column's values, for range lookups.
+
+    Attributes:
+        values: Column values in ascending order
+        rows: Row index of each entry of ``values``
+    """
+
+    def __init__(self, column: Sequence[float]) -> None:
+        order = sorted(range(len(column)), key=column.__getitem__)
+        self.values = array("d", (column[row] for row in order))
+        self.rows = array("l", order)
+
+    def lookup(self, value_range: ValueRange) -> array:
+        """Return the rows whose value lies in the range, in value order."""
+        start = (
+            0
+            if value_range.minimum is None
+            else bisect_left(self.values, value_range.minimum)
+        )
+        stop = (
+            len(self.values)
+            if value_range.maximum is None
+            else bisect_left(self.values, value_range.maximum)
+        )
+        return self.rows[start:stop]
+
+    def count(self, value_range: ValueRange) -> int:
+        """Number of rows whose value lies in the range."""
+        start = (
+            0
+            if value_range.minimum is None
+            else bisect_left(self.values, value_range.minimum)
+        )
+        stop = (
+            len(self.values)
+            if value_range.maximum is None
+            else bisect_left(self.values, value_range.maximum)
+        )
+        return max(stop - start, 0)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+# Candidate rows of a predicate: index buckets, a sorted index range, or the
+# buildings whose elements are candidates
+_CandidateSource = list[array] | tuple[SortedIndex, ValueRange] | array
+
+
+class IndexedElementRepository:
+    """Query building elements of a portfolio through in-memory indexes.
+
+    Element query results are arrays of element row indices into
+    ``columns``, in ascending order; use ``element_ids`` or ``select`` to turn
+    them into identifiers or a columnar subset.
+
+    Attributes:
+        columns: The indexed portfolio
+        building_attributes: Names of the indexed building attributes
+    """
+
+    def __init__(
+        self,
+        columns: BuildingColumns,
+        building_attributes: Mapping[str, Sequence[float]] | None = None,
+    ) -> None:
+        """Build the indexes.
+
+        Args:
+            columns: Portfolio to index
+            building_attributes: Extra numeric attribute columns with one value
+                per building, keyed by attribute name
+
+        Raises:
+            ValueError: If an attribute column does not have one value per
+                building
+        """
+        self.columns = columns
+        self._building_index = {
+            building_id: index for index, building_id in enumerate(columns.building_ids)
+        }
+        self._element_index = {
+            element_id: index for index, element_id in enumerate(columns.element_ids)
+        }
+        self._element_building = array(
+            "l",
+            (columns.zone_building[zone] for zone in columns.element_zone),
+        )
+        self._building_offsets, self._building_elements = self._group_by_building()
+
+        self._sorted = {
+            "thermal_resistance": SortedIndex(columns.element_thermal_resistance),
+            "area": SortedIndex(columns.element_area),
+            "pitch": SortedIndex(columns.element_pitch),
+        }
+        self._boundary_buckets = self._buckets(
+            columns.element_boundary_type, len(BOUNDARY_TYPE_CODES)
+        )
+        self._orientation_buckets = self._buckets(
+            (_orientation_sector(degrees) for degrees in columns.element_orientation),
+            _ORIENTATION_SECTORS,
+        )
+
+        self._attribute_values: dict[str, array] = {}
+        self._attribute_indexes: dict[str, SortedIndex] = {}
+        for name, values in (building_attributes or {}).items():
+            if len(values) != columns.building_count:
+                raise ValueError(
+                    f"Building attribute {name!r} needs one value per building"
+                )
+            self._attribute_values[name] = array("d", values)
+            self._attribute_indexes[name] = SortedIndex(self._attribute_values[name])
+
+    @classmethod
+    def from_buildings(
+        cls,
+        buildings: Iterable["Building"],
+        building_attributes: Mapping[UUID, Mapping[str, float]] | None = None,
+    ) -> "IndexedElementRepository":
+        """Index building aggregates.
+
+        Args:
+            buildings: Buildings to index
+            building_attributes: Numeric attributes per building identifier;
+                every building must define the same attribute names
+
+        Raises:
+            ValueError: If a building lacks an attribute others define
+        """
+        columns = BuildingColumns.from_buildings(list(buildings))
+        attribute_columns: dict[str, list[float]] = {}
+        if building_attributes:
+            names = set().union(*building_attributes.values())
+            for name in sorted(names):
+                try:
+                    attribute_columns[name] = [
+                        building_attributes[building_id][name]
+                        for building_id in columns.building_ids
+                    ]
+                except KeyError as error:
+                    raise ValueError(
+                        f"Building attribute {name!r} missing for a building"
+                    ) from error
+        return cls(columns, attribute_columns)
+
+    @property
+    def building_attributes(self) -> tuple[str, ...]:
+        return tuple(self._attribute_indexes)
+
+    def building_row(self, building_id: UUID) -> int:
+        """Row index of a building.
+
+        Raises:
+            KeyError: If the building is not in the repository
+        """
+        return self._building_index[building_id]
+
+    def element_row(self, element_id: UUID) -> int:
+        """Row index of a building element.
+
+        Raises:
+            KeyError: If the element is not in the repository
+        """
+        return self._element_index[element_id]
+
+    def building_elements(self, building_id: UUID) -> array:
+        """Element rows of a building, in ascending order."""
+        building = self._building_index[building_id]
+        return self._building_elements[
+            self._building_offsets[building] : self._building_offsets[building + 1]
+        ]
+
+    def query(
+        self,
+        boundary_types: Iterable[ThermalBoundaryType] | None = None,
+        orientation: OrientationRange | None = None,
+        thermal_resistance: ValueRange | None = None,
+        area: ValueRange | None = None,
+        pitch: ValueRange | None = None,
+        building_attributes: Mapping[str, ValueRange] | None = None,
+    ) -> array:
+        """Find the elements matching every given predicate.
+
+        Args:
+            boundary_types: Accepted thermal boundary types
+            orientation: Orientation sector of the elements
+            thermal_resistance: Construction resistance range in m²·K/W
+            area: Element area range in m²
+            pitch: Pitch range in degrees
+            building_attributes: Ranges on indexed building attributes
+
+        Returns:
+            Matching element rows in ascending order
+
+        Raises:
+            KeyError: If a building attribute is not indexed
+        """
+        # (candidate count, candidate rows, whether every candidate matches)
+        candidates: list[tuple[int, _CandidateSource, bool]] = []
+        filters: list[Callable[[int], bool]] = []
+
+        if boundary_types is not None:
+            codes = {BOUNDARY_TYPE_CODES[type_] for type_ in boundary_types}
+            buckets = [self._boundary_buckets[code] for code in codes]
+            candidates.append((sum(map(len, buckets)), buckets, True))
+            boundary_column = self.columns.element_boundary_type
+            filters.append(lambda row: boundary_column[row] in codes)
+
+        if orientation is not None:
+            buckets = [
+                self._orientation_buckets[sector] for sector in orientation.sectors()
+            ]
+            candidates.append((sum(map(len, buckets)), buckets, False))
+            orientation_column = self.columns.element_orientation
+            filters.append(lambda row: orientation_column[row] in orientation)
+
+        for name, value_range, column in (
+            (
+                "thermal_resistance",
+                thermal_resistance,
+                self.columns.element_thermal_resistance,
+            ),
+            ("area", area, self.columns.element_area),
+            ("pitch", pitch, self.columns.element_pitch),
+        ):
+            if value_range is None:
+                continue
+            index = self._sorted[name]
+            candidates.append((index.count(value_range), (index, value_range), True))
+            filters.append(_in_range(column, value_range))
+
+        for name, value_range in (building_attributes or {}).items():
+            index = self._attribute_indexes[name]
+            buildings = index.lookup(value_range)
+            element_count = sum(
+                self._building_offsets[building + 1] - self._building_offsets[building]
+                for building in buildings
+            )
+            candidates.append((element_count, buildings, True))
+            filters.append(
+                _building_in_range(
+                    self._attribute_values[name], self._element_building, value_range
+                )
+            )
+
+        if not candidates:
+            return array("l", range(self.columns.element_count))
+
+        best = min(range(len(candidates)), key=lambda position: candidates[position][0])
+        _, source, exact = candidates[best]
+        rows = self._candidate_rows(source)
+        if exact:
+            del filters[best]
+        return array(
+            "l", sorted(row for row in rows if all(check(row) for check in filters))
+        )
+
+    def element_ids(self, rows: Iterable[int]) -> list[UUID]:
+        """Identifiers of the given element rows."""
+        element_ids = self.columns.element_ids
+        return [element_ids[row] for row in rows]
+
+    def select(self, rows: Iterable[int]) -> BuildingColumns:
+        """Copy the given element rows, with their zones and buildings, into columns.
+
+        Zones and buildings keep their relative order; only those owning at
+        least one selected element are included, with all of their zones'
+        thermal bridge junctions.
+        """
+        source = self.columns
+        selected = BuildingColumns()
+        zone_map: dict[int, int] = {}
+        building_map: dict[int, int] = {}
+        for row in sorted(rows):
+            zone = source.element_zone[row]
+            if zone not in zone_map:
+                building = source.zone_building[zone]
+                if building not in building_map:
+                    building_map[building] = selected.append_building(
+                        source.building_ids[building]
+                    )
+                zone_map[zone] = selected.append_zone(
+                    zone_id=source.zone_ids[zone],
+                    building_index=building_map[building],
+                    area=source.zone_area[zone],
+                    volume=source.zone_volume[zone],
+                    air_change_rate=source.zone_air_change_rate[zone],
+                    setpoint=source.zone_setpoint[zone],
+                    thermal_bridges=source.zone_thermal_bridges[zone],
+                )
+            selected.append_element(
+                element_id=source.element_ids[row],
+                zone_index=zone_map[zone],
+                boundary_type=source.element_boundary_type[row],
+                area=source.element_area[row],
+                thermal_resistance=source.element_thermal_resistance[row],
+                areal_heat_capacity=source.element_areal_heat_capacity[row],
+                orientation=source.element_orientation[row],
+                pitch=source.element_pitch[row],
+                exposed_perimeter=source.element_exposed_perimeter[row],
+            )
+        for junction, zone in enumerate(source.junction_zone):
+            if zone in zone_map:
+                selected.append_junction(
+                    zone_index=zone_map[zone],
+                    junction_type=source.junction_type[junction],
+                    length=source.junction_length[junction],
+                )
+        return selected
+
+    def __len__(self) -> int:
+        return self.columns.element_count
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"IndexedElementRepository(buildings={self.columns.building_count}, "
+            f"elements={self.columns.element_count})"
+        )
+
+    def _candidate_rows(self, source: _CandidateSource) -> Iterable[int]:
+        if isinstance(source, tuple):
+            index, value_range = source
+            return index.lookup(value_range)
+        if isinstance(source, list):
+            return (row for bucket in source for row in bucket)
+        offsets = self._building_offsets
+        elements = self._building_elements
+        return (
+            row
+            for building in source
+            for row in elements[offsets[building] : offsets[building + 1]]
+        )
+
+    def _group_by_building(self) -> tuple[array, array]:
+        building_count = self.columns.building_count
+        offsets = array("l", bytes(8 * (building_count + 1)))
+        for building in self._element_building:
+            offsets[building + 1] += 1
+        for building in range(building_count):
+            offsets[building + 1] += offsets[building]
+        positions = array("l", offsets)
+        elements = array("l", bytes(8 * len(self._element_building)))
+        for row, building in enumerate(self._element_building):
+            elements[positions[building]] = row
+            positions[building] += 1
+        return offsets, elements
+
+    @staticmethod
+    def _buckets(codes: Iterable[int], bucket_count: int) -> list[array]:
+        buckets = [array("l") for _ in range(bucket_count)]
+        for row, code in enumerate(codes):
+            buckets[code].append(row)
+        return buckets
+
+
+def _in_range(
+    column: Sequence[float], value_range: ValueRange
+) -> Callable[[int], bool]:
+    return lambda row: column[row] in value_range
+
+
+def _building_in_range(
+    values: Sequence[float], element_building: Sequence[int], value_range: ValueRange
+) -> Callable[[int], bool]:
+    return lambda row: values[element_building[row]] in value_range
+
+
+def _orientation_sector(degrees: float) -> int:
+    return int(degrees // ORIENTATION_SECTOR_DEGREES) % _ORIENTATION_SECTORS
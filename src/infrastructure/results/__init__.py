@@ -0,0 +1,15 @@
+from .result_store import (
+    RESULT_STORE_SUFFIX,
+    Aggregate,
+    ResultStore,
+    ResultStoreFormatError,
+    ResultStoreWriter,
+)
+
+__all__ = [
+    "RESULT_STORE_SUFFIX",
+    "Aggregate",
+    "ResultStore",
+    "ResultStoreFormatError",
+    "ResultStoreWriter",
+]
@@ -0,0 +1,598 @@
+"""Memory-mapped store of simulated time series, indexed by building.
+
+A result store holds one series per zone for every stored variable, such as
+zone air temperature or heating power, over the steps of a simulation clock.
+Series are laid out so that a query for a few buildings over a time range
+touches only the pages holding those buildings and steps. Layout
+(little-endian, version 1):
+
+    header      magic, version, section count, typecode and dimensions
+    sections    (offset, length) of every section, in SECTIONS order
+    values      the series, one block after another
+    metadata    JSON with the variable names and the clock timeline
+    index       building ids, each building's first zone row, and an
+                open-addressing hash table mapping building id to index
+
+Buildings are grouped into blocks of ``block_size``. Within a block, each
+variable is split into time chunks of ``chunk_steps``, and each chunk holds
+the rows of the block's zones one after another:
+
+    block 0: variable 0: chunk 0: zone rows  (rows × chunk_steps values)
+                         chunk 1: zone rows
+             variable 1: ...
+    block 1: ...
+
+so the position of any (building, variable, step) follows from the zone row
+offsets alone. Aggregations run chunk by chunk over views of the mapped file
+and accumulate in float64, whatever the storage precision.
+"""
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from domain.shared.precision import DOUBLE_PRECISION, PrecisionPolicy
+from domain.simulation.entities.simulation_clock import SimulationClock
+from infrastructure.catalogue.building_catalogue import (
+    UuidColumn,
+    build_id_index,
+    lookup_id_index,
+    view_section,
+)
+
+RESULT_STORE_SUFFIX = ".hemres"
+MAGIC = b"HEMRES\x00\x00"
+VERSION = 1
+
+# (section name, array typecode); "16s" holds raw UUID bytes, "" is the value
+# section, whose typecode is the store's storage precision
+SECTIONS: tuple[tuple[str, str], ...] = (
+    ("values", ""),
+    ("metadata", "B"),
+    ("building_id", "16s"),
+    ("building_row_start", "q"),
+    ("index_slot", "I"),
+)
+
+# magic, version, section count, typecode, then step count, chunk steps,
+# block size, building count and row count
+_HEADER = struct.Struct("<8sII1s7x5Q")
+_SECTION = struct.Struct("<QQ")
+
+DEFAULT_BLOCK_SIZE = 256
+_DEFAULT_CHUNK = timedelta(days=7)
+
+
+class ResultStoreFormatError(ValueError):
+    """Raised when a file is not a readable result store."""
+
+
+class Aggregate(Enum):
+    """Reduction of a series over a time range."""
+
+    SUM = "sum"
+    MEAN = "mean"
+    MIN = "min"
+    MAX = "max"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value
+
+
+@dataclass
+class _Accumulator:
+    # Keeps only what its aggregate needs: a sum for SUM and MEAN, otherwise
+    # the running extreme
+    aggregate: Aggregate
+    value: float = math.nan
+    count: int = 0
+
+    def add(self, values: Sequence[float]) -> None:
+        if not len(values):
+            return
+        if self.aggregate in (Aggregate.SUM, Aggregate.MEAN):
+            self._combine(sum(values))
+        elif self.aggregate == Aggregate.MIN:
+            self._combine(min(values))
+        else:
+            self._combine(max(values))
+        self.count += len(values)
+
+    def merge(self, other: "_Accumulator") -> None:
+        if other.count:
+            self._combine(other.value)
+            self.count += other.count
+
+    def _combine(self, value: float) -> None:
+        if not self.count:
+            self.value = value
+        elif self.aggregate in (Aggregate.SUM, Aggregate.MEAN):
+            self.value += value
+        elif self.aggregate == Aggregate.MIN:
+            self.value = min(self.value, value)
+        else:
+            self.value = max(self.value, value)
+
+    def result(self) -> float:
+        if self.count and self.aggregate == Aggregate.MEAN:
+            return self.value / self.count
+        return self.value
+
+
+class ResultStore:
+    """Read-only, memory-mapped result store.
+
+    Opening a store maps the file and reads only the header, metadata and
+    index. Queries select buildings by id, a variable by name and optionally
+    a time range; read() copies out just the selected values and aggregate()
+    reduces them in place without copying.
+
+    Attributes:
+        path: Path of the store file
+        variables: Names of the stored variables
+        start_time: Start of the first step
+        timestep: Duration of each step
+        step_count: Number of steps of every series
+        chunk_steps: Steps per time chunk
+        block_size: Buildings per block
+        precision: Storage precision of the values
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as stream:
+            self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._sections: dict[str, Any] = {}
+        try:
+            self._read_sections()
+        except Exception:
+            self.close()
+            raise
+        self.building_ids = UuidColumn(self._sections["building_id"])
+
+    def _read_sections(self) -> None:
+        if sys.byteorder != "little":
+            raise NotImplementedError("Result stores need a little-endian host")
+        if len(self._view) < _HEADER.size:
+            raise ResultStoreFormatError(f"{self.path} is too short to be a store")
+        (
+            magic,
+            version,
+            section_count,
+            typecode,
+            self.step_count,
+            self.chunk_steps,
+            self.block_size,
+            building_count,
+            row_count,
+        ) = _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise ResultStoreFormatError(f"{self.path} is not a result store")
+        if version != VERSION:
+            raise ResultStoreFormatError(
+                f"{self.path} has result store version {version}, expected {VERSION}"
+            )
+        if section_count != len(SECTIONS):
+            raise ResultStoreFormatError(f"{self.path} has an unexpected section count")
+
+        for position, (name, section_typecode) in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(
+                self._view, _HEADER.size + position * _SECTION.size
+            )
+            if offset + length > len(self._view):
+                raise ResultStoreFormatError(f"{self.path} is truncated")
+            data = self._view[offset : offset + length]
+            if section_typecode == "":
+                section_typecode = typecode.decode("ascii")
+            self._sections[name] = view_section(data, section_typecode)
+
+        metadata = json.loads(bytes(self._sections["metadata"]))
+        self.variables: tuple[str, ...] = tuple(metadata["variables"])
+        self.start_time = datetime.fromisoformat(metadata["start"])
+        self.timestep = timedelta(seconds=metadata["timestep_seconds"])
+        self.precision = PrecisionPolicy.from_name(metadata["precision"])
+        self._row_start = self._sections["building_row_start"]
+        self._values = self._sections["values"]
+        expected = row_count * self.step_count * len(self.variables)
+        if len(self._row_start) != building_count + 1 or len(self._values) != expected:
+            raise ResultStoreFormatError(f"{self.path} has inconsistent sections")
+
+    def index_of(self, building_id: UUID) -> int:
+        """Find the index of a building by id.
+
+        Raises:
+            KeyError: If the building is not in the store
+        """
+        return lookup_id_index(
+            self._sections["index_slot"], self._sections["building_id"], building_id
+        )
+
+    def __contains__(self, building_id: object) -> bool:
+        if not isinstance(building_id, UUID):
+            return False
+        try:
+            self.index_of(building_id)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self.building_ids)
+
+    def zone_count(self, building_id: UUID) -> int:
+        """Number of zone series a building has for each variable."""
+        index = self.index_of(building_id)
+        return self._row_start[index + 1] - self._row_start[index]
+
+    def step_range(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> range:
+        """Steps that begin in the half-open interval [start, end).
+
+        Args:
+            start: Earliest step start, defaults to the start of the series
+            end: End of the interval, defaults to the end of the series
+        """
+        first = 0 if start is None else self._step_at(start)
+        last = self.step_count if end is None else self._step_at(end)
+        first = min(max(first, 0), self.step_count)
+        return range(first, max(min(last, self.step_count), first))
+
+    def _step_at(self, moment: datetime) -> int:
+        # First step that begins at or after the moment
+        return math.ceil((moment - self.start_time) / self.timestep)
+
+    def read(
+        self,
+        building_ids: Iterable[UUID],
+        variable: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[UUID, list[array]]:
+        """Copy out the series of some buildings over a time range.
+
+        Args:
+            building_ids: Buildings to read
+            variable: Name of the variable
+            start: Earliest step start, defaults to the start of the series
+            end: End of the interval, defaults to the end of the series
+
+        Returns:
+            For each building, one array per zone holding the steps in range
+
+        Raises:
+            KeyError: If a building or the variable is not in the store
+        """
+        steps = self.step_range(start, end)
+        results: dict[UUID, list[array]] = {}
+        for building_id, index in self._locate(building_ids):
+            series = [
+                array(self.precision.typecode)
+                for _ in range(self._row_start[index + 1] - self._row_start[index])
+            ]
+            for views in self._chunk_views(index, variable, steps):
+                for zone, view in enumerate(views):
+                    series[zone].frombytes(view.cast("B"))
+            results[building_id] = series
+        return results
+
+    def aggregate(
+        self,
+        building_ids: Iterable[UUID],
+        variable: str,
+        aggregate: Aggregate,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[UUID, float]:
+        """Reduce each building's series over all its zones and a time range.
+
+        Returns:
+            For each building, the aggregate of its zone values over the
+            steps in range, or NaN when the range is empty
+        """
+        return {
+            building_id: _merged(accumulators, aggregate).result()
+            for building_id, accumulators in self._accumulate(
+                building_ids, variable, aggregate, start, end
+            )
+        }
+
+    def aggregate_zones(
+        self,
+        building_ids: Iterable[UUID],
+        variable: str,
+        aggregate: Aggregate,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[UUID, array]:
+        """Reduce each zone series of some buildings over a time range.
+
+        Returns:
+            For each building, the aggregate of each zone's values over the
+            steps in range, or NaN when the range is empty
+        """
+        return {
+            building_id: array(
+                "d", (accumulator.result() for accumulator in accumulators)
+            )
+            for building_id, accumulators in self._accumulate(
+                building_ids, variable, aggregate, start, end
+            )
+        }
+
+    def _accumulate(
+        self,
+        building_ids: Iterable[UUID],
+        variable: str,
+        aggregate: Aggregate,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> Iterator[tuple[UUID, list[_Accumulator]]]:
+        steps = self.step_range(start, end)
+        for building_id, index in self._locate(building_ids):
+            accumulators = [
+                _Accumulator(aggregate)
+                for _ in range(self._row_start[index + 1] - self._row_start[index])
+            ]
+            for views in self._chunk_views(index, variable, steps):
+                for accumulator, view in zip(accumulators, views):
+                    accumulator.add(view)
+            yield building_id, accumulators
+
+    def _locate(self, building_ids: Iterable[UUID]) -> list[tuple[UUID, int]]:
+        # Visiting buildings in file order reads each block front to back
+        return sorted(
+            ((building_id, self.index_of(building_id)) for building_id in building_ids),
+            key=lambda located: located[1],
+        )
+
+    def _chunk_views(
+        self, index: int, variable: str, steps: range
+    ) -> Iterator[list[memoryview]]:
+        """Views of a building's zone rows in each chunk overlapping steps."""
+        try:
+            variable_index = self.variables.index(variable)
+        except ValueError:
+            raise KeyError(f"No variable '{variable}' in {self.path}") from None
+        if not steps:
+            return
+        row_start = self._row_start
+        block = index // self.block_size
+        block_first_row = row_start[block * self.block_size]
+        block_rows = (
+            row_start[min((block + 1) * self.block_size, len(self))] - block_first_row
+        )
+        first_row = row_start[index] - block_first_row
+        zone_count = row_start[index + 1] - row_start[index]
+        variable_base = (
+            block_first_row * self.step_count * len(self.variables)
+            + variable_index * block_rows * self.step_count
+        )
+        chunk_steps = self.chunk_steps
+        first_chunk = steps.start // chunk_steps
+        last_chunk = (steps.stop - 1) // chunk_steps
+        for chunk_start in range(
+            first_chunk * chunk_steps, (last_chunk + 1) * chunk_steps, chunk_steps
+        ):
+            chunk_length = min(chunk_steps, self.step_count - chunk_start)
+            first = max(steps.start - chunk_start, 0)
+            last = min(steps.stop - chunk_start, chunk_length)
+            row = variable_base + chunk_start * block_rows + first_row * chunk_length
+            views = []
+            for _ in range(zone_count):
+                views.append(self._values[row + first : row + last])
+                row += chunk_length
+            yield views
+
+    def close(self) -> None:
+        """Release the memory map."""
+        for section in self._sections.values():
+            section.release()
+        self._sections = {}
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"ResultStore(path='{self.path}', buildings={len(self)}, "
+            f"variables={list(self.variables)}, steps={self.step_count})"
+        )
+
+
+class ResultStoreWriter:
+    """Writes simulated series to a result store, one building at a time.
+
+    Buildings are buffered until a block is complete and then written out,
+    so memory holds at most one block of series.
+
+    Attributes:
+        path: Path of the store file
+        variables: Names of the stored variables
+        precision: Storage precision of the values
+        chunk_steps: Steps per time chunk
+        block_size: Buildings per block
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        clock: SimulationClock,
+        variables: Sequence[str],
+        precision: PrecisionPolicy = DOUBLE_PRECISION,
+        chunk_steps: int | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        if sys.byteorder != "little":
+            raise NotImplementedError("Result stores need a little-endian host")
+        if not variables or len(set(variables)) != len(variables):
+            raise ValueError("Variables must be distinct and at least one")
+        if block_size <= 0:
+            raise ValueError("Block size must be positive")
+        self.path = Path(path)
+        self.variables = tuple(variables)
+        self.precision = precision
+        self.block_size = block_size
+        self._start = clock.start_time.datetime
+        self._timestep = clock.timestep_duration.duration
+        self._step_count = clock.total_time_steps
+        self.chunk_steps = (
+            chunk_steps
+            if chunk_steps is not None
+            else max(1, round(_DEFAULT_CHUNK / self._timestep))
+        )
+        if self.chunk_steps <= 0:
+            raise ValueError("Chunk steps must be positive")
+
+        self._building_ids: list[UUID] = []
+        self._row_start = array("q", [0])
+        self._block: list[dict[str, list[array]]] = []
+        self._stream = self.path.open("wb")
+        self._values_offset = _align(_HEADER.size + len(SECTIONS) * _SECTION.size)
+        self._stream.write(b"\x00" * self._values_offset)
+
+    def add(
+        self, building_id: UUID, series: Mapping[str, Sequence[Sequence[float]]]
+    ) -> None:
+        """Add the series of one building.
+
+        Args:
+            building_id: Id of the building
+            series: For each variable, one series per zone with a value for
+                every step of the clock; all variables need the same zones
+
+        Raises:
+            ValueError: If a variable is missing or a series has the wrong
+                shape
+        """
+        if set(series) != set(self.variables):
+            raise ValueError(
+                f"Building {building_id} needs series for exactly "
+                f"{', '.join(self.variables)}"
+            )
+        zone_count = len(series[self.variables[0]])
+        if zone_count == 0:
+            raise ValueError(f"Building {building_id} has no zone series")
+        rows: dict[str, list[array]] = {}
+        for variable in self.variables:
+            zones = series[variable]
+            if len(zones) != zone_count:
+                raise ValueError(
+                    f"Building {building_id} has {len(zones)} '{variable}' series, "
+                    f"expected {zone_count}"
+                )
+            rows[variable] = [self.precision.storage_array(zone) for zone in zones]
+            if any(len(row) != self._step_count for row in rows[variable]):
+                raise ValueError(
+                    f"Building {building_id} '{variable}' series need "
+                    f"{self._step_count} values"
+                )
+        self._building_ids.append(building_id)
+        self._row_start.append(self._row_start[-1] + zone_count)
+        self._block.append(rows)
+        if len(self._block) == self.block_size:
+            self._flush_block()
+
+    def _flush_block(self) -> None:
+        write = self._stream.write
+        for variable in self.variables:
+            rows = [row for building in self._block for row in building[variable]]
+            for chunk_start in range(0, self._step_count, self.chunk_steps):
+                chunk_stop = chunk_start + self.chunk_steps
+                for row in rows:
+                    write(memoryview(row)[chunk_start:chunk_stop])
+        self._block = []
+
+    def close(self) -> int:
+        """Write the index and header, and close the file.
+
+        Returns:
+            The number of buildings written
+        """
+        if self._stream.closed:
+            return len(self._building_ids)
+        try:
+            if self._block:
+                self._flush_block()
+            values_length = self._stream.tell() - self._values_offset
+            metadata = json.dumps(
+                {
+                    "variables": list(self.variables),
+                    "start": self._start.isoformat(),
+                    "timestep_seconds": self._timestep.total_seconds(),
+                    "precision": self.precision.storage.value,
+                }
+            ).encode("utf-8")
+            payloads = [
+                metadata,
+                b"".join(building_id.bytes for building_id in self._building_ids),
+                bytes(self._row_start),
+                bytes(build_id_index(self._building_ids)),
+            ]
+            table = bytearray(_SECTION.pack(self._values_offset, values_length))
+            for payload in payloads:
+                self._stream.write(
+                    b"\x00" * (_align(self._stream.tell()) - self._stream.tell())
+                )
+                table += _SECTION.pack(self._stream.tell(), len(payload))
+                self._stream.write(payload)
+            self._stream.seek(0)
+            self._stream.write(
+                _HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    len(SECTIONS),
+                    self.precision.typecode.encode("ascii"),
+                    self._step_count,
+                    self.chunk_steps,
+                    self.block_size,
+                    len(self._building_ids),
+                    self._row_start[-1],
+                )
+            )
+            self._stream.write(table)
+        finally:
+            self._stream.close()
+        return len(self._building_ids)
+
+    def __enter__(self) -> "ResultStoreWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        """String representation for debugging."""
+        return (
+            f"ResultStoreWriter(path='{self.path}', "
+            f"buildings={len(self._building_ids)})"
+        )
+
+
+def _merged(accumulators: Iterable[_Accumulator], aggregate: Aggregate) -> _Accumulator:
+    merged = _Accumulator(aggregate)
+    for accumulator in accumulators:
+        merged.merge(accumulator)
+    return merged
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
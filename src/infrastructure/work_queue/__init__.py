@@ -0,0 +1,19 @@
+from .broker import (
+    BrokerUnavailableError,
+    ItemState,
+    Lease,
+    QueueProgress,
+    WorkItem,
+    WorkQueueBroker,
+)
+from .sqlite_broker import SQLiteBroker
+
+__all__ = [
+    "BrokerUnavailableError",
+    "ItemState",
+    "Lease",
+    "QueueProgress",
+    "SQLiteBroker",
+    "WorkItem",
+    "WorkQueueBroker",
+]
@@ -0,0 +1,147 @@
+"""Work queue contract shared by brokers and the workers that poll them.
+
+Items are leased rather than popped: a worker holds an item for a limited
+time, renews the lease while it works and completes the item once its
+result is stored. An item whose lease runs out, because its worker crashed
+or lost its node, becomes available to other workers again. Completing an
+item is idempotent, so results must be written so that storing them twice
+is harmless.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Protocol
+
+
+class BrokerUnavailableError(Exception):
+    """The queue could not be reached, or stayed locked, for now.
+
+    Raised by broker operations for failures that may pass, so the operation
+    can be tried again later.
+    """
+
+
+class ItemState(Enum):
+    """Work item state enumeration."""
+
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return self.value
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    """A unit of work held by a queue.
+
+    Attributes:
+        key: Identifier of the item, unique within its queue
+        payload: JSON-serialisable description of the work
+    """
+
+    key: int
+    payload: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A worker's temporary hold on a work item.
+
+    Attributes:
+        item: The leased item
+        token: Identifier of this lease, distinct from every earlier lease of
+            the item
+        worker: Name of the worker holding the lease
+        attempt: Number of times the item has been leased, including this one
+        expires_at: Time the lease runs out unless renewed, in seconds since
+            the epoch
+    """
+
+    item: WorkItem
+    token: str
+    worker: str
+    attempt: int
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class QueueProgress:
+    """Number of items of a queue in each state.
+
+    Attributes:
+        pending: Items waiting to be leased
+        leased: Items held by a worker, including leases that have run out
+            but not yet been taken over
+        done: Items completed
+        failed: Items given up on after too many attempts
+    """
+
+    pending: int = 0
+    leased: int = 0
+    done: int = 0
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of items in the queue."""
+        return self.pending + self.leased + self.done + self.failed
+
+    @property
+    def finished(self) -> bool:
+        """Whether no item is waiting or being worked on."""
+        return self.pending == 0 and self.leased == 0
+
+    def __str__(self) -> str:
+        """String representation for display."""
+        return (
+            f"{self.done} done, {self.failed} failed, {self.leased} leased, "
+            f"{self.pending} pending"
+        )
+
+
+class WorkQueueBroker(Protocol):
+    """Broker interface of a leased work queue.
+
+    Brokers are shared by worker threads, processes and nodes, so
+    implementations keep their state outside the broker object and must
+    pickle to a handle on the same queue. Every operation raises
+    BrokerUnavailableError when the queue cannot be reached for now.
+    """
+
+    def enqueue(self, items: Iterable[WorkItem]) -> int:
+        """Add items whose keys are not queued yet; return how many were added."""
+        ...
+
+    def lease(self, worker: str, lease_seconds: float) -> Lease | None:
+        """Lease the next available item, or return None if there is none."""
+        ...
+
+    def renew(self, lease: Lease, lease_seconds: float) -> bool:
+        """Extend a lease; return False if it has been lost to another worker.
+
+        Raises:
+            BrokerUnavailableError: If the queue could not be reached; the
+                lease is unchanged
+        """
+        ...
+
+    def complete(self, lease: Lease) -> bool:
+        """Mark a leased item done; return False if it was done already."""
+        ...
+
+    def fail(self, lease: Lease, error: str) -> None:
+        """Give a leased item back after an error, to be retried or failed."""
+        ...
+
+    def progress(self) -> QueueProgress:
+        """Number of items in each state."""
+        ...
+
+    def failures(self) -> dict[int, str]:
+        """Last error of every failed item, by key."""
+        ...
@@ -0,0 +1,233 @@
+"""Leased work queue kept in a SQLite database file.
+
+Every operation opens its own connection and runs in an immediate
+transaction, so the threads and processes of any number of workers can
+share one database: SQLite's file lock serialises the lease of an item, and
+each lease carries a fresh token that renewals and errors are checked
+against. The database is kept in write-ahead-log mode so progress can be
+read while workers lease.
+
+Workers on several nodes need the database on a filesystem with working
+POSIX locks; SQLite's locking is not reliable on most network filesystems,
+where another WorkQueueBroker should be used. Lease expiry compares wall
+clock times, so the clocks of all nodes must be synchronised to well within
+the lease duration. SQLite's operational errors, such as a lock held past
+the busy timeout, are raised as BrokerUnavailableError.
+"""
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+from uuid import uuid4
+
+from infrastructure.work_queue.broker import (
+    BrokerUnavailableError,
+    ItemState,
+    Lease,
+    QueueProgress,
+    WorkItem,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key INTEGER PRIMARY KEY,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    token TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    expires_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS items_by_state ON items (state, key);
+"""
+
+
+class SQLiteBroker:
+    """Work queue broker backed by a SQLite database file.
+
+    Attributes:
+        path: Path of the database file, created if missing
+        max_attempts: Number of leases of an item, through errors or expired
+            leases, after which it is marked failed
+        busy_timeout_seconds: Longest wait for another connection's lock
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_attempts: int = 3,
+        busy_timeout_seconds: float = 30.0,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("Max attempts must be positive")
+        if busy_timeout_seconds <= 0:
+            raise ValueError("Busy timeout must be positive")
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.busy_timeout_seconds = busy_timeout_seconds
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def enqueue(self, items: Iterable[WorkItem]) -> int:
+        """Add items whose keys are not queued yet; return how many were added."""
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO items (key, payload) VALUES (?, ?)",
+                ((item.key, json.dumps(item.payload)) for item in items),
+            )
+            return connection.total_changes - before
+
+    def lease(self, worker: str, lease_seconds: float) -> Lease | None:
+        """Lease the next available item, or return None if there is none.
+
+        Items whose lease has run out are taken over before pending items,
+        unless they have used up their attempts, in which case they are
+        marked failed.
+        """
+        if lease_seconds <= 0:
+            raise ValueError("Lease duration must be positive")
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE items SET state = ?, token = NULL, error = ? "
+                "WHERE state = ? AND expires_at < ? AND attempts >= ?",
+                (
+                    ItemState.FAILED.value,
+                    "lease expired",
+                    ItemState.LEASED.value,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            row = connection.execute(
+                "SELECT key, payload, attempts FROM items "
+                "WHERE state = ? AND expires_at < ? ORDER BY expires_at LIMIT 1",
+                (ItemState.LEASED.value, now),
+            ).fetchone()
+            if row is None:
+                row = connection.execute(
+                    "SELECT key, payload, attempts FROM items "
+                    "WHERE state = ? ORDER BY key LIMIT 1",
+                    (ItemState.PENDING.value,),
+                ).fetchone()
+            if row is None:
+                return None
+            key, payload, attempts = row
+            lease = Lease(
+                item=WorkItem(key=key, payload=json.loads(payload)),
+                token=uuid4().hex,
+                worker=worker,
+                attempt=attempts + 1,
+                expires_at=now + lease_seconds,
+            )
+            connection.execute(
+                "UPDATE items SET state = ?, token = ?, worker = ?, attempts = ?, "
+                "expires_at = ? WHERE key = ?",
+                (
+                    ItemState.LEASED.value,
+                    lease.token,
+                    worker,
+                    lease.attempt,
+                    lease.expires_at,
+                    key,
+                ),
+            )
+        return lease
+
+    def renew(self, lease: Lease, lease_seconds: float) -> bool:
+        """Extend a lease; return False if it has been lost to another worker."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE items SET expires_at = ? "
+                "WHERE key = ? AND token = ? AND state = ?",
+                (
+                    time.time() + lease_seconds,
+                    lease.item.key,
+                    lease.token,
+                    ItemState.LEASED.value,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, lease: Lease) -> bool:
+        """Mark a leased item done; return False if it was done already.
+
+        An item is completed even if its lease was lost, since the result
+        was stored all the same.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE items SET state = ?, token = NULL, expires_at = NULL, "
+                "error = NULL WHERE key = ? AND state != ?",
+                (ItemState.DONE.value, lease.item.key, ItemState.DONE.value),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, lease: Lease, error: str) -> None:
+        """Give a leased item back after an error, to be retried or failed.
+
+        Does nothing if the lease has been lost to another worker.
+        """
+        retry = lease.attempt < self.max_attempts
+        state = ItemState.PENDING if retry else ItemState.FAILED
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE items SET state = ?, token = NULL, expires_at = NULL, "
+                "error = ? WHERE key = ? AND token = ? AND state = ?",
+                (
+                    state.value,
+                    error,
+                    lease.item.key,
+                    lease.token,
+                    ItemState.LEASED.value,
+                ),
+            )
+
+    def progress(self) -> QueueProgress:
+        """Number of items in each state."""
+        with self._connection() as connection:
+            counts = dict(
+                connection.execute("SELECT state, COUNT(*) FROM items GROUP BY state")
+            )
+        return QueueProgress(**counts)
+
+    def failures(self) -> dict[int, str]:
+        """Last error of every failed item, by key."""
+        with self._connection() as connection:
+            return dict(
+                connection.execute(
+                    "SELECT key, error FROM items WHERE state = ? ORDER BY key",
+                    (ItemState.FAILED.value,),
+                )
+            )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            with closing(
+                sqlite3.connect(
+                    self.path,
+                    timeout=self.busy_timeout_seconds,
+                    isolation_level=None,
+                )
+            ) as connection:
+                yield connection
+        except sqlite3.OperationalError as error:
+            raise BrokerUnavailableError(f"{self.path}: {error}") from error
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
@@ -0,0 +1,81 @@
+import asyncio
+from uuid import UUID
+
+import pytest
+
+from application.services import HeatLossQueryService, HeatLossResult
+from domain.building.aggregates.building import Building
+from domain.building.entities import BuildingElement, Zone
+from domain.building.enums import ThermalBoundaryType
+from domain.building.value_objects import (
+    AirChangeRate,
+    Area,
+    ArealHeatCapacity,
+    Orientation,
+    Pitch,
+    Volume,
+)
+from domain.shared.value_objects import Temperature, ThermalResistance
+
+
+def _building(number: int) -> Building:
+    zone = Zone(
+        id=UUID(int=100 + number),
+        name=f"Zone {number}",
+        area=Area(square_metres=40.0 + 10 * number),
+        volume=Volume(cubic_metres=100.0 + 25 * number),
+        building_elements=[
+            BuildingElement(
+                id=UUID(int=1000 + 10 * number),
+                name="Wall",
+                thermal_boundary_type=ThermalBoundaryType.EXTERNAL_SOLID,
+                area=Area(square_metres=20.0 + number),
+                thermal_resistance=ThermalResistance(m2_k_per_w=2.0),
+                areal_heat_capacity=ArealHeatCapacity(j_per_m2_k=60000.0),
+                orientation=Orientation(degrees=0.0),
+                pitch=Pitch(degrees=90.0),
+            )
+        ],
+        ventilation_rate=AirChangeRate(changes_per_hour=0.5),
+        temperature_setpoint=Temperature(celsius=21.0),
+        thermal_bridges=[],
+    )
+    return Building(id=UUID(int=number), name=f"Building {number}", zones=[zone])
+
+
+async def _query_together(
+    buildings: list[Building],
+) -> tuple[list[HeatLossResult | BaseException], HeatLossQueryService]:
+    # A long latency keeps every query in the same batch
+    async with HeatLossQueryService(max_latency_seconds=0.5) as service:
+        results = await asyncio.gather(
+            *(service.query(building) for building in buildings),
+            return_exceptions=True,
+        )
+    return list(results), service
+
+
+async def _query_alone(building: Building) -> HeatLossResult:
+    async with HeatLossQueryService(max_latency_seconds=0.0) as service:
+        return await service.query(building)
+
+
+def test_invalid_building_fails_only_its_own_query() -> None:
+    good = [_building(1), _building(2)]
+    empty = Building(id=UUID(int=99), name="No zones", zones=[])
+
+    results, service = asyncio.run(_query_together([good[0], empty, good[1]]))
+
+    assert service.batches_evaluated == 1
+    assert service.requests_served == 3
+    assert isinstance(results[1], ValueError)
+    for building, result in zip(good, (results[0], results[2])):
+        assert isinstance(result, HeatLossResult)
+        alone = asyncio.run(_query_alone(building))
+        assert result.building_id == building.id
+        assert result.heat_transfer_coefficient.w_per_k == pytest.approx(
+            alone.heat_transfer_coefficient.w_per_k
+        )
+        assert result.heat_loss_parameter.w_per_m2_k == pytest.approx(
+            alone.heat_loss_parameter.w_per_m2_k
+        )
@@ -0,0 +1,111 @@
+import random
+from typing import Any
+from uuid import UUID
+
+import pytest
+
+from domain.building.columns import BOUNDARY_TYPE_CODES, BuildingColumns
+from domain.building.enums import ThermalBoundaryType
+from infrastructure.repositories import (
+    IndexedElementRepository,
+    OrientationRange,
+    ValueRange,
+)
+
+BUILDING_COUNT = 200
+
+
+@pytest.fixture(scope="module")
+def portfolio() -> tuple[BuildingColumns, list[float]]:
+    rng = random.Random(36)
+    columns = BuildingColumns()
+    for _ in range(BUILDING_COUNT):
+        building = columns.append_building(UUID(int=rng.getrandbits(128)))
+        for _ in range(rng.randint(1, 3)):
+            zone = columns.append_zone(
+                zone_id=UUID(int=rng.getrandbits(128)),
+                building_index=building,
+                area=rng.uniform(10, 80),
+                volume=rng.uniform(25, 200),
+                air_change_rate=0.5,
+                setpoint=21.0,
+                thermal_bridges=0.0,
+            )
+            for _ in range(rng.randint(1, 10)):
+                columns.append_element(
+                    element_id=UUID(int=rng.getrandbits(128)),
+                    zone_index=zone,
+                    boundary_type=rng.randrange(len(BOUNDARY_TYPE_CODES)),
+                    area=rng.uniform(1, 30),
+                    thermal_resistance=rng.uniform(0.1, 6),
+                    areal_heat_capacity=rng.uniform(1e4, 2e5),
+                    orientation=rng.choice([0.0, 22.5, 45.0, rng.uniform(0, 360)]),
+                    pitch=rng.choice([0.0, 90.0, rng.uniform(0, 180)]),
+                )
+    year_built = [float(rng.randint(1850, 2020)) for _ in range(BUILDING_COUNT)]
+    return columns, year_built
+
+
+@pytest.fixture(scope="module")
+def repository(
+    portfolio: tuple[BuildingColumns, list[float]],
+) -> IndexedElementRepository:
+    columns, year_built = portfolio
+    return IndexedElementRepository(columns, {"year_built": year_built})
+
+
+QUERIES = [
+    {"orientation": OrientationRange(300, 60)},
+    {"orientation": OrientationRange(315, 45)},
+    {"orientation": OrientationRange(10, 100)},
+    {"orientation": OrientationRange(22.5, 45)},
+    {"orientation": OrientationRange(300, 60), "area": ValueRange(1, 29)},
+    {"orientation": OrientationRange(100, 110), "area": ValueRange(1, 30)},
+    {
+        "orientation": OrientationRange(300, 60),
+        "boundary_types": [ThermalBoundaryType.EXTERNAL_SOLID],
+    },
+    {"thermal_resistance": ValueRange(maximum=1.0), "pitch": ValueRange(89, 91)},
+    {
+        "orientation": OrientationRange(170, 190),
+        "building_attributes": {"year_built": ValueRange(maximum=1930)},
+    },
+    {"building_attributes": {"year_built": ValueRange(1900, 1901)}},
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_matches_brute_force(
+    portfolio: tuple[BuildingColumns, list[float]],
+    repository: IndexedElementRepository,
+    query: dict[str, Any],
+) -> None:
+    columns, year_built = portfolio
+    codes = {BOUNDARY_TYPE_CODES[type_] for type_ in query.get("boundary_types", [])}
+    element_ranges = [
+        (query[name], column)
+        for name, column in (
+            ("orientation", columns.element_orientation),
+            ("thermal_resistance", columns.element_thermal_resistance),
+            ("area", columns.element_area),
+            ("pitch", columns.element_pitch),
+        )
+        if name in query
+    ]
+    building_ranges = query.get("building_attributes", {}).values()
+
+    def matches(row: int) -> bool:
+        building = columns.zone_building[columns.element_zone[row]]
+        return (
+            (not codes or columns.element_boundary_type[row] in codes)
+            and all(
+                column[row] in value_range for value_range, column in element_ranges
+            )
+            and all(
+                year_built[building] in value_range for value_range in building_ranges
+            )
+        )
+
+    expected = [row for row in range(columns.element_count) if matches(row)]
+
+    assert list(repository.query(**query)) == expected
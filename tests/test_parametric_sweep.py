@@ -0,0 +1,118 @@
+from uuid import UUID
+
+import pytest
+
+from application.sweep import ParametricSweep, SweepParameter
+from domain.building.aggregates.building import Building
+from domain.building.calculation_graph import BuildingCalculationGraph
+from domain.building.entities import BuildingElement, Zone
+from domain.building.enums import ThermalBoundaryType
+from domain.building.value_objects import (
+    AirChangeRate,
+    Area,
+    ArealHeatCapacity,
+    Orientation,
+    Pitch,
+    Volume,
+)
+from domain.shared.value_objects import Temperature, ThermalResistance
+from infrastructure.execution import ExecutionBackend
+
+DESIGN_TEMPERATURE = Temperature(celsius=-3.0)
+
+
+def _zone(number: int) -> Zone:
+    return Zone(
+        id=UUID(int=100 + number),
+        name=f"Zone {number}",
+        area=Area(square_metres=40.0 + 10 * number),
+        volume=Volume(cubic_metres=100.0 + 25 * number),
+        building_elements=[
+            BuildingElement(
+                id=UUID(int=1000 + 10 * number + index),
+                name=f"Element {index}",
+                thermal_boundary_type=boundary_type,
+                area=Area(square_metres=12.0 + index),
+                thermal_resistance=ThermalResistance(m2_k_per_w=0.5 + index),
+                areal_heat_capacity=ArealHeatCapacity(j_per_m2_k=60000.0),
+                orientation=Orientation(degrees=90.0 * index),
+                pitch=Pitch(degrees=90.0),
+            )
+            for index, boundary_type in enumerate(
+                (
+                    ThermalBoundaryType.EXTERNAL_SOLID,
+                    ThermalBoundaryType.EXTERNAL_SOLID,
+                    ThermalBoundaryType.EXTERNAL_GLAZING,
+                )
+            )
+        ],
+        ventilation_rate=AirChangeRate(changes_per_hour=0.5),
+        temperature_setpoint=Temperature(celsius=21.0),
+        thermal_bridges=[],
+    )
+
+
+@pytest.fixture(scope="module")
+def building() -> Building:
+    return Building(id=UUID(int=1), name="Sweep base", zones=[_zone(0), _zone(1)])
+
+
+def _ventilation(*rates: float) -> list[AirChangeRate]:
+    return [AirChangeRate(changes_per_hour=rate) for rate in rates]
+
+
+def _cold_evaluation(
+    building: Building, parameters: list[SweepParameter], values: tuple
+) -> BuildingCalculationGraph:
+    graph = BuildingCalculationGraph(building, DESIGN_TEMPERATURE)
+    for parameter, value in zip(parameters, values):
+        parameter.apply(graph, parameter.targets(building), value)
+    return graph
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_overlapping_parameters_match_cold_evaluation(
+    building: Building, chunk_size: int
+) -> None:
+    parameters = [
+        SweepParameter.ventilation_rate(_ventilation(0.3, 0.6, 0.9)),
+        SweepParameter.ventilation_rate(
+            _ventilation(1.2, 2.0), zone_ids=[UUID(int=100)], name="zone_0_ventilation"
+        ),
+        SweepParameter.thermal_resistance(
+            [ThermalResistance(m2_k_per_w=value) for value in (1.0, 3.0)]
+        ),
+        SweepParameter.thermal_resistance(
+            [ThermalResistance(m2_k_per_w=value) for value in (0.2, 4.0)],
+            boundary_types=[
+                ThermalBoundaryType.EXTERNAL_SOLID,
+                ThermalBoundaryType.EXTERNAL_GLAZING,
+            ],
+            zone_ids=[UUID(int=101)],
+            name="zone_1_resistance",
+        ),
+    ]
+    run = ParametricSweep(
+        building,
+        parameters,
+        DESIGN_TEMPERATURE,
+        workers=1,
+        chunk_size=chunk_size,
+        backend=ExecutionBackend.SERIAL,
+    ).run()
+
+    assert [result.index for result in run.results] == list(range(24))
+    for result in run.results:
+        graph = _cold_evaluation(building, parameters, result.values)
+        assert (
+            result.heat_transfer_coefficient.w_per_k,
+            result.heat_loss_parameter.w_per_m2_k,
+            result.design_heat_loss.watts,
+        ) == pytest.approx(
+            (
+                graph.heat_transfer_coefficient().w_per_k,
+                graph.heat_loss_parameter().w_per_m2_k,
+                graph.design_heat_loss().watts,
+            ),
+            rel=1e-12,
+        ), f"variant {result.index}"